@@ -0,0 +1,67 @@
+"""
+Memory and planning throughput benchmark for the Graph on large generated maps.
+
+Usage: python benchmarks/benchmark_graph.py [node_count ...]
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from Navigation.Graph import Graph
+from Navigation.TurnAwarePathPlanner import TurnAwarePathPlanner
+from Navigation.TurnCostModel import TurnCostModel
+from Simulation.MapGenerator import MapGenerator
+
+DEFAULT_NODE_COUNTS = [1_000, 10_000, 100_000]
+PLANNING_RUNS = 5
+
+
+def benchmark(node_count):
+    waypoints_configuration = MapGenerator(node_count).generate_waypoints_configuration()
+
+    tracemalloc.start()
+    graph = Graph(waypoints_configuration)
+    allocated_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del graph
+
+    start = time.perf_counter()
+    graph = Graph(waypoints_configuration)
+    construction_time = time.perf_counter() - start
+
+    # a graph which is reused for another mission only resets its statuses
+    start = time.perf_counter()
+    graph.reset()
+    reset_time = time.perf_counter() - start
+
+    graph.set_target_waypoint(list(waypoints_configuration)[-1])
+    start = time.perf_counter()
+    for _ in range(PLANNING_RUNS):
+        graph.get_next_best_waypoint()
+    planning_time = (time.perf_counter() - start) / PLANNING_RUNS
+    edge_count = sum(len(w.get_angles()) for w in graph.waypoints)
+
+    # the turn-aware search runs over one state per waypoint and incoming line
+    start = time.perf_counter()
+    turn_aware_planner = TurnAwarePathPlanner(graph.waypoints, TurnCostModel())
+    table_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(PLANNING_RUNS):
+        turn_aware_planner.calculate(graph.current_waypoint)
+    turn_aware_planning_time = (time.perf_counter() - start) / PLANNING_RUNS
+
+    print(
+        f"{node_count:>8} nodes | {allocated_bytes / len(graph.waypoints):8.1f} bytes/node | "
+        f"construction {construction_time * 1000:9.1f} ms | reset {reset_time * 1000:7.1f} ms | "
+        f"plan {planning_time * 1000:9.1f} ms | {edge_count / planning_time / 1e6:6.2f} M edges/s | "
+        f"turn-aware tables {table_time * 1000:7.1f} ms, plan {turn_aware_planning_time * 1000:9.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    node_counts = [int(n) for n in sys.argv[1:]] or DEFAULT_NODE_COUNTS
+    for node_count in node_counts:
+        benchmark(node_count)
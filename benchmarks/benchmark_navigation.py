@@ -0,0 +1,89 @@
+"""
+Decision latency benchmark for whole NavigationController missions on generated maps of growing size.
+Reports the latency percentiles of every handled event and the total planning time per mission.
+
+Usage: python benchmarks/benchmark_navigation.py [--instrumentation] [waypoint_count ...]
+With --instrumentation the timings of the instrumented hot paths are printed as well.
+"""
+import logging
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from Instrumentation.Instrumentation import Instrumentation
+from Logger.Logger import Logger
+from Simulation.MapGenerator import MapGenerator
+from Simulation.NavigationSimulator import NavigationSimulator
+
+DEFAULT_WAYPOINT_COUNTS = [100, 1_000, 10_000]
+MISSIONS_PER_SIZE = 5
+CONE_PROBABILITY = 0.1
+OBSTACLE_PROBABILITY = 0.1
+# the controller only marks a missing line next to the target, see Graph.update_missing_line
+MISSING_LINE_PROBABILITY = 0.0
+DETECTION_ACCURACY = 0.9
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_missions(waypoint_count):
+    results = []
+    seed = 0
+    while len(results) < MISSIONS_PER_SIZE:
+        simulated_map = MapGenerator(
+            waypoint_count, CONE_PROBABILITY, OBSTACLE_PROBABILITY, MISSING_LINE_PROBABILITY, seed
+        ).generate()
+        seed += 1
+        # the waypoint furthest away from the start which can be reached
+        target_waypoint_id = next(
+            w for w in reversed(simulated_map.get_waypoint_ids()) if not simulated_map.has_cone(w)
+        )
+        if not simulated_map.is_reachable(target_waypoint_id):
+            continue
+        simulator = NavigationSimulator(simulated_map, detection_accuracy=DETECTION_ACCURACY, seed=seed)
+        results.append(simulator.run_mission([target_waypoint_id]))
+    return results
+
+
+def report(waypoint_count, results):
+    print(f"{waypoint_count} waypoints, {len(results)} missions, "
+          f"{sum(r.is_target_reached for r in results)} reached the target")
+    event_latencies = {}
+    for result in results:
+        for event_name, latencies in result.event_latencies.items():
+            event_latencies.setdefault(event_name, []).extend(latencies)
+    for event_name, latencies in sorted(event_latencies.items()):
+        print(
+            f"  {event_name:<24} n={len(latencies):>6} "
+            f"p50={percentile(latencies, 50) * 1000:8.2f} ms "
+            f"p90={percentile(latencies, 90) * 1000:8.2f} ms "
+            f"p99={percentile(latencies, 99) * 1000:8.2f} ms "
+            f"max={max(latencies) * 1000:8.2f} ms"
+        )
+    planning_times = [r.planning_time for r in results]
+    print(
+        f"  planning per mission     mean={statistics.mean(planning_times) * 1000:8.2f} ms "
+        f"max={max(planning_times) * 1000:8.2f} ms "
+        f"plans={statistics.mean(r.planning_count for r in results):.0f}"
+    )
+
+
+if __name__ == "__main__":
+    # the controller logs every decision, which is not part of the measurement
+    Logger.start(level=logging.WARNING)
+    arguments = sys.argv[1:]
+    if "--instrumentation" in arguments:
+        arguments.remove("--instrumentation")
+        Instrumentation.enable()
+    waypoint_counts = [int(n) for n in arguments] or DEFAULT_WAYPOINT_COUNTS
+    for waypoint_count in waypoint_counts:
+        Instrumentation.reset()
+        report(waypoint_count, run_missions(waypoint_count))
+        if Instrumentation.enabled:
+            print(Instrumentation.dump())
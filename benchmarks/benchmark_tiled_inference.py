@@ -0,0 +1,94 @@
+"""
+Latency and recall of the tiled inference of the start up detection compared to the downsized full frame.
+There is no labelled ground truth for the test images, so the recall of every configuration is measured against the
+union of the objects found by all configurations: an object counts as found if a box with the same label overlaps it
+with an intersection over union of at least MATCH_IOU.
+
+Usage: python benchmarks/benchmark_tiled_inference.py [image ...]
+Requires the packages of requirements.txt (ultralytics, opencv-python), by default the images in tests/images are used.
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_PATH / "src"))
+
+import cv2
+from ultralytics import YOLO
+from ObjectDetection.TiledInference import TiledInference
+
+MODEL_PATH = ROOT_PATH / "src" / "ObjectDetection" / "small_object_model.pt"
+DEFAULT_IMAGES_PATH = ROOT_PATH / "tests" / "images"
+# (tile size, overlap, batch size), None is the full frame downsized to 640 pixels
+CONFIGURATIONS = [None, (1280, 0.1, 4), (1280, 0.2, 4), (960, 0.2, 8), (640, 0.2, 8), (640, 0.3, 16)]
+RUNS = 3
+MATCH_IOU = 0.3
+
+
+def detect_full_frame(model, image):
+    return TiledInference.parse_result(model.predict(image, imgsz=640, verbose=False)[0], model.names)
+
+
+def measure(configuration, images):
+    model = YOLO(MODEL_PATH)
+    if configuration is None:
+        detect = lambda image: detect_full_frame(model, image)
+        tiled_inference = None
+    else:
+        tile_size, overlap, batch_size = configuration
+        tiled_inference = TiledInference(lambda: YOLO(MODEL_PATH), tile_size, overlap, batch_size)
+        detect = tiled_inference.predict
+    # the first prediction loads the models
+    detect(images[0])
+    latencies = []
+    objects_per_image = []
+    for image in images:
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            objects = detect(image)
+            latencies.append(time.perf_counter() - start)
+        objects_per_image.append(objects)
+    if tiled_inference is not None:
+        tiled_inference.shutdown()
+    return latencies, objects_per_image
+
+
+def get_iou(box, other_box):
+    width = min(box["x_max"], other_box["x_max"]) - max(box["x_min"], other_box["x_min"])
+    height = min(box["y_max"], other_box["y_max"]) - max(box["y_min"], other_box["y_min"])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    return intersection / (box["width"] * box["height"] + other_box["width"] * other_box["height"] - intersection)
+
+
+def is_found(obj, objects):
+    return any(
+        o["label"] == obj["label"] and get_iou(o["bounding_box"], obj["bounding_box"]) >= MATCH_IOU for o in objects
+    )
+
+
+if __name__ == "__main__":
+    image_paths = [Path(p) for p in sys.argv[1:]] or sorted(DEFAULT_IMAGES_PATH.glob("*.JPG"))
+    images = [cv2.imread(str(p)) for p in image_paths]
+    measurements = {configuration: measure(configuration, images) for configuration in CONFIGURATIONS}
+    # reference objects of every image: all objects found by any configuration, without duplicates
+    references = []
+    for image_index in range(len(images)):
+        candidates = [o for _, objects in measurements.values() for o in objects[image_index]]
+        references.append(TiledInference.non_max_suppression(candidates, MATCH_IOU))
+    reference_count = sum(len(r) for r in references)
+    print(f"{len(images)} images, {reference_count} reference objects")
+    for configuration, (latencies, objects_per_image) in measurements.items():
+        found = sum(
+            is_found(reference, objects)
+            for reference_objects, objects in zip(references, objects_per_image)
+            for reference in reference_objects
+        )
+        name = "full frame 640" if configuration is None else "tile {} overlap {} batch {}".format(*configuration)
+        print(
+            f"  {name:<32} mean={statistics.mean(latencies) * 1000:8.1f} ms "
+            f"max={max(latencies) * 1000:8.1f} ms recall={found / max(1, reference_count):6.1%}"
+        )
@@ -0,0 +1,28 @@
+"""
+Replays a mission recorded with the MissionRecorder and reports the divergences of the emitted commands and the
+detections as well as the latencies of the recorded and the replayed events.
+
+Usage: python benchmarks/replay_mission.py [--realtime] mission_log
+With --realtime the events are replayed at the recorded speed instead of as fast as possible.
+"""
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from Logger.Logger import Logger
+from Recording.MissionReplayer import MissionReplayer
+
+if __name__ == "__main__":
+    # the controller logs every decision, which is not part of the measurement
+    Logger.start(level=logging.WARNING)
+    arguments = sys.argv[1:]
+    realtime = "--realtime" in arguments
+    if realtime:
+        arguments.remove("--realtime")
+    if len(arguments) != 1:
+        sys.exit(__doc__)
+    report = MissionReplayer(arguments[0]).replay(realtime=realtime)
+    print(report.summary())
+    sys.exit(1 if report.has_diverged() else 0)
@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import deque
+from Instrumentation.TimingHistogram import TimingHistogram
+from Logger.Logger import Logger
+
+logger = Logger("EventQueue")
+
+
+class EventQueue:
+    """
+    Bounded queue of the events received from the car in front of the handlers of a NavigationController.
+    Events are (name, arguments) pairs, the name selects the on_<name> handler. The handlers depend on the state left
+    by the events before them, e.g. the angles of a point scan give the index of the target line and a cone is detected
+    at the waypoint the car drove to, so events are handled in the order they were received and never dropped. Only
+    duplicate pong replies are coalesced, they do not depend on or change the state of the navigation. When the queue
+    is full, put waits until the handlers made room, so the receiver is slowed down instead of losing events.
+    A stop is the only event which is handled before the queued ones. It discards them, the car does not wait for their
+    commands anymore, and it shuts the dispatching down: events received after it are not queued, and the queue is
+    closed once the handler of the stop ran, so run returns and the thread of start ends. The stop handler of the
+    NavigationController exits the process, the exit is passed on after the queue was closed, so it ends the process
+    when run is called by the main thread and only the dispatching thread when it was started by start.
+    """
+
+    STOP_EVENT = "stop"
+    # events which are dropped if an event with the same name is queued
+    COALESCED_EVENTS = frozenset(["pong"])
+
+    def __init__(self, max_size: int = 256):
+        if max_size <= 0:
+            raise ValueError(f"Max size must be positive, got {max_size}")
+        self.max_size = max_size
+        # queued events as [name, arguments, enqueue time] lists in the order they are handled
+        self.queue = deque()
+        # names of the queued coalesced events
+        self.queued_names = set()
+        lock = threading.Lock()
+        # notified when an event is queued or the queue is closed
+        self.condition = threading.Condition(lock)
+        # notified when an event is taken from the queue or the queue is stopped
+        self.not_full = threading.Condition(lock)
+        self.wait_times = TimingHistogram()
+        self.counts = {"received": 0, "handled": 0, "coalesced": 0, "discarded": 0, "waited": 0}
+        self.max_depth = 0
+        self.dispatcher = None
+        self.is_stopped = False
+        self.is_closed = False
+
+    def put(self, name: str, *arguments):
+        """
+        Queues an event, returns False if it was coalesced with a queued event or the queue is stopped or closed.
+        Waits while the queue is full, except for a stop.
+        """
+        with self.condition:
+            self.counts["received"] += 1
+            if self.is_stopped or self.is_closed:
+                self.counts["discarded"] += 1
+                return False
+            if name == self.STOP_EVENT:
+                self.counts["discarded"] += len(self.queue)
+                self.queue.clear()
+                self.queued_names.clear()
+                self.is_stopped = True
+                self.__append(name, arguments)
+                # the receivers waiting for room give up their events
+                self.not_full.notify_all()
+                return True
+            if name in self.COALESCED_EVENTS and name in self.queued_names:
+                self.counts["coalesced"] += 1
+                return False
+            if len(self.queue) >= self.max_size:
+                self.counts["waited"] += 1
+                logger.warning("event queue full, waiting for the handlers", event=name, size=len(self.queue))
+                self.not_full.wait_for(lambda: len(self.queue) < self.max_size or self.is_stopped or self.is_closed)
+                if self.is_stopped or self.is_closed:
+                    self.counts["discarded"] += 1
+                    return False
+            if name in self.COALESCED_EVENTS:
+                self.queued_names.add(name)
+            self.__append(name, arguments)
+        return True
+
+    def get(self, timeout: float = None):
+        """
+        Returns the next event as (name, arguments), or None if there is none within the timeout or the queue is closed.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.queue or self.is_closed, timeout):
+                return None
+            if not self.queue:
+                return None
+            name, arguments, enqueue_time = self.queue.popleft()
+            self.queued_names.discard(name)
+            self.wait_times.record(time.perf_counter() - enqueue_time)
+            self.not_full.notify()
+        return name, arguments
+
+    def handle_next(self, controller, timeout: float = None):
+        """
+        Handles the next event with the handler of the controller, returns False if there was no event.
+        Errors of the handlers are logged, so a failing event does not stop the handling of the following ones.
+        The queue is closed after a stop was handled, also if its handler exits.
+        """
+        event = self.get(timeout)
+        if event is None:
+            return False
+        name, arguments = event
+        try:
+            getattr(controller, f"on_{name}")(*arguments)
+        except Exception as e:
+            logger.error("event handling failed", event=name, error=repr(e))
+        finally:
+            with self.condition:
+                self.counts["handled"] += 1
+            if name == self.STOP_EVENT:
+                self.close()
+        return True
+
+    def run(self, controller):
+        """
+        Handles the events on the calling thread until the queue is closed, e.g. by a stop. The main thread of the
+        process calls this, or start and join, and exits when it returns.
+        """
+        while not self.is_closed:
+            self.handle_next(controller, timeout=0.5)
+
+    def start(self, controller):
+        """
+        Handles the events in a background thread until the queue is closed, e.g. by a stop, see join.
+        """
+        self.dispatcher = threading.Thread(target=self.run, args=(controller,), name="event-dispatcher", daemon=True)
+        self.dispatcher.start()
+
+    def join(self, timeout: float = None):
+        """
+        Waits until the thread of start ended, returns False if it is still running after the timeout.
+        """
+        if self.dispatcher is None:
+            return True
+        self.dispatcher.join(timeout)
+        return not self.dispatcher.is_alive()
+
+    def close(self):
+        with self.condition:
+            self.is_closed = True
+            self.condition.notify_all()
+            self.not_full.notify_all()
+        if self.dispatcher is not None and self.dispatcher is not threading.current_thread():
+            self.dispatcher.join()
+
+    def get_metrics(self):
+        """
+        Returns the current and maximum depth of the queue, the counts of received, handled, coalesced and discarded
+        events and of the events which waited for room, and a summary of the times in seconds the events waited in the
+        queue.
+        """
+        with self.condition:
+            return {
+                "depth": len(self.queue),
+                "max_depth": self.max_depth,
+                **self.counts,
+                "wait_time": self.wait_times.get_summary(),
+            }
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __append(self, name, arguments):
+        self.queue.append([name, arguments, time.perf_counter()])
+        self.max_depth = max(self.max_depth, len(self.queue))
+        self.condition.notify()
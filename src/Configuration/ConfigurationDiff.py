@@ -0,0 +1,96 @@
+class ConfigurationDiff:
+    """
+    Differences between two validated configurations, see Configurator.reload.
+    Edges are (waypoint id, outgoing waypoint id) pairs. Changed edges have a different angle, which changes the graph,
+    edges with changed matchers only differ in their obstacle coordinates or bounding box corners, which are read by
+    the object detection.
+    """
+
+    def __init__(self, old_configuration, new_configuration):
+        self.old_configuration = old_configuration
+        self.new_configuration = new_configuration
+        self.changed_communication = self.__get_changed_keys(
+            old_configuration["communication"], new_configuration["communication"]
+        )
+        # (old value, new value) by tolerance
+        self.changed_tolerances = self.__get_changed_keys(old_configuration["tolerances"], new_configuration["tolerances"])
+        old_waypoints = old_configuration["waypoints"]
+        new_waypoints = new_configuration["waypoints"]
+        self.added_waypoint_ids = [i for i in new_waypoints if i not in old_waypoints]
+        self.removed_waypoint_ids = [i for i in old_waypoints if i not in new_waypoints]
+        self.moved_waypoint_ids = []
+        self.added_edges = []
+        self.removed_edges = []
+        self.changed_edges = []
+        self.changed_matcher_edges = []
+        for waypoint_id, new_waypoint in new_waypoints.items():
+            old_waypoint = old_waypoints.get(waypoint_id)
+            if old_waypoint is None:
+                self.added_edges.extend((waypoint_id, edge_id) for edge_id in new_waypoint["edges"])
+                continue
+            if (old_waypoint["x"], old_waypoint["y"]) != (new_waypoint["x"], new_waypoint["y"]):
+                self.moved_waypoint_ids.append(waypoint_id)
+            old_edges = old_waypoint["edges"]
+            for edge_id, new_edge in new_waypoint["edges"].items():
+                old_edge = old_edges.get(edge_id)
+                if old_edge is None:
+                    self.added_edges.append((waypoint_id, edge_id))
+                elif old_edge["angle"] != new_edge["angle"]:
+                    self.changed_edges.append((waypoint_id, edge_id))
+                elif (old_edge["obstacle_coords"], old_edge["bounding_box_corners"]) != (
+                    new_edge["obstacle_coords"], new_edge["bounding_box_corners"]
+                ):
+                    self.changed_matcher_edges.append((waypoint_id, edge_id))
+            self.removed_edges.extend((waypoint_id, edge_id) for edge_id in old_edges if edge_id not in new_waypoint["edges"])
+        for waypoint_id in self.removed_waypoint_ids:
+            self.removed_edges.extend((waypoint_id, edge_id) for edge_id in old_waypoints[waypoint_id]["edges"])
+
+    @staticmethod
+    def from_waypoints(old_waypoints, new_waypoints) -> "ConfigurationDiff":
+        """
+        Returns the differences between two waypoints configurations, e.g. to update a graph which was not created
+        from the configuration of the Configurator.
+        """
+        return ConfigurationDiff(
+            {"communication": {}, "tolerances": {}, "waypoints": old_waypoints},
+            {"communication": {}, "tolerances": {}, "waypoints": new_waypoints},
+        )
+
+    @staticmethod
+    def __get_changed_keys(old_values, new_values):
+        return {
+            key: (old_values.get(key), new_values.get(key))
+            for key in {**old_values, **new_values}
+            if old_values.get(key) != new_values.get(key)
+        }
+
+    def has_graph_changes(self):
+        """
+        Returns True if waypoints or edges were added or removed or angles changed, so the graph has to be updated.
+        """
+        return bool(
+            self.added_waypoint_ids or self.removed_waypoint_ids or self.added_edges or self.removed_edges
+            or self.changed_edges
+        )
+
+    def is_empty(self):
+        return not (
+            self.has_graph_changes() or self.changed_communication or self.changed_tolerances
+            or self.moved_waypoint_ids or self.changed_matcher_edges
+        )
+
+    def get_summary(self):
+        """
+        Returns the changes as a dictionary for logging, the edges as "A_to_B" ids.
+        """
+        return {
+            "changed_communication": sorted(self.changed_communication),
+            "changed_tolerances": sorted(self.changed_tolerances),
+            "added_waypoints": self.added_waypoint_ids,
+            "removed_waypoints": self.removed_waypoint_ids,
+            "moved_waypoints": self.moved_waypoint_ids,
+            "added_edges": [f"{a}_to_{b}" for a, b in self.added_edges],
+            "removed_edges": [f"{a}_to_{b}" for a, b in self.removed_edges],
+            "changed_edges": [f"{a}_to_{b}" for a, b in self.changed_edges],
+            "changed_matcher_edges": [f"{a}_to_{b}" for a, b in self.changed_matcher_edges],
+        }
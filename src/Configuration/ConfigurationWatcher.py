@@ -0,0 +1,87 @@
+import os
+import threading
+from typing import Callable
+from Configuration.ConfigurationDiff import ConfigurationDiff
+from Configuration.Configurator import Configurator
+from Logger.Logger import Logger
+
+logger = Logger("ConfigurationWatcher")
+
+
+class ConfigurationWatcher:
+    """
+    Reads the configuration file of the Configurator when it changes and passes the differences to the listener.
+    The file is polled by its modification time and size, so no file system events are needed. An invalid file is
+    logged and skipped, it is read again once the file changes the next time.
+    The watcher does not replace the active configuration, the handler which applies a change publishes it with
+    Configurator.set_configuration, so the configuration and the graph of a NavigationController change together, e.g.
+    lambda diff: event_queue.put("configuration_changed", diff.new_configuration), see
+    NavigationController.on_configuration_changed. The diffs passed to the listener start from the configuration of
+    the previous one.
+    """
+
+    def __init__(self, listener: Callable[[ConfigurationDiff], None], configuration_path=None, interval: float = 1.0):
+        if interval <= 0:
+            raise ValueError(f"Interval must be positive, got {interval}")
+        self.listener = listener
+        self.configuration_path = configuration_path or Configurator._configuration_path
+        self.interval = interval
+        self.last_signature = self.__get_signature()
+        # the configuration the next diff starts from
+        self.configuration = Configurator().configuration
+        self.reload_count = 0
+        self.error_count = 0
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def __get_signature(self):
+        try:
+            stat = os.stat(self.configuration_path)
+        except OSError:
+            # the file is being replaced, it is checked again on the next poll
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self):
+        """
+        Reads the configuration if the file changed since the last check, returns the differences or None if the
+        file did not change or is not valid. Errors are logged, so the watcher keeps running.
+        """
+        signature = self.__get_signature()
+        if signature is None or signature == self.last_signature:
+            return None
+        self.last_signature = signature
+        try:
+            configuration = Configurator.read(self.configuration_path)
+            diff = ConfigurationDiff(self.configuration, configuration)
+        except Exception as e:
+            self.error_count += 1
+            logger.error("configuration not reloaded, keeping the active one", path=str(self.configuration_path), error=repr(e))
+            return None
+        self.configuration = configuration
+        self.reload_count += 1
+        if diff.is_empty():
+            return diff
+        logger.info("configuration reloaded", **diff.get_summary())
+        try:
+            self.listener(diff)
+        except Exception as e:
+            logger.error("configuration listener failed", error=repr(e))
+        return diff
+
+    def start(self):
+        """
+        Checks the file in a background thread until stop is called.
+        """
+        def watch():
+            while not self.stopped.wait(self.interval):
+                self.check()
+
+        self.thread = threading.Thread(target=watch, name="configuration-watcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
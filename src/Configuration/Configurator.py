@@ -1,4 +1,6 @@
 import json
+import threading
+from Configuration.ConfigurationDiff import ConfigurationDiff
 from Validation.Validator import Validator
 
 class Configurator:
@@ -8,6 +10,8 @@ class Configurator:
 
     _instance = None
     _configuration_path = None
+    # serializes the replacements of the configuration, readers get either the old or the new configuration because it is replaced as a whole
+    _reload_lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -28,6 +32,55 @@ class Configurator:
             cls._instance = cls()
         return cls._instance
 
+    @classmethod
+    def read(cls, configuration_path=None):
+        """
+        Reads and validates a configuration file, by default the active one, without replacing the active
+        configuration, see set_configuration. Raises a ValueError if the file is not valid.
+        """
+        if configuration_path is None:
+            configuration_path = cls._configuration_path
+        try:
+            with open(configuration_path, 'r') as file:
+                configuration = json.load(file)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"The configuration file {configuration_path} is not valid JSON: {e}") from e
+        Validator.validate_configuration(configuration)
+        cls.__validate_edges(configuration)
+        return configuration
+
+    @classmethod
+    def set_configuration(cls, configuration):
+        """
+        Replaces the active configuration with a configuration returned by read, e.g. by the handler which applies
+        the change to the graph, so the configuration and the graph change together.
+        """
+        with cls._reload_lock:
+            cls().configuration = configuration
+
+    @classmethod
+    def reload(cls, configuration_path=None) -> ConfigurationDiff:
+        """
+        Reads the configuration file again, by default the active one, and replaces the active configuration with it.
+        Returns the differences to the previous configuration. If the file is not valid, a ValueError is raised and
+        the active configuration is kept.
+        """
+        with cls._reload_lock:
+            configuration = cls.read(configuration_path)
+            instance = cls.initialize(configuration_path or cls._configuration_path)
+            diff = ConfigurationDiff(instance.configuration, configuration)
+            instance.configuration = configuration
+            return diff
+
+    @staticmethod
+    def __validate_edges(configuration):
+        # the graph is updated from the configuration, so every edge must lead to a waypoint of it
+        waypoints = configuration["waypoints"]
+        for waypoint_id, waypoint_data in waypoints.items():
+            for edge_id in waypoint_data["edges"]:
+                if edge_id not in waypoints:
+                    raise ValueError(f"Edge '{edge_id}' in waypoint '{waypoint_id}' leads to an unknown waypoint")
+
     def get_waypoints(self):
         return self.configuration["waypoints"]
     
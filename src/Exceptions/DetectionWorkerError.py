@@ -0,0 +1,6 @@
+class DetectionWorkerError(Exception):
+    """
+    Exception raised when the detection worker process fails a detection, even after it was restarted.
+    """
+    def __init__(self, message="The detection worker failed."):
+        super().__init__(message)
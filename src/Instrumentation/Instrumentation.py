@@ -0,0 +1,99 @@
+import functools
+import threading
+import time
+from Instrumentation.TimingHistogram import TimingHistogram
+
+
+class Instrumentation:
+    """
+    Collects timings of the hot paths (event handlers, object detection and planning) in histograms.
+    Instrumentation is disabled by default, then a timed call only costs one additional function call and a flag check.
+    """
+
+    enabled = False
+    _histograms = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def enable(cls):
+        cls.enabled = True
+
+    @classmethod
+    def disable(cls):
+        cls.enabled = False
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._histograms = {}
+
+    @staticmethod
+    def timed(name: str = None):
+        """
+        Decorator which records the duration of every call under the given name, by default the qualified function name.
+        """
+        def decorator(function):
+            timer_name = name or function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not Instrumentation.enabled:
+                    return function(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    Instrumentation.record(timer_name, time.perf_counter() - start)
+
+            return wrapper
+
+        return decorator
+
+    @classmethod
+    def start(cls):
+        """
+        Returns the start time of a measurement which is finished by stop, or None if instrumentation is disabled.
+        """
+        return time.perf_counter() if cls.enabled else None
+
+    @classmethod
+    def stop(cls, name: str, start):
+        """
+        Records the time since start under the given name and returns the current time, so it can be used as the start
+        of the next measurement.
+        """
+        if start is None:
+            return None
+        now = time.perf_counter()
+        cls.record(name, now - start)
+        return now
+
+    @classmethod
+    def record(cls, name: str, duration: float):
+        histogram = cls._histograms.get(name)
+        if histogram is None:
+            with cls._lock:
+                histogram = cls._histograms.setdefault(name, TimingHistogram())
+        histogram.record(duration)
+
+    @classmethod
+    def get_summary(cls, name: str):
+        histogram = cls._histograms.get(name)
+        return histogram.get_summary() if histogram is not None else None
+
+    @classmethod
+    def get_summaries(cls):
+        return {name: histogram.get_summary() for name, histogram in sorted(cls._histograms.items())}
+
+    @classmethod
+    def dump(cls):
+        """
+        Returns all timings as a table with one line per timer, the durations are in milliseconds.
+        """
+        lines = [f"{'timer':<56}{'count':>8}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}"]
+        for name, summary in cls.get_summaries().items():
+            lines.append(
+                f"{name:<56}{summary['count']:>8}"
+                + "".join(f"{summary[key] * 1000:>10.3f}" for key in ["mean", "p50", "p90", "p99", "max"])
+            )
+        return "\n".join(lines)
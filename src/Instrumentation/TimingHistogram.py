@@ -0,0 +1,73 @@
+import math
+
+
+class TimingHistogram:
+    """
+    Fixed-size histogram of durations with logarithmic buckets.
+    Every power of two is split into SUB_BUCKETS buckets, which bounds the error of the estimated percentiles to 25%.
+    Recording a duration is O(1) and never allocates.
+    """
+
+    SUB_BUCKETS = 4
+    # durations are bucketed in microseconds, the last bucket collects everything above ~35 minutes
+    MAX_EXPONENT = 31
+    BUCKET_COUNT = (MAX_EXPONENT + 1) * SUB_BUCKETS
+
+    __slots__ = ("buckets", "count", "total", "minimum", "maximum")
+
+    def __init__(self):
+        self.buckets = [0] * self.BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+
+    def record(self, duration: float):
+        microseconds = duration * 1e6
+        if microseconds < 1.0:
+            index = 0
+        else:
+            mantissa, exponent = math.frexp(microseconds)
+            index = min(exponent * self.SUB_BUCKETS + int((mantissa - 0.5) * 2 * self.SUB_BUCKETS), self.BUCKET_COUNT - 1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += duration
+        if duration < self.minimum:
+            self.minimum = duration
+        if duration > self.maximum:
+            self.maximum = duration
+
+    def get_percentile(self, percent: float):
+        """
+        Returns the upper bound of the bucket which contains the given percentile in seconds, at most the maximum.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = math.ceil(percent / 100 * self.count)
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank and bucket_count > 0:
+                return min(self.__get_bucket_upper_bound(index), self.maximum)
+        return self.maximum
+
+    def get_mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def get_summary(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.get_mean(),
+            "min": self.minimum if self.count else 0.0,
+            "p50": self.get_percentile(50),
+            "p90": self.get_percentile(90),
+            "p99": self.get_percentile(99),
+            "max": self.maximum,
+        }
+
+    def __get_bucket_upper_bound(self, index):
+        if index == 0:
+            return 1e-6
+        exponent, sub_bucket = divmod(index, self.SUB_BUCKETS)
+        return (0.5 + (sub_bucket + 1) / (2 * self.SUB_BUCKETS)) * 2 ** exponent / 1e6
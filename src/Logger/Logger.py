@@ -0,0 +1,141 @@
+import atexit
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """
+    Puts records on the queue without formatting them, the formatting is done by the listener thread.
+    Records are dropped instead of blocking the caller when the queue is full.
+    """
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            Logger.dropped_message_count += 1
+
+
+class _StructuredFormatter(logging.Formatter):
+
+    def format(self, record):
+        message = record.getMessage()
+        fields = getattr(record, "fields", None)
+        if fields:
+            message = f"{message} " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            message = f"{message}\n{self.formatException(record.exc_info)}"
+        return f"{Logger.PREFIX} {message}"
+
+
+class Logger:
+    """
+    Non-blocking structured logger. Log calls only check the level and put the record on a bounded queue, the
+    messages are formatted and written by a background thread. Messages are formatted lazily with %-style arguments and
+    additional key=value fields. Because the formatting happens later on another thread, only immutable values should
+    be passed as arguments and fields.
+    The background thread is started with the first message, or by start from the entry point of an application, so
+    importing a module which creates a logger does not start it.
+    """
+
+    PREFIX = "[pi    ]"
+    QUEUE_SIZE = 10000
+    ROOT_LOGGER_NAME = "pi"
+
+    dropped_message_count = 0
+    _listener = None
+    # set when the interpreter exits, messages logged afterwards do not start the thread again
+    _is_shut_down = False
+    # the first messages can be logged by several threads at once
+    _start_lock = threading.Lock()
+
+    def __init__(self, name: str):
+        self.logger = logging.getLogger(f"{self.ROOT_LOGGER_NAME}.{name}")
+
+    @classmethod
+    def start(cls, level=None, stream=None):
+        """
+        Starts the background thread which writes the messages to the stream, stdout by default.
+        Calling start while the logger is running has no effect, unless a level or stream is given. Without a level,
+        the current level is kept, INFO by default.
+        """
+        if cls._listener is not None:
+            if stream is None:
+                if level is not None:
+                    cls.set_level(level)
+                return
+            cls.stop()
+        log_queue = queue.Queue(cls.QUEUE_SIZE)
+        stream_handler = logging.StreamHandler(stream or sys.stdout)
+        stream_handler.setFormatter(_StructuredFormatter())
+        cls._listener = QueueListener(log_queue, stream_handler)
+        cls._listener.start()
+        root_logger = logging.getLogger(cls.ROOT_LOGGER_NAME)
+        root_logger.handlers = [_NonBlockingQueueHandler(log_queue)]
+        root_logger.propagate = False
+        if level is not None:
+            root_logger.setLevel(level)
+
+    @classmethod
+    def stop(cls):
+        """
+        Writes all queued messages and stops the background thread.
+        """
+        if cls._listener is None:
+            return
+        cls._listener.stop()
+        cls._listener = None
+        logging.getLogger(cls.ROOT_LOGGER_NAME).handlers = []
+
+    @classmethod
+    def _shut_down(cls):
+        cls._is_shut_down = True
+        cls.stop()
+
+    @classmethod
+    def set_level(cls, level):
+        logging.getLogger(cls.ROOT_LOGGER_NAME).setLevel(level)
+
+    @classmethod
+    def __start_on_first_message(cls):
+        with cls._start_lock:
+            if cls._listener is None and not cls._is_shut_down:
+                cls.start()
+
+    def is_enabled_for(self, level):
+        return self.logger.isEnabledFor(level)
+
+    def debug(self, message, *args, **fields):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            if Logger._listener is None:
+                Logger.__start_on_first_message()
+            self.logger.debug(message, *args, extra={"fields": fields})
+
+    def info(self, message, *args, **fields):
+        if self.logger.isEnabledFor(logging.INFO):
+            if Logger._listener is None:
+                Logger.__start_on_first_message()
+            self.logger.info(message, *args, extra={"fields": fields})
+
+    def warning(self, message, *args, **fields):
+        if self.logger.isEnabledFor(logging.WARNING):
+            if Logger._listener is None:
+                Logger.__start_on_first_message()
+            self.logger.warning(message, *args, extra={"fields": fields})
+
+    def error(self, message, *args, **fields):
+        if self.logger.isEnabledFor(logging.ERROR):
+            if Logger._listener is None:
+                Logger.__start_on_first_message()
+            self.logger.error(message, *args, extra={"fields": fields})
+
+
+# only the level is configured on import, the background thread is started with the first message
+logging.getLogger(Logger.ROOT_LOGGER_NAME).setLevel(logging.INFO)
+atexit.register(Logger._shut_down)
@@ -0,0 +1,172 @@
+from heapq import heappop, heappush
+from typing import List
+from Navigation.PathPlanner import PathPlanner
+from Navigation.Waypoint import Waypoint
+from Instrumentation.Instrumentation import Instrumentation
+
+
+class AlternativeRoutePlanner:
+    """
+    Calculates the k best loopless routes to a target waypoint using Yen's algorithm.
+    The k best routes often only differ close to the target, while the car finds cones, obstacles and missing lines on
+    the next line it drives. So if none of them avoids the next waypoint, the best such detour is added.
+    A route is a list of waypoints from the start waypoint to the target waypoint (both inclusive). Routes are compared
+    by the same lexicographic cost as the PathPlanner, so routes through uncertain blocks come last.
+    The alternatives are calculated on a background thread while the handlers keep changing statuses, so the searches
+    run on a snapshot of the costs, see take_snapshot. The snapshot is taken once when the calculation starts, the
+    searches never read or write the live graph. A status changed while the snapshot is taken may be missed, so the
+    user of the routes recalculates their costs from the current statuses before switching to one.
+    """
+
+    def __init__(self, waypoints: List[Waypoint], route_count: int):
+        self.waypoints = waypoints
+        self.route_count = route_count
+
+    def take_snapshot(self):
+        """
+        Returns the step costs of the traversable lines as one tuple of (outgoing index, cost) pairs per waypoint index,
+        with the same lexicographic costs as the PathPlanner. Lines to or from confirmed blocks are left out.
+        """
+        violation_cost = PathPlanner.VIOLATION_COST
+        snapshot = []
+        for waypoint in self.waypoints:
+            steps = []
+            if waypoint.traversable:
+                for angle in waypoint.angles:
+                    outgoing_waypoint = angle.outgoing_waypoint
+                    edge = angle.edge
+                    if not (outgoing_waypoint.traversable and edge.traversable):
+                        continue
+                    cost = edge.get_weight() + outgoing_waypoint.expected_block_cost
+                    violations = outgoing_waypoint.violation + edge.violation
+                    if violations:
+                        cost += violations * violation_cost
+                    steps.append((outgoing_waypoint.index, cost))
+            snapshot.append(tuple(steps))
+        return tuple(snapshot)
+
+    @Instrumentation.timed()
+    def calculate(self, shortest_route: List[Waypoint], snapshot=None):
+        """
+        Returns up to route_count routes as (route, cumulative costs) tuples ordered by cost, the first one is the given
+        shortest route. Routes which can not be driven anymore are left out. The routes are calculated on the given
+        snapshot, by default one of the current statuses, see take_snapshot.
+        """
+        if snapshot is None:
+            snapshot = self.take_snapshot()
+        shortest_route_costs = self.__get_snapshot_costs(snapshot, shortest_route)
+        if shortest_route_costs is None or len(shortest_route) < 2:
+            return []
+        target_waypoint = shortest_route[-1]
+        routes = [(shortest_route, shortest_route_costs)]
+        known_routes = {tuple(w.index for w in shortest_route)}
+        candidates = []
+        while len(routes) < self.route_count:
+            previous_route, previous_costs = routes[-1]
+            for spur_position in range(len(previous_route) - 1):
+                root = previous_route[:spur_position + 1]
+                excluded_edges = set()
+                for route, _ in routes:
+                    if len(route) > spur_position + 1 and route[:spur_position + 1] == root:
+                        excluded_edges.add((route[spur_position].index, route[spur_position + 1].index))
+                excluded_indexes = {w.index for w in root[:-1]}
+                spur = self.__search(snapshot, root[-1], target_waypoint, excluded_indexes, excluded_edges)
+                if spur is None:
+                    continue
+                spur_route, spur_costs = spur
+                route = root[:-1] + spur_route
+                key = tuple(w.index for w in route)
+                if key in known_routes:
+                    continue
+                known_routes.add(key)
+                root_cost = previous_costs[spur_position]
+                costs = previous_costs[:spur_position] + [root_cost + c for c in spur_costs]
+                # the waypoint ids break ties between routes of the same cost, waypoints are not comparable
+                heappush(candidates, (costs[-1], tuple(w.id for w in route), route, costs))
+            if not candidates:
+                break
+            _, _, route, costs = heappop(candidates)
+            routes.append((route, costs))
+        if all(shortest_route[1] in route for route, _ in routes):
+            detour = self.__search_detour(snapshot, shortest_route)
+            if detour is not None:
+                routes.append(detour)
+        return routes
+
+    def __search_detour(self, snapshot, route):
+        if len(route) > 2:
+            return self.__search(snapshot, route[0], route[-1], {route[1].index}, set())
+        # the next waypoint is the target waypoint, so only the line to it can be avoided
+        return self.__search(snapshot, route[0], route[-1], set(), {(route[0].index, route[1].index)})
+
+    @staticmethod
+    def __get_snapshot_costs(snapshot, route):
+        costs = [0]
+        for waypoint, next_waypoint in zip(route, route[1:]):
+            next_index = next_waypoint.index
+            step_cost = next((cost for index, cost in snapshot[waypoint.index] if index == next_index), None)
+            if step_cost is None:
+                return None
+            costs.append(costs[-1] + step_cost)
+        return costs
+
+    @staticmethod
+    def get_cumulative_costs(route: List[Waypoint]):
+        """
+        Returns the costs from the first waypoint of the route to every waypoint of the route or None if the route
+        passes a confirmed block.
+        """
+        costs = [0]
+        for waypoint, next_waypoint in zip(route, route[1:]):
+            angle = AlternativeRoutePlanner.__get_angle(waypoint, next_waypoint)
+            if angle is None or not angle.edge.traversable or not next_waypoint.traversable:
+                return None
+            cost = costs[-1] + angle.edge.get_weight() + next_waypoint.expected_block_cost
+            violations = next_waypoint.violation + angle.edge.violation
+            if violations:
+                cost += violations * PathPlanner.VIOLATION_COST
+            costs.append(cost)
+        return costs
+
+    @staticmethod
+    def __get_angle(waypoint, next_waypoint):
+        for angle in waypoint.angles:
+            if angle.outgoing_waypoint is next_waypoint:
+                return angle
+        return None
+
+    def __search(self, snapshot, start_waypoint, target_waypoint, excluded_indexes, excluded_edges):
+        # Dijkstra which stops at the target waypoint, the scratch state is kept in dicts because most searches of
+        # Yen's algorithm only visit a small part of the graph
+        waypoints = self.waypoints
+        start_index = start_waypoint.index
+        target_index = target_waypoint.index
+        costs = {start_index: 0}
+        previous_indexes = {}
+        visited = set()
+        # ties are broken by the waypoint id like in the PathPlanner
+        queue = [(0, start_waypoint.id, start_index)]
+        while queue:
+            cost, _, index = heappop(queue)
+            if index in visited:
+                continue
+            visited.add(index)
+            if index == target_index:
+                break
+            for outgoing_index, step_cost in snapshot[index]:
+                if outgoing_index in excluded_indexes or outgoing_index in visited:
+                    continue
+                if (index, outgoing_index) in excluded_edges:
+                    continue
+                calculated_cost = cost + step_cost
+                if calculated_cost < costs.get(outgoing_index, calculated_cost + 1):
+                    costs[outgoing_index] = calculated_cost
+                    previous_indexes[outgoing_index] = index
+                    heappush(queue, (calculated_cost, waypoints[outgoing_index].id, outgoing_index))
+        if target_index not in visited:
+            return None
+        indexes = [target_index]
+        while indexes[-1] != start_index:
+            indexes.append(previous_indexes[indexes[-1]])
+        indexes.reverse()
+        return [waypoints[i] for i in indexes], [costs[i] for i in indexes]
@@ -4,6 +4,8 @@ class Angle:
     """
     Represents an outgoing angle from one waypoint to another.
     """
+    __slots__ = ("outgoing_waypoint", "value", "edge")
+
     def __init__(self, outgoing_waypoint, value: float, edge: Edge):
         self.outgoing_waypoint = outgoing_waypoint
         self.value = value
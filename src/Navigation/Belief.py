@@ -0,0 +1,51 @@
+import math
+
+
+class Belief:
+    """
+    Probability that a waypoint is blocked or an edge is obstructed, fused from repeated uncertain observations of the
+    object detection. The observations are added up in log-odds, so every observation is weighted by its confidence and
+    contradicting observations cancel each other out.
+    """
+
+    # used for observations of detectors which do not report a confidence
+    DEFAULT_CONFIDENCE = 0.8
+    # every observation counts as evidence, even if the detector itself was not sure
+    MIN_CONFIDENCE = 0.55
+    # a single observation is never taken as certain, so it can be outweighed by later observations
+    MAX_CONFIDENCE = 0.99
+    MAX_LOG_ODDS = 10.0
+
+    __slots__ = ("log_odds", "observation_count")
+
+    def __init__(self):
+        self.log_odds = 0.0
+        self.observation_count = 0
+
+    @staticmethod
+    def from_log_odds(log_odds: float, observation_count: int):
+        belief = Belief()
+        belief.log_odds = log_odds
+        belief.observation_count = observation_count
+        return belief
+
+    def observe(self, is_present: bool, confidence: float = None):
+        """
+        Adds an observation which reports the property as present or absent with the given confidence.
+        """
+        if confidence is None:
+            confidence = self.DEFAULT_CONFIDENCE
+        confidence = min(max(confidence, self.MIN_CONFIDENCE), self.MAX_CONFIDENCE)
+        evidence = math.log(confidence / (1.0 - confidence))
+        log_odds = self.log_odds + evidence if is_present else self.log_odds - evidence
+        self.log_odds = min(max(log_odds, -self.MAX_LOG_ODDS), self.MAX_LOG_ODDS)
+        self.observation_count += 1
+
+    def get_probability(self):
+        return 1.0 / (1.0 + math.exp(-self.log_odds))
+
+    def get_observation_count(self):
+        return self.observation_count
+
+    def __str__(self):
+        return f"Belief[Probability:{self.get_probability():.3f};Observations:{self.observation_count}]"
@@ -1,18 +1,118 @@
 from Navigation.EdgeStatus import EdgeStatus
+from Navigation.Belief import Belief
+
+# edges with these statuses can not be used to drive to the outgoing waypoint
+NOT_TRAVERSABLE_EDGE_STATUSES = frozenset([EdgeStatus.MISSING])
+# edges with these statuses are only used by the planner if there is no path without uncertain blocks
+POTENTIALLY_NOT_TRAVERSABLE_EDGE_STATUSES = frozenset([EdgeStatus.POTENTIALLY_MISSING])
+# statuses which are known for sure, observations of the object detection do not change them. MISSING is not one of
+# them, a line which was not seen during one point scan can be seen during a later one
+CONFIRMED_EDGE_STATUSES = frozenset([EdgeStatus.FREE])
+# cost of the initial status, the value of an enum member is looked up slowly and edges are created in bulk
+UNKNOWN_EDGE_COST = EdgeStatus.UNKNOWN.value
 
 class Edge:
+    __slots__ = ("_status", "length", "traversable", "violation", "status_cost", "obstruction_belief", "owner")
+
     def __init__(self):
-        self.status = EdgeStatus.UNKNOWN
+        self._status = EdgeStatus.UNKNOWN
         self.length = 1
+        # precomputed from the status, so the planner only has to check this flag
+        self.traversable = True
+        # 1 if the status is an uncertain block, the planner counts it as a violation
+        self.violation = 0
+        # cost of the status used by get_weight, the expected cost if the status is based on observations
+        self.status_cost = UNKNOWN_EDGE_COST
+        # probability that the edge is obstructed, None if the status was not set by observations
+        self.obstruction_belief = None
+        # the waypoint whose angle contains this edge, it is notified when the status changes
+        self.owner = None
+
+    def reset(self):
+        """
+        Restores the initial status without notifying the owner, e.g. to reuse the graph for another mission.
+        """
+        self._status = EdgeStatus.UNKNOWN
+        self.traversable = True
+        self.violation = 0
+        self.status_cost = UNKNOWN_EDGE_COST
+        self.obstruction_belief = None
+
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, status):
+        if status == self._status and self.obstruction_belief is None:
+            return
+        # a status which is set directly replaces all observations
+        self.obstruction_belief = None
+        self.__update_status(status, status.value)
+
+    def observe_obstruction(self, is_obstructed: bool, confidence: float = None):
+        """
+        Fuses an observation of the object detection into the probability that the edge is obstructed. The status is
+        set to the more likely one of POTENTIALLY_OBSTRUCTED and POTENTIALLY_FREE and the weight to the expected cost,
+        so a MISSING line which is seen again can be driven again. Confirmed statuses, including OBSTRUCTED set by a
+        detected obstacle, are kept.
+        """
+        if self.is_confirmed():
+            return
+        belief = self.obstruction_belief or Belief()
+        belief.observe(is_obstructed, confidence)
+        self.set_obstruction_belief(belief)
+
+    def is_confirmed(self):
+        """
+        Returns True if the status is known for sure, so observations of the object detection do not change it.
+        """
+        return self._status in CONFIRMED_EDGE_STATUSES or (
+            self._status == EdgeStatus.OBSTRUCTED and self.obstruction_belief is None
+        )
+
+    def set_obstruction_belief(self, belief: Belief):
+        """
+        Sets the status and the expected cost from the probability of the belief, e.g. to restore a recorded belief.
+        """
+        probability = belief.get_probability()
+        status = EdgeStatus.POTENTIALLY_OBSTRUCTED if probability > 0.5 else EdgeStatus.POTENTIALLY_FREE
+        expected_cost = probability * EdgeStatus.POTENTIALLY_OBSTRUCTED.value + (1.0 - probability) * EdgeStatus.POTENTIALLY_FREE.value
+        self.__update_status(status, round(expected_cost))
+        self.obstruction_belief = belief
+
+    def __update_status(self, status, status_cost):
+        self._status = status
+        self.status_cost = status_cost
+        self.violation = int(status in POTENTIALLY_NOT_TRAVERSABLE_EDGE_STATUSES)
+        traversable = status not in NOT_TRAVERSABLE_EDGE_STATUSES
+        if traversable != self.traversable:
+            self.traversable = traversable
+            if self.owner is not None:
+                self.owner.invalidate_possible_angles()
+        if self.owner is not None:
+            self.owner.notify_status_changed()
 
     def get_weight(self) -> int:
-        return self.status.value + (self.length * 10)
+        return self.status_cost + (self.length * 10)
     
     def get_status(self):
-        return self.status
+        return self._status
     
     def set_status(self, status):
         self.status = status
 
+    def is_traversable(self):
+        return self.traversable
+
+    def get_violation(self):
+        return self.violation
+
+    def get_obstruction_probability(self):
+        """
+        Returns the fused probability that the edge is obstructed or None if the status was not set by observations.
+        """
+        return self.obstruction_belief.get_probability() if self.obstruction_belief is not None else None
+
     def __str__(self):
-        return f"Edge[status:{self.status};Length:{self.length}]"
\ No newline at end of file
+        return f"Edge[status:{self._status};Length:{self.length}]"
\ No newline at end of file
@@ -1,69 +1,260 @@
-import sys
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 from Navigation.Waypoint import Waypoint
 from Navigation.WaypointStatus import WaypointStatus
 from Navigation.EdgeStatus import EdgeStatus
 from Navigation.Angle import Angle
 from Navigation.Edge import Edge
+from Navigation.PathPlanner import PathPlanner
+from Navigation.TurnAwarePathPlanner import TurnAwarePathPlanner
+from Navigation.TurnCostModel import TurnCostModel
+from Navigation.MissionPlanner import MissionPlanner
+from Navigation.AlternativeRoutePlanner import AlternativeRoutePlanner
+from Navigation.GraphFork import GraphFork
+from Navigation.GraphTemplate import GraphTemplate
+from Configuration.ConfigurationDiff import ConfigurationDiff
 from Configuration.Configurator import Configurator
 from Validation.Validator import Validator
 from Exceptions.NoPathLeftError import NoPathLeftError
+from Instrumentation.Instrumentation import Instrumentation
+from Logger.Logger import Logger
+
+logger = Logger("Graph")
 
 
 class Graph:
     """
     Logical representation of the waypoint network. This graph is updated regularly based on the information provided by the sensors.
     On each waypoint, the fastet path to the target waypoint is calculated using Dijkstra's algorithm.
+    Uncertain blocks from the object detection are only passed if there is no other path, so they are never reset.
+    After each plan, alternative routes to the target waypoint are calculated in the background. When the planned route
+    gets blocked, the best alternative is used without a new search.
     """
 
-    def __init__(self):
+    # waypoint X is the starting position which is not a physical waypoint
+    START_WAYPOINT_ID = "X"
+    # number of routes to the target waypoint which are kept, including the planned one
+    ALTERNATIVE_ROUTE_COUNT = 3
+
+    # shared by all graphs, the calculations of one graph replace each other anyway
+    _alternative_route_executor = None
+
+    def __init__(self, waypoints_configuration=None, template: GraphTemplate = None):
+        """
+        Creates the graph from the template of the configuration, by default the one of the Configurator. The template
+        is built once per configuration.
+        """
         self.current_waypoint: Waypoint = None
         self.target_waypoint: Waypoint = None
         self.previous_waypoint: Waypoint = None
         self.waypoints = []
+        self.__waypoints_by_id = {}
+        # incremented on every status change of a waypoint or edge, plans are only valid for the version they were made for
+        self.version = 0
+        # (version, current waypoint, target waypoint) of the stored shortest path, None if there is no valid plan
+        self.__planned_state = None
+        if template is None:
+            if waypoints_configuration is None:
+                waypoints_configuration = Configurator().get_waypoints()
+            template = GraphTemplate.get(waypoints_configuration)
+        # the template the graph was created from, changes of the configuration are applied to the waypoints directly
+        self.template = template
+        # the configuration the graph reflects, None if it was created from a template alone
+        self.waypoints_configuration = waypoints_configuration
         self.__initialize_waypoints()
+        self.planner = PathPlanner(self.waypoints)
+        self.alternative_route_planner = AlternativeRoutePlanner(self.waypoints, self.ALTERNATIVE_ROUTE_COUNT)
+        # background calculation of the alternatives to the last planned route and the target waypoint of that route
+        self.__alternative_routes_future = None
+        self.__alternative_routes_target_waypoint = None
         self.shortest_path_to_target = []
-        # this is used to prevent the object detection data from being reset multiple times
-        self.is_object_detection_data_reset = False
+        # target waypoints of the current mission in the order they are visited, the first one is the target waypoint
+        self.mission_target_waypoints = []
 
     def __initialize_waypoints(self):
-        # waypoint X is the starting position which is not a physical waypoint
-        x = Waypoint("X")
-        s = Waypoint("S")
-        h = Waypoint("H")
-        g = Waypoint("G")
-        f = Waypoint("F")
-        i = Waypoint("I")
-        a = Waypoint("A")
-        c = Waypoint("C")
-        b = Waypoint("B")
-        self.waypoints = [x, s, h, g, f, i, a, c, b]
-        self.current_waypoint = x
-        self.current_waypoint.set_dijkstra_visited(True)
+        template = self.template
+        for index, waypoint_id in enumerate(template.waypoint_ids):
+            waypoint = Waypoint(waypoint_id, index)
+            waypoint.status_listener = self
+            self.waypoints.append(waypoint)
+            self.__waypoints_by_id[waypoint_id] = waypoint
+        waypoints = self.waypoints
+        for waypoint, template_angles in zip(waypoints, template.angles):
+            # the angles are wired directly, set_angles would notify the graph once per waypoint
+            waypoint.angles = [Angle(waypoints[index], value, Edge()) for index, value in template_angles]
+            for angle in waypoint.angles:
+                angle.outgoing_waypoint.incoming_waypoints.append(waypoint)
+                angle.edge.owner = waypoint
+        self.current_waypoint = self._get_waypoint_by_id(self.START_WAYPOINT_ID)
+        self.current_waypoint.set_status(WaypointStatus.FREE)
+
+    def reset(self):
+        """
+        Restores the statuses of the start up and clears the mission, so the graph can be reused for another mission
+        instead of creating a new one. Only the statuses are reset, the waypoints, angles and edges are kept.
+        """
+        if self.__alternative_routes_future is not None:
+            self.__alternative_routes_future.cancel()
+            self.wait_for_alternative_routes()
+        self.__alternative_routes_future = None
+        self.__alternative_routes_target_waypoint = None
+        for waypoint in self.waypoints:
+            waypoint.reset()
+            for angle in waypoint.angles:
+                angle.edge.reset()
+        self.current_waypoint = self._get_waypoint_by_id(self.START_WAYPOINT_ID)
+        self.target_waypoint = None
+        self.previous_waypoint = None
+        self.shortest_path_to_target.clear()
+        self.mission_target_waypoints = []
+        self.__planned_state = None
+        # notifies the graph, the statuses of earlier versions are gone
         self.current_waypoint.set_status(WaypointStatus.FREE)
-        self.__load_configuration_angles()
 
-    def __load_configuration_angles(self):
-        for waypoint_id, waypoint_data in Configurator().get_waypoints().items():
-            waypoint = self._get_waypoint_by_id(waypoint_id)
+    @Instrumentation.timed()
+    def update_configuration(self, waypoints_configuration=None, diff: ConfigurationDiff = None):
+        """
+        Updates the graph to a changed configuration, by default the one of the Configurator, e.g. after
+        Configurator.reload. Only the waypoints and edges which were added, removed or whose angle changed are touched,
+        by the given diff of the change, e.g. from the ConfigurationWatcher, or else by the diff to the configuration
+        of the graph. Waypoints and edges which are in both configurations keep their statuses and beliefs, even if an
+        angle changed, added ones start unknown and removed ones are dropped. The current, previous and target
+        waypoints and the targets of the mission must not be removed.
+        """
+        if waypoints_configuration is None:
+            waypoints_configuration = diff.new_configuration["waypoints"] if diff is not None else Configurator().get_waypoints()
+        if (
+            diff is None
+            or diff.old_configuration["waypoints"] is not self.waypoints_configuration
+            or diff.new_configuration["waypoints"] is not waypoints_configuration
+        ):
+            # the diff does not start from the configuration of the graph, e.g. an earlier change was not applied
+            if self.waypoints_configuration is None:
+                raise ValueError("The graph was not created from a configuration, so it cannot be updated")
+            diff = ConfigurationDiff.from_waypoints(self.waypoints_configuration, waypoints_configuration)
+        removed_waypoint_ids = set(diff.removed_waypoint_ids)
+        for waypoint in [self.current_waypoint, self.previous_waypoint, self.target_waypoint] + self.mission_target_waypoints:
+            if waypoint is not None and waypoint.get_id() in removed_waypoint_ids:
+                raise ValueError(f"Waypoint with id {waypoint.get_id()} is in use and cannot be removed")
+        self.waypoints_configuration = waypoints_configuration
+        if not diff.has_graph_changes():
+            return
+        if self.__alternative_routes_future is not None:
+            self.__alternative_routes_future.cancel()
+            self.wait_for_alternative_routes()
+        self.__alternative_routes_future = None
+        self.__alternative_routes_target_waypoint = None
+        removed_waypoints = [self.__waypoints_by_id.pop(waypoint_id) for waypoint_id in diff.removed_waypoint_ids]
+        for waypoint in removed_waypoints:
+            waypoint.set_angles([])
+        for waypoint_id in diff.added_waypoint_ids:
+            waypoint = Waypoint(waypoint_id, len(self.__waypoints_by_id))
+            waypoint.status_listener = self
+            self.__waypoints_by_id[waypoint_id] = waypoint
+        if removed_waypoints or diff.added_waypoint_ids:
+            # the index order depends on all waypoint ids, see GraphTemplate. The planners keep the list, so it is
+            # updated in place
+            self.waypoints[:] = [self.__waypoints_by_id[i] for i in GraphTemplate.get_waypoint_order(waypoints_configuration)]
+            for index, waypoint in enumerate(self.waypoints):
+                waypoint.index = index
+        # the angles of the waypoints whose edges changed are rebuilt in the order of the configuration
+        changed_waypoint_ids = {waypoint_id for waypoint_id, _ in diff.added_edges + diff.removed_edges + diff.changed_edges}
+        for waypoint_id in changed_waypoint_ids - removed_waypoint_ids:
+            waypoint = self.__waypoints_by_id[waypoint_id]
+            angles_by_waypoint_id = {a.outgoing_waypoint.get_id(): a for a in waypoint.angles}
             angles = []
-            for outgoing_waypoint_id, outgoing_waypoint_data in waypoint_data["edges"].items():
-                edge = Edge()
-                angle = outgoing_waypoint_data["angle"]
-                outgoing_waypoint = self._get_waypoint_by_id(outgoing_waypoint_id)
-                angle = Angle(outgoing_waypoint, angle, edge)
+            for outgoing_waypoint_id, edge_data in waypoints_configuration[waypoint_id]["edges"].items():
+                angle = angles_by_waypoint_id.get(outgoing_waypoint_id)
+                if angle is None:
+                    angle = Angle(self.__waypoints_by_id[outgoing_waypoint_id], edge_data["angle"], Edge())
+                else:
+                    angle.value = edge_data["angle"]
                 angles.append(angle)
+            # the angle caches of the waypoint are rebuilt
             waypoint.set_angles(angles)
+        if isinstance(self.planner, TurnAwarePathPlanner):
+            # the turn costs are precomputed from the angles
+            self.planner = TurnAwarePathPlanner(self.waypoints, self.planner.turn_cost_model)
+        removed_waypoints_set = set(removed_waypoints)
+        if any(w in removed_waypoints_set for w in self.shortest_path_to_target):
+            self.shortest_path_to_target.clear()
+        self.__planned_state = None
+        self.on_status_changed()
+        logger.info(
+            "configuration updated",
+            waypoints=len(self.waypoints),
+            added_waypoints=len(diff.added_waypoint_ids),
+            removed_waypoints=len(removed_waypoints),
+            changed_waypoints=len(changed_waypoint_ids),
+        )
+
+    def on_status_changed(self):
+        self.version += 1
+
+    def set_turn_cost_model(self, turn_cost_model: TurnCostModel = None):
+        """
+        Plans the paths with the shortest drive time including the turns at the waypoints with the model, or by the
+        weights of the edges alone if it is None. The alternative routes are still compared by the weights of the edges.
+        """
+        if turn_cost_model is None:
+            self.planner = PathPlanner(self.waypoints)
+        else:
+            self.planner = TurnAwarePathPlanner(self.waypoints, turn_cost_model)
+        self.__planned_state = None
+
+    def fork(self) -> GraphFork:
+        """
+        Returns a copy-on-write view of the statuses for speculative planning, changes of the fork do not change the graph.
+        """
+        return GraphFork(self)
 
     def _get_waypoint_by_id(self, id):
-        return [w for w in self.waypoints if w.get_id() == id][0]
+        return self.__waypoints_by_id[id]
 
     def __validate_if_waypoint_exists(self, waypoint_id):
-        if not any(w.get_id() == waypoint_id for w in self.waypoints):
+        if waypoint_id not in self.__waypoints_by_id:
             raise ValueError(f"Waypoint with id {waypoint_id} does not exist")
 
     def set_target_waypoint(self, target_waypoint_id: str):
         self.__validate_if_waypoint_exists(target_waypoint_id)
         self.target_waypoint = self._get_waypoint_by_id(target_waypoint_id)
+        self.mission_target_waypoints = [self.target_waypoint]
+
+    @Instrumentation.timed()
+    def set_mission(self, target_waypoint_ids: List[str]):
+        """
+        Sets multiple target waypoints which are visited in the order with the lowest total weight.
+        The graph is kept between the legs of the mission, so everything learned on one leg is used on the next.
+        Targets on the current waypoint are already reached, if there are only such targets, has_reached_target_waypoint
+        is True afterwards.
+        """
+        if len(target_waypoint_ids) == 0:
+            raise ValueError("A mission must contain at least one target waypoint")
+        for target_waypoint_id in target_waypoint_ids:
+            self.__validate_if_waypoint_exists(target_waypoint_id)
+        target_waypoints = [self._get_waypoint_by_id(i) for i in target_waypoint_ids]
+        target_waypoints = [w for w in target_waypoints if w is not self.current_waypoint]
+        if not target_waypoints:
+            self.mission_target_waypoints = [self.current_waypoint]
+        else:
+            self.mission_target_waypoints = MissionPlanner(self.waypoints).order_targets(self.current_waypoint, target_waypoints)
+        self.target_waypoint = self.mission_target_waypoints[0]
+
+    def get_mission_target_waypoints(self):
+        return self.mission_target_waypoints
+
+    def advance_mission(self):
+        """
+        Sets the next target waypoint of the mission once the current target waypoint is reached.
+        Returns False if there is no target waypoint left.
+        """
+        while self.mission_target_waypoints and self.mission_target_waypoints[0] == self.current_waypoint:
+            self.mission_target_waypoints.pop(0)
+        if not self.mission_target_waypoints:
+            return False
+        self.target_waypoint = self.mission_target_waypoints[0]
+        return True
 
     def go_to_next_best_waypoint(self):
         next_best_waypoint = self.get_next_best_waypoint()
@@ -72,54 +263,106 @@ class Graph:
         self.current_waypoint = next_best_waypoint
         return next_best_waypoint.get_id()
 
+    @Instrumentation.timed()
     def get_next_best_waypoint(self):
-        self.__calculate_shortest_path()
-        self.__store_shortest_path()
+        """
+        Returns the first waypoint of the shortest path to the target waypoint.
+        The path is only recalculated if a status, the current waypoint or the target waypoint changed since the last call.
+        """
+        if self.__planned_state != (self.version, self.current_waypoint, self.target_waypoint):
+            self.__planned_state = None
+            if not self.__switch_to_alternative_route():
+                self.__calculate_shortest_path()
+                self.__store_shortest_path()
+            self.__planned_state = (self.version, self.current_waypoint, self.target_waypoint)
+            self.__calculate_alternative_routes()
         return self.shortest_path_to_target[0]
 
-    def __store_shortest_path(self):
-        node = self.target_waypoint
-        try:
-            while node.get_id() != self.current_waypoint.get_id():
-                self.shortest_path_to_target.insert(0, node)
-                node = node.get_previous_node_to_this_waypoint()
-            print(
-                "[pi    ] shortest path: ",
-                list(map(lambda n: n.get_id(), self.shortest_path_to_target)),
-            )
-            self.is_object_detection_data_reset = False
-        except AttributeError:
-            # if the target waypoint is not reachable, the previous node is None and leads to an AttributeError
-            self.__handle_no_path_left()
+    def __calculate_alternative_routes(self):
+        if self.ALTERNATIVE_ROUTE_COUNT <= 1:
+            return
+        if self.__alternative_routes_future is not None:
+            # an outdated calculation which did not start yet is not needed anymore
+            self.__alternative_routes_future.cancel()
+        if Graph._alternative_route_executor is None:
+            Graph._alternative_route_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alternative-routes")
+        route = [self.current_waypoint] + self.shortest_path_to_target
+        self.__alternative_routes_target_waypoint = self.target_waypoint
+        # the snapshot of the statuses is taken by the background thread, not by the handler which planned
+        self.__alternative_routes_future = Graph._alternative_route_executor.submit(
+            self.alternative_route_planner.calculate, route
+        )
 
-    def get_shortest_path_to_target(self):
-        return self.shortest_path_to_target
+    def wait_for_alternative_routes(self):
+        """
+        Blocks until the alternative routes of the last plan are calculated.
+        """
+        future = self.__alternative_routes_future
+        if future is not None and not future.cancelled():
+            future.exception()
+
+    def __get_alternative_routes(self):
+        future = self.__alternative_routes_future
+        if future is None or future.cancelled():
+            return []
+        if self.__alternative_routes_target_waypoint is not self.target_waypoint:
+            return []
+        if not future.done():
+            # a new search is faster than waiting for the calculation
+            return []
+        if future.exception() is not None:
+            logger.error("calculation of alternative routes failed", error=repr(future.exception()))
+            return []
+        return future.result()
+
+    def __switch_to_alternative_route(self):
+        """
+        Uses the best alternative route from the current waypoint if the planned route got more expensive, e.g. because
+        a cone, an obstacle or a missing line was detected on it. Returns False if a new search is needed.
+        """
+        routes = self.__get_alternative_routes()
+        if not routes:
+            return False
+        planned_route, planned_costs = routes[0]
+        if self.current_waypoint not in planned_route:
+            return False
+        position = planned_route.index(self.current_waypoint)
+        costs = AlternativeRoutePlanner.get_cumulative_costs(planned_route[position:])
+        if costs is not None and costs[-1] <= planned_costs[-1] - planned_costs[position]:
+            # the planned route did not get worse, a new search might find a better route
+            return False
+        best_route = None
+        best_cost = None
+        for route, _ in routes:
+            if self.current_waypoint not in route:
+                continue
+            route = route[route.index(self.current_waypoint):]
+            costs = AlternativeRoutePlanner.get_cumulative_costs(route)
+            if len(route) > 1 and costs is not None and (best_cost is None or costs[-1] < best_cost):
+                best_route = route
+                best_cost = costs[-1]
+        if best_route is None:
+            return False
+        self.shortest_path_to_target.clear()
+        self.shortest_path_to_target.extend(best_route[1:])
+        logger.info("switched to alternative route", path=tuple(w.get_id() for w in self.shortest_path_to_target))
+        return True
 
-    def __handle_no_path_left(self):
-        # prevents infinite loops
-        if self.is_object_detection_data_reset:
+    def __store_shortest_path(self):
+        path = self.planner.get_path_to(self.target_waypoint)
+        if path is None:
+            # only confirmed blocks separate the current waypoint from the target waypoint
+            logger.warning("no path to target waypoint left", target=self.target_waypoint.get_id())
             raise NoPathLeftError()
-        print(
-            "[pi    ] no path to target waypoint left, resetting objecet detection data"
-        )
-        self.__reset_object_detection_data()
-        self.is_object_detection_data_reset = True
-        self.get_next_best_waypoint()
+        self.shortest_path_to_target.extend(path)
+        violations = self.planner.get_violations_to(self.target_waypoint)
+        if violations:
+            logger.debug("shortest path passes uncertain blocks", violations=violations)
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug("shortest path", path=tuple(n.get_id() for n in self.shortest_path_to_target))
 
-    def __reset_object_detection_data(self):
-        for waypoint in self.waypoints:
-            if waypoint.get_status() in [
-                WaypointStatus.POTENTIALLY_BLOCKED,
-                WaypointStatus.POTENTIALLY_FREE,
-            ]:
-                waypoint.set_status(WaypointStatus.UNKNOWN)
-            for angle in waypoint.get_angles():
-                if angle.get_edge().get_status() in [
-                    EdgeStatus.POTENTIALLY_OBSTRUCTED,
-                    EdgeStatus.POTENTIALLY_FREE,
-                    EdgeStatus.POTENTIALLY_MISSING,
-                ]:
-                    angle.get_edge().set_status(EdgeStatus.UNKNOWN)
+    def get_shortest_path_to_target(self):
+        return self.shortest_path_to_target
 
     def go_back_to_previous_waypoint(self):
         temp_current_waypoint = self.current_waypoint
@@ -138,17 +381,31 @@ class Graph:
         self.current_waypoint.update_edge_to_waypoint(self.previous_waypoint.get_id(), edge_status)
         self.previous_waypoint.update_edge_to_waypoint(self.current_waypoint.get_id(), edge_status)
 
+    def get_confirmed_angle(self, angle_value: float):
+        """
+        Returns the angle of the current waypoint closest to the value if its waypoint and edge are confirmed, so
+        update_waypoint_from_angle would keep their statuses whatever is detected in this direction, otherwise None.
+        Missing lines are not confirmed, they are detected again in case the line is there after all.
+        """
+        Validator.validate_angle_value(angle_value)
+        angle = self.current_waypoint.get_angles_from_values([angle_value])[0]
+        if angle.outgoing_waypoint.is_confirmed() and angle.edge.is_confirmed():
+            return angle
+        return None
+
     def update_waypoint_from_angle(
         self,
         angle_value: float,
         waypoint_status: WaypointStatus,
         edge_status: EdgeStatus,
+        waypoint_confidence: float = None,
+        edge_confidence: float = None,
     ):
         Validator.validate_angle_value(angle_value)
         Validator.validate_waypoint_status(waypoint_status)
         Validator.validate_edge_status(edge_status)
         return self.current_waypoint.update_angle(
-            angle_value, waypoint_status, edge_status
+            angle_value, waypoint_status, edge_status, waypoint_confidence, edge_confidence
         )
 
     def update_missing_angles(self):
@@ -171,57 +428,11 @@ class Graph:
         incoming_edge.set_status(EdgeStatus.MISSING)
 
     def __calculate_shortest_path(self):
-        # dijkstra
-        self.__reset_dijkstra()
-        self.current_waypoint.set_weight_to_target(0)
-        while self.__has_next_unvisited_node():
-            current_node = self.__get_next_unvisited_node()
-            for angle in current_node.get_possible_angles():
-                outgoing_node = angle.get_waypoint()
-                outgoing_edge = angle.get_edge()
-                calculated_weight_to_target_on_outgoing_node = (
-                    current_node.get_weight_to_target() + outgoing_edge.get_weight()
-                )
-                current_weight_to_target_on_outgoing_node = (
-                    outgoing_node.get_weight_to_target()
-                )
-                if (
-                    calculated_weight_to_target_on_outgoing_node
-                    < current_weight_to_target_on_outgoing_node
-                    and not outgoing_node.get_dijkstra_visited()
-                ):
-                    outgoing_node.set_weight_to_target(
-                        calculated_weight_to_target_on_outgoing_node
-                    )
-                    outgoing_node.set_previous_node_to_this_waypoint(current_node)
-            current_node.set_dijkstra_visited(True)
-
-    def __reset_dijkstra(self):
         self.shortest_path_to_target.clear()
-        for waypoint in self.waypoints:
-            waypoint.set_dijkstra_visited(False)
-            waypoint.set_previous_node_to_this_waypoint(None)
-            waypoint.set_weight_to_target(sys.maxsize)
-            waypoint.set_previous_node_to_this_waypoint(None)
-
-    def __get_next_unvisited_node(self):
-        unvisited_nodes = self.__get_unvisited_nodes()
-        return min(unvisited_nodes, key=lambda n: n.get_weight_to_target())
-
-    def __has_next_unvisited_node(self):
-        return len(self.__get_unvisited_nodes()) > 0
-
-    def __get_unvisited_nodes(self):
-        return [
-            w
-            for w in self.waypoints
-            if w.get_dijkstra_visited() == False
-            and w.get_status()
-            not in [WaypointStatus.BLOCKED, WaypointStatus.POTENTIALLY_BLOCKED]
-        ]
+        self.planner.calculate(self.current_waypoint, self.target_waypoint)
 
     def cone_detected(self):
-        self.current_waypoint.status = WaypointStatus.BLOCKED
+        self.current_waypoint.set_status(WaypointStatus.BLOCKED)
 
     def obstacle_detected(self):
         edge_from_previous = self.previous_waypoint.get_edge_to_waypoint(
@@ -0,0 +1,174 @@
+from Navigation.EdgeStatus import EdgeStatus
+from Navigation.WaypointStatus import WaypointStatus
+from Navigation.PathPlanner import PathPlanner
+from Navigation.Waypoint import NOT_TRAVERSABLE_WAYPOINT_STATUSES, POTENTIALLY_NOT_TRAVERSABLE_WAYPOINT_STATUSES
+from Navigation.Edge import NOT_TRAVERSABLE_EDGE_STATUSES, POTENTIALLY_NOT_TRAVERSABLE_EDGE_STATUSES
+from Instrumentation.Instrumentation import Instrumentation
+
+
+class GraphFork:
+    """
+    Copy-on-write view of the statuses of a graph for speculative planning, e.g. what if this edge turns out obstructed.
+    A fork shares the waypoints, angles and edges of the graph and only stores the statuses set in the fork, so forking
+    costs O(1) and setting a status stores a single entry. The statuses of a fork are layered: when a fork is forked,
+    its entries are frozen into a layer shared by both, and both continue with an empty layer of their own.
+    Statuses which were not set in a fork are read from the graph, is_outdated tells whether the graph changed since.
+    plan only uses local scratch state, so forks can be planned concurrently from worker threads as long as the graph
+    itself is not changed meanwhile.
+    """
+
+    def __init__(self, graph, parent_layers=None):
+        self.graph = graph
+        self.graph_version = graph.version
+        self.current_waypoint = graph.current_waypoint
+        self.target_waypoint = graph.target_waypoint
+        # frozen layers of the forks this fork was forked from as (entries, parent layers), None for no layers
+        self.parent_layers = parent_layers
+        # statuses set in this fork by waypoint or edge, with the values the planner needs
+        self.entries = {}
+        # all entries of this fork and its layers, None when they have to be merged again
+        self.merged_entries = None
+
+    def fork(self):
+        """
+        Returns a new fork with the statuses of this fork, changes of either are not visible in the other.
+        """
+        if self.entries:
+            self.parent_layers = (self.entries, self.parent_layers)
+            self.entries = {}
+        fork = GraphFork(self.graph, self.parent_layers)
+        fork.graph_version = self.graph_version
+        fork.current_waypoint = self.current_waypoint
+        fork.target_waypoint = self.target_waypoint
+        fork.merged_entries = self.merged_entries
+        return fork
+
+    def is_outdated(self):
+        """
+        Returns True if a status of the graph changed since the fork, the fork reads the new status where it did not set
+        one itself.
+        """
+        return self.graph.version != self.graph_version
+
+    def get_entry_count(self):
+        """
+        Returns the number of statuses set in this fork since it was forked or last forked.
+        """
+        return len(self.entries)
+
+    def set_current_waypoint(self, waypoint_id: str):
+        self.current_waypoint = self.__get_waypoint(waypoint_id)
+
+    def set_target_waypoint(self, waypoint_id: str):
+        self.target_waypoint = self.__get_waypoint(waypoint_id)
+
+    def set_waypoint_status(self, waypoint_id: str, status: WaypointStatus):
+        waypoint = self.__get_waypoint(waypoint_id)
+        self.entries[waypoint] = (
+            status,
+            status not in NOT_TRAVERSABLE_WAYPOINT_STATUSES,
+            int(status in POTENTIALLY_NOT_TRAVERSABLE_WAYPOINT_STATUSES),
+            0,
+        )
+        self.merged_entries = None
+
+    def set_edge_status(self, from_waypoint_id: str, to_waypoint_id: str, status: EdgeStatus):
+        edge = self.__get_edge(from_waypoint_id, to_waypoint_id)
+        self.entries[edge] = (
+            status,
+            status not in NOT_TRAVERSABLE_EDGE_STATUSES,
+            int(status in POTENTIALLY_NOT_TRAVERSABLE_EDGE_STATUSES),
+            status.value + edge.length * 10,
+        )
+        self.merged_entries = None
+
+    def get_waypoint_status(self, waypoint_id: str) -> WaypointStatus:
+        waypoint = self.__get_waypoint(waypoint_id)
+        entry = self.__get_merged_entries().get(waypoint)
+        return waypoint.get_status() if entry is None else entry[0]
+
+    def get_edge_status(self, from_waypoint_id: str, to_waypoint_id: str) -> EdgeStatus:
+        edge = self.__get_edge(from_waypoint_id, to_waypoint_id)
+        entry = self.__get_merged_entries().get(edge)
+        return edge.get_status() if entry is None else entry[0]
+
+    @Instrumentation.timed()
+    def plan(self, target_waypoint_id: str = None, start_waypoint_id: str = None):
+        """
+        Returns the shortest path from the start waypoint (exclusive) to the target waypoint (inclusive) with the
+        statuses of this fork as (waypoints, violations, weight), or None if the target waypoint is not reachable.
+        Paths are compared like in the PathPlanner, the current and target waypoint of the fork are used by default.
+        """
+        start_waypoint = self.current_waypoint if start_waypoint_id is None else self.__get_waypoint(start_waypoint_id)
+        target_waypoint = self.target_waypoint if target_waypoint_id is None else self.__get_waypoint(target_waypoint_id)
+        if start_waypoint is None or target_waypoint is None:
+            raise ValueError("A fork needs a start and a target waypoint to plan")
+        entries = self.__get_merged_entries()
+        waypoints = self.graph.waypoints
+
+        def get_steps(index):
+            current_node = waypoints[index]
+            entry = entries.get(current_node)
+            if not (current_node.traversable if entry is None else entry[1]):
+                return ()
+            # the possible angles of the graph do not know the statuses of the fork
+            return [(angle.outgoing_waypoint.index, angle) for angle in current_node.angles]
+
+        def get_step_cost(angle):
+            outgoing_waypoint = angle.outgoing_waypoint
+            edge = angle.edge
+            entry = entries.get(edge)
+            if entry is None:
+                if not edge.traversable:
+                    return None
+                violations = edge.violation
+                weight = edge.get_weight()
+            else:
+                _, traversable, violations, weight = entry
+                if not traversable:
+                    return None
+            entry = entries.get(outgoing_waypoint)
+            if entry is None:
+                if not outgoing_waypoint.traversable:
+                    return None
+                return weight + outgoing_waypoint.expected_block_cost, violations + outgoing_waypoint.violation
+            _, traversable, violation, expected_block_cost = entry
+            if not traversable:
+                return None
+            return weight + expected_block_cost, violations + violation
+
+        # a planner per plan, so forks can be planned concurrently
+        planner = PathPlanner(waypoints, get_steps, get_step_cost)
+        planner.calculate(start_waypoint, target_waypoint)
+        path = planner.get_path_to(target_waypoint)
+        if path is None:
+            return None
+        return path, planner.get_violations_to(target_waypoint), planner.get_weight_to(target_waypoint)
+
+    def __get_merged_entries(self):
+        merged_entries = self.merged_entries
+        if merged_entries is None:
+            layers = []
+            parent_layers = self.parent_layers
+            while parent_layers is not None:
+                layers.append(parent_layers[0])
+                parent_layers = parent_layers[1]
+            merged_entries = {}
+            # the newest layer is applied last
+            for entries in reversed(layers):
+                merged_entries.update(entries)
+            merged_entries.update(self.entries)
+            self.merged_entries = merged_entries
+        return merged_entries
+
+    def __get_waypoint(self, waypoint_id):
+        try:
+            return self.graph._get_waypoint_by_id(waypoint_id)
+        except KeyError:
+            raise ValueError(f"Waypoint with id {waypoint_id} does not exist") from None
+
+    def __get_edge(self, from_waypoint_id, to_waypoint_id):
+        for angle in self.__get_waypoint(from_waypoint_id).angles:
+            if angle.outgoing_waypoint.id == to_waypoint_id:
+                return angle.edge
+        raise ValueError(f"There is no edge from waypoint {from_waypoint_id} to waypoint {to_waypoint_id}")
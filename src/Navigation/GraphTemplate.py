@@ -0,0 +1,53 @@
+class GraphTemplate:
+    """
+    Immutable topology of a waypoints configuration: the waypoint ids and the angles between the waypoints by index.
+    Graphs are created from a template without walking the configuration again, and the template of a configuration is
+    built once and shared by all graphs of it, so repeated missions and tests only allocate the waypoints and edges.
+    Templates are cached by the identity of the configuration, so configurations must not be changed after a graph was
+    created from them.
+    The waypoints are indexed in the order of the configuration, the planners break ties between paths of the same
+    weight by the waypoint ids, so the paths do not depend on that order.
+    """
+
+    # number of configurations whose templates are kept
+    CACHE_SIZE = 8
+
+    # (configuration, template) by the id of the configuration, the configuration is kept so the id is not reused
+    _templates = {}
+
+    def __init__(self, waypoints_configuration):
+        self.waypoint_ids = GraphTemplate.get_waypoint_order(waypoints_configuration)
+        indexes_by_id = {waypoint_id: index for index, waypoint_id in enumerate(self.waypoint_ids)}
+        # (index of the outgoing waypoint, angle) of every angle by waypoint index, in the order of the configuration
+        self.angles = tuple(
+            tuple(
+                (indexes_by_id[outgoing_waypoint_id], outgoing_waypoint_data["angle"])
+                for outgoing_waypoint_id, outgoing_waypoint_data in waypoints_configuration[waypoint_id]["edges"].items()
+            )
+            for waypoint_id in self.waypoint_ids
+        )
+
+    @staticmethod
+    def get_waypoint_order(waypoints_configuration):
+        """
+        Returns the ids of the waypoints of the configuration in the order they are indexed.
+        """
+        return tuple(waypoints_configuration)
+
+    @staticmethod
+    def get(waypoints_configuration) -> "GraphTemplate":
+        """
+        Returns the template of the configuration, it is only built on the first call for a configuration.
+        """
+        cached = GraphTemplate._templates.get(id(waypoints_configuration))
+        if cached is not None and cached[0] is waypoints_configuration:
+            return cached[1]
+        template = GraphTemplate(waypoints_configuration)
+        if len(GraphTemplate._templates) >= GraphTemplate.CACHE_SIZE:
+            # the oldest configuration is dropped first
+            del GraphTemplate._templates[next(iter(GraphTemplate._templates))]
+        GraphTemplate._templates[id(waypoints_configuration)] = (waypoints_configuration, template)
+        return template
+
+    def get_waypoint_count(self):
+        return len(self.waypoint_ids)
@@ -0,0 +1,100 @@
+from itertools import combinations
+from typing import List
+from Navigation.PathPlanner import PathPlanner
+from Navigation.Waypoint import Waypoint
+from Instrumentation.Instrumentation import Instrumentation
+
+
+class MissionPlanner:
+    """
+    Chooses the order in which the target waypoints of a mission are visited.
+    The distances between the start and all targets are calculated with one search per waypoint, which stops once all
+    targets are reached. Up to
+    EXACT_ORDER_LIMIT targets the optimal order is calculated, for more targets a nearest neighbour tour improved by
+    2-opt is used.
+    """
+
+    EXACT_ORDER_LIMIT = 8
+
+    def __init__(self, waypoints: List[Waypoint]):
+        # a separate planner is used, so the scratch state of the graph's planner is not overwritten
+        self.planner = PathPlanner(waypoints)
+
+    @Instrumentation.timed()
+    def order_targets(self, start_waypoint: Waypoint, target_waypoints: List[Waypoint]):
+        if len(target_waypoints) <= 1:
+            return list(target_waypoints)
+        distances = self.__calculate_distances([start_waypoint] + list(target_waypoints))
+        if len(target_waypoints) <= self.EXACT_ORDER_LIMIT:
+            order = self.__calculate_exact_order(distances)
+        else:
+            order = self.__calculate_heuristic_order(distances)
+        return [target_waypoints[i - 1] for i in order]
+
+    def __calculate_distances(self, waypoints: List[Waypoint]):
+        # distances[i][j] is the cost of the shortest path from waypoints[i] to waypoints[j], so legs through uncertain
+        # blocks are only used when there is no other way
+        distances = []
+        for waypoint in waypoints:
+            self.planner.calculate_to_targets(waypoint, waypoints)
+            distances.append([self.planner.get_cost_to(w) for w in waypoints])
+        return distances
+
+    def __calculate_exact_order(self, distances):
+        # Held-Karp: costs[(visited, last)] is the cheapest path from the start (index 0) visiting all targets in visited
+        # and ending at last, the targets are the indexes 1..n
+        target_count = len(distances) - 1
+        costs = {}
+        for target in range(1, target_count + 1):
+            costs[(1 << target, target)] = (distances[0][target], 0)
+        for subset_size in range(2, target_count + 1):
+            for subset in combinations(range(1, target_count + 1), subset_size):
+                visited = sum(1 << target for target in subset)
+                for last in subset:
+                    previous_visited = visited & ~(1 << last)
+                    costs[(visited, last)] = min(
+                        (costs[(previous_visited, previous)][0] + distances[previous][last], previous)
+                        for previous in subset
+                        if previous != last
+                    )
+        all_visited = sum(1 << target for target in range(1, target_count + 1))
+        _, last = min((costs[(all_visited, last)][0], last) for last in range(1, target_count + 1))
+        order = []
+        visited = all_visited
+        while last != 0:
+            order.append(last)
+            _, previous = costs[(visited, last)]
+            visited &= ~(1 << last)
+            last = previous
+        order.reverse()
+        return order
+
+    def __calculate_heuristic_order(self, distances):
+        unvisited = set(range(1, len(distances)))
+        order = []
+        current = 0
+        while unvisited:
+            current = min(unvisited, key=lambda target: (distances[current][target], target))
+            unvisited.remove(current)
+            order.append(current)
+        return self.__improve_order_with_two_opt(order, distances)
+
+    def __improve_order_with_two_opt(self, order, distances):
+        # the start stays at the beginning of the tour, the tour is open and does not return to the start
+        tour = [0] + order
+        tour_cost = self.__get_tour_cost(tour, distances)
+        improved = True
+        while improved:
+            improved = False
+            for i in range(1, len(tour) - 1):
+                for j in range(i + 1, len(tour)):
+                    candidate = tour[:i] + tour[i:j + 1][::-1] + tour[j + 1:]
+                    candidate_cost = self.__get_tour_cost(candidate, distances)
+                    if candidate_cost < tour_cost:
+                        tour = candidate
+                        tour_cost = candidate_cost
+                        improved = True
+        return tour[1:]
+
+    def __get_tour_cost(self, tour, distances):
+        return sum(distances[tour[i]][tour[i + 1]] for i in range(len(tour) - 1))
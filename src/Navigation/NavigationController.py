@@ -1,23 +1,49 @@
 from Navigation.Graph import Graph
+from Configuration.ConfigurationDiff import ConfigurationDiff
+from Configuration.Configurator import Configurator
 from Communication.Emitter import Emitter
 from ObjectDetection.ObjectDetector import ObjectDetector
 from Navigation.WaypointStatus import WaypointStatus
 from Navigation.EdgeStatus import EdgeStatus
 from Validation.Validator import Validator
+from WorldModel.WorldModelSync import WorldModelSync
+from Instrumentation.Instrumentation import Instrumentation
+from Logger.Logger import Logger
+from typing import List
 import sys
 import time
 
+logger = Logger("NavigationController")
+
 class NavigationController():
-    def __init__(self, emitter: Emitter, object_detector: ObjectDetector):
+    def __init__(self, emitter: Emitter, object_detector: ObjectDetector, world_model=None):
         self.emitter = emitter
         self.object_detector = object_detector
+        # WorldModel or WorldModelClient shared with other controllers, None if the controller learns alone
+        self.world_model = world_model
+        self.world_model_sync: WorldModelSync = None
+        # the graph is created by the start up detection of the first target and kept for all following targets
+        self.graph: Graph = None
         self.communication_available = False
         # keeps track of the outgoing waypoints and their indexes for the current waypoint
         self.outgoing_waypoint_ids = []
         self.is_on_ideal_path = True
         self.currently_turned_angle = 0.0
+        # start of the running point scan, None if no point scan is running
+        self.scan_start = None
+        # counts and durations in seconds of the point scans, see get_scan_report
+        self.scan_report = {
+            "scan_count": 0,
+            "angle_count": 0,
+            "detection_count": 0,
+            "skipped_detection_count": 0,
+            "total_scan_time": 0.0,
+            "last_scan_time": None,
+        }
 
     def start(self):
+        # the models are loaded while waiting for the communication, not on the first target
+        self.object_detector.start_warm_up()
         self.check_communication()
 
     def check_communication(self):
@@ -51,70 +77,192 @@ class NavigationController():
         else:
             return angle_value
         
+    def __synchronize_world_model(self):
+        """
+        Shares what was learned since the last synchronization with the other controllers and applies what they
+        learned, before the next path is planned. If the world model can not be reached, the car navigates on what
+        it learned itself and the next synchronization tries again.
+        """
+        if self.world_model_sync is None:
+            return
+        try:
+            self.world_model_sync.synchronize()
+        except (OSError, ValueError) as e:
+            logger.warning("world model not synchronized, navigating on the local graph", error=repr(e))
+
     def use_pointscanning(self):
         self.is_on_ideal_path = False
 
+    @Instrumentation.timed()
     def on_pong(self):
         self.communication_available = True
     
+    @Instrumentation.timed()
     def on_waypoint(self):
         self.graph.update_waypoint_status(WaypointStatus.FREE)
         self.graph.update_previous_edge_status(EdgeStatus.FREE)
+        self.__synchronize_world_model()
         if self.graph.has_reached_target_waypoint():
-            print('[pi    ] target reached')
-            self.emitter.emit("target_reached")
-        elif self.is_on_ideal_path:
+            logger.info("target reached", waypoint=self.graph.target_waypoint.get_id())
+            if self.graph.advance_mission():
+                logger.info("next target of mission", waypoint=self.graph.target_waypoint.get_id())
+                self.__continue_navigation()
+            else:
+                self.emitter.emit("target_reached")
+                if Instrumentation.enabled:
+                    logger.info("timings\n%s", Instrumentation.dump())
+        else:
+            self.__continue_navigation()
+
+    def __continue_navigation(self):
+        if self.is_on_ideal_path:
             self.__go_to_next_waypoint_by_ideal_path()
         else:
+            self.scan_start = time.perf_counter()
             self.emitter.emit("scan_point")
 
+    @Instrumentation.timed()
     def on_angle(self, angle_value: float):
         Validator.validate_angle_value(angle_value)
         angle_value = angle_value + self.currently_turned_angle
-        waypoint_status, edge_status = self.object_detector.detect()
-        print(f"[pi    ] waypoint_status: {waypoint_status}, edge_status: {edge_status.name}")
-        angle = self.graph.update_waypoint_from_angle(angle_value, waypoint_status, edge_status)
+        self.scan_report["angle_count"] += 1
+        angle = self.graph.get_confirmed_angle(angle_value)
+        if angle is not None:
+            # a detection would not change confirmed statuses, so no frame is captured
+            self.scan_report["skipped_detection_count"] += 1
+            logger.debug("detection skipped", angle=angle_value, waypoint=angle.get_waypoint().get_id())
+        else:
+            waypoint_status, edge_status = self.object_detector.detect()
+            waypoint_confidence, edge_confidence = self.object_detector.get_confidences()
+            self.scan_report["detection_count"] += 1
+            logger.debug("angle detected", angle=angle_value, waypoint_status=waypoint_status.name, edge_status=edge_status.name)
+            angle = self.graph.update_waypoint_from_angle(
+                angle_value, waypoint_status, edge_status, waypoint_confidence, edge_confidence
+            )
         self.outgoing_waypoint_ids.append(angle.get_waypoint().get_id())
+
+    def get_scan_report(self):
+        """
+        Returns the number of point scans, scanned angles, detections and detections skipped for confirmed directions,
+        and the total and last duration of the point scans in seconds, from scan_point to point_scanning_finished.
+        """
+        return dict(self.scan_report)
+
+    def __record_scan_time(self):
+        if self.scan_start is None:
+            return
+        scan_time = time.perf_counter() - self.scan_start
+        self.scan_start = None
+        self.scan_report["scan_count"] += 1
+        self.scan_report["total_scan_time"] += scan_time
+        self.scan_report["last_scan_time"] = scan_time
+        if Instrumentation.enabled:
+            Instrumentation.record("NavigationController.point_scan", scan_time)
+        logger.info(
+            "point scan finished",
+            duration=round(scan_time, 4),
+            angles=self.scan_report["angle_count"],
+            skipped_detections=self.scan_report["skipped_detection_count"],
+        )
         
+    @Instrumentation.timed()
     def on_point_scanning_finished(self):
         if self.currently_turned_angle != 0.0:
             self.currently_turned_angle = 0.0
+        self.__record_scan_time()
         self.graph.update_missing_angles()
+        self.__synchronize_world_model()
         self.__go_to_next_waypoint_after_portscanning()
 
+    @Instrumentation.timed()
     def on_line_missing(self):
         # self.is_on_ideal_path = False
         # self.emitter.emit("scan_point")
         intended_waypoint = self.graph.get_shortest_path_to_target()[0]
         self.graph.update_missing_line(intended_waypoint.get_id())
+        self.__synchronize_world_model()
         self.__go_to_next_waypoint_by_ideal_path()
 
+    @Instrumentation.timed()
     def on_turned_to_target_line(self):
         self.graph.go_to_next_best_waypoint()
         self.currently_turned_angle = 0.0
         self.emitter.emit("follow_line")
 
+    @Instrumentation.timed()
     def on_cone_detected(self):
         # self.is_on_ideal_path = False
         self.graph.cone_detected()
         self.graph.go_back_to_previous_waypoint()
+        self.__synchronize_world_model()
 
+    @Instrumentation.timed()
     def on_obstacle_detected(self):
         self.graph.obstacle_detected()
+        self.__synchronize_world_model()
 
     def on_set_target(self, target_waypoint_id: str):
-        Validator.validate_waypoint_id_format(target_waypoint_id)
+        # not timed, the time is recorded by on_set_mission, so every target is counted once
+        self.on_set_mission([target_waypoint_id])
+
+    @Instrumentation.timed()
+    def on_set_mission(self, target_waypoint_ids: List[str]):
+        for target_waypoint_id in target_waypoint_ids:
+            Validator.validate_waypoint_id_format(target_waypoint_id)
+        if self.graph is not None:
+            # the car is standing on a waypoint of the existing graph, so no start up detection is needed
+            self.graph.set_mission(target_waypoint_ids)
+            logger.info("targets set", targets=tuple(target_waypoint_ids))
+            if self.graph.has_reached_target_waypoint():
+                # the car is standing on every target of the mission
+                logger.info("target reached", waypoint=self.graph.target_waypoint.get_id())
+                self.emitter.emit("target_reached")
+                return
+            self.__continue_navigation()
+            return
         # startup procedure
         self.graph = self.object_detector.start_up_process_detect()
+        if self.world_model is not None:
+            self.world_model_sync = WorldModelSync(self.graph, self.world_model)
+            self.__synchronize_world_model()
         # setup graph
-        self.graph.set_target_waypoint(target_waypoint_id)
+        self.graph.set_mission(target_waypoint_ids)
         self.outgoing_waypoint_ids.append("S")
-        print("[pi    ] target set to ", target_waypoint_id)
+        logger.info("targets set", targets=tuple(target_waypoint_ids))
         # start navigation
         if self.is_on_ideal_path:
             self.__go_to_next_waypoint_by_ideal_path()
         else:
             self.__go_to_next_waypoint_after_portscanning()
 
+    @Instrumentation.timed()
+    def on_configuration_changed(self, configuration: dict = None):
+        """
+        Applies a new configuration, e.g. from the ConfigurationWatcher, and publishes it, or applies the configuration
+        reloaded by the Configurator if none is given. The event carries the configuration itself, so it can be
+        recorded and replayed, the differences to the active configuration are calculated here. The graph keeps what it
+        learned about the waypoints and edges which did not change. If the change removes a waypoint which is in use,
+        it is not applied and the active configuration is kept.
+        """
+        if configuration is not None:
+            Validator.validate_configuration(configuration)
+            if self.graph is not None:
+                self.graph.update_configuration(diff=ConfigurationDiff(Configurator().configuration, configuration))
+            Configurator.set_configuration(configuration)
+        elif self.graph is not None:
+            self.graph.update_configuration()
+        self.object_detector.reload_configuration()
+        if self.graph is None:
+            # the graph is created from the new configuration by the start up detection
+            return
+        if self.world_model_sync is not None:
+            self.world_model_sync.update_elements()
+        logger.info("configuration applied", waypoints=len(self.graph.waypoints))
+
+    @Instrumentation.timed()
     def on_stop(self):
+        logger.info("stopped")
+        if Instrumentation.enabled:
+            logger.info("timings\n%s", Instrumentation.dump())
+        # an EventQueue closes before the exit leaves its dispatching, see EventQueue.handle_next
         sys.exit()
\ No newline at end of file
@@ -0,0 +1,156 @@
+import sys
+from heapq import heappop, heappush
+from Instrumentation.Instrumentation import Instrumentation
+
+
+class PathPlanner:
+    """
+    Calculates the shortest paths from a start waypoint using Dijkstra's algorithm.
+    Confirmed blocks (BLOCKED waypoints, MISSING edges) are never used. Uncertain blocks from the object detection
+    (POTENTIALLY_BLOCKED waypoints, POTENTIALLY_MISSING edges) may be used, but every one of them is a violation and
+    paths are compared by (violations, weight). So a single search finds the path with the fewest violations and
+    among those the one with the lowest weight. The weight is the expected cost, the weights of the edges plus the
+    expected cost of detours around waypoints which might be blocked.
+    The scratch state of a search (costs, visited flags and previous nodes) is stored in arrays owned by the planner
+    and indexed by the node, the waypoint index by default, so the waypoints themselves only carry the map information.
+    The search and the packing of the costs are shared, the GraphFork and the TurnAwarePathPlanner only pass their own
+    graph view and cost function.
+    Nodes of the same cost are visited in the order of their waypoint ids, so of several paths with the same cost the
+    same one is found whatever order the waypoints are indexed in.
+    """
+
+    # both parts of the lexicographic cost are packed into one integer, no path weight reaches this value
+    VIOLATION_COST = 1 << 48
+
+    def __init__(self, waypoints, get_steps=None, get_step_cost=None, get_tie_key=None):
+        """
+        The search runs over the nodes of a graph view, get_steps(node) returns the (outgoing node, step) pairs of the
+        steps leaving a node, and prices the steps with a cost function, get_step_cost(step) returns the (weight,
+        violations) of a step or None if it can not be used. By default the nodes are the waypoint indexes and the
+        steps the possible angles of the waypoints, other planners pass their own view, e.g. the GraphFork its statuses.
+        get_tie_key(node) returns the key which orders nodes of the same cost, by default the id of the waypoint.
+        """
+        self.waypoints = waypoints
+        self.get_steps = get_steps or self.__get_possible_steps
+        self.get_step_cost = get_step_cost or self.__get_angle_cost
+        self.get_tie_key = get_tie_key or self.__get_waypoint_id
+        # per-search arrays, indexed by node
+        self.costs = []
+        self.previous_indexes = []
+        self.start_waypoint = None
+
+    def __get_possible_steps(self, index):
+        current_node = self.waypoints[index]
+        if not current_node.traversable:
+            return ()
+        return [(angle.outgoing_waypoint.index, angle) for angle in current_node.get_possible_angles()]
+
+    def __get_waypoint_id(self, index):
+        return self.waypoints[index].id
+
+    @staticmethod
+    def __get_angle_cost(angle):
+        outgoing_waypoint = angle.outgoing_waypoint
+        edge = angle.edge
+        return (
+            edge.get_weight() + outgoing_waypoint.expected_block_cost,
+            outgoing_waypoint.violation + edge.violation,
+        )
+
+    @Instrumentation.timed()
+    def calculate(self, start_waypoint, target_waypoint=None):
+        """
+        Calculates the shortest paths to all waypoints or, if a target waypoint is given, stops once the path to it is
+        known. The costs and paths of the other waypoints are incomplete then.
+        """
+        target_indexes = () if target_waypoint is None else (target_waypoint.index,)
+        self.search(len(self.waypoints), start_waypoint.index, target_indexes)
+        self.start_waypoint = start_waypoint
+
+    @Instrumentation.timed()
+    def calculate_to_targets(self, start_waypoint, target_waypoints):
+        """
+        Calculates the shortest paths from the start waypoint and stops once the paths to all target waypoints are
+        known, e.g. for the distances between the targets of a mission.
+        """
+        target_indexes = {w.index for w in target_waypoints}
+        self.search(len(self.waypoints), start_waypoint.index, target_indexes, len(target_indexes))
+        self.start_waypoint = start_waypoint
+
+    def search(self, node_count, start_index, target_indexes=(), target_count=1):
+        """
+        Runs Dijkstra's algorithm over the graph view from the start node until target_count of the target nodes are
+        reached or all reachable nodes are known, and stores the costs and previous nodes by node. Returns the last
+        reached target node or -1.
+        """
+        get_steps = self.get_steps
+        get_step_cost = self.get_step_cost
+        get_tie_key = self.get_tie_key
+        violation_cost = self.VIOLATION_COST
+        costs = [sys.maxsize] * node_count
+        previous_indexes = [-1] * node_count
+        visited = [False] * node_count
+        costs[start_index] = 0
+        # the tie key orders nodes of the same cost, the node itself only nodes with the same key
+        queue = [(0, get_tie_key(start_index), start_index)]
+        reached_index = -1
+        reached_count = 0
+        while queue:
+            cost, _, index = heappop(queue)
+            if visited[index]:
+                continue
+            visited[index] = True
+            if index in target_indexes:
+                reached_index = index
+                reached_count += 1
+                if reached_count == target_count:
+                    break
+            # this loop is executed once per step and search
+            for outgoing_index, step in get_steps(index):
+                if visited[outgoing_index]:
+                    continue
+                step_cost = get_step_cost(step)
+                if step_cost is None:
+                    continue
+                weight, violations = step_cost
+                calculated_cost = cost + weight
+                if violations:
+                    calculated_cost += violations * violation_cost
+                if calculated_cost < costs[outgoing_index]:
+                    costs[outgoing_index] = calculated_cost
+                    previous_indexes[outgoing_index] = index
+                    heappush(queue, (calculated_cost, get_tie_key(outgoing_index), outgoing_index))
+        self.costs = costs
+        self.previous_indexes = previous_indexes
+        return reached_index
+
+    def get_cost_to(self, waypoint):
+        """
+        Returns the lexicographic cost of the shortest path, which orders paths by violations first and weight second,
+        or sys.maxsize if the waypoint is not reachable.
+        """
+        return self.costs[waypoint.index]
+
+    def get_weight_to(self, waypoint):
+        cost = self.costs[waypoint.index]
+        return cost if cost == sys.maxsize else cost % self.VIOLATION_COST
+
+    def get_violations_to(self, waypoint):
+        cost = self.costs[waypoint.index]
+        return cost if cost == sys.maxsize else cost // self.VIOLATION_COST
+
+    def get_path_to(self, target_waypoint):
+        """
+        Returns the waypoints of the shortest path from the start waypoint (exclusive) to the target waypoint (inclusive)
+        or None if the target waypoint is not reachable.
+        """
+        path = []
+        index = target_waypoint.index
+        start_index = self.start_waypoint.index
+        while index != start_index:
+            if index == -1:
+                return None
+            path.append(self.waypoints[index])
+            index = self.previous_indexes[index]
+        path.reverse()
+        return path
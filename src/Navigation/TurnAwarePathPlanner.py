@@ -0,0 +1,143 @@
+import sys
+from Navigation.PathPlanner import PathPlanner
+from Navigation.TurnCostModel import TurnCostModel
+from Instrumentation.Instrumentation import Instrumentation
+
+
+class TurnAwarePathPlanner:
+    """
+    Calculates the shortest paths from a start waypoint like the PathPlanner, but adds the time of turning at every
+    waypoint to the weights, so paths are compared by their drive time.
+    The turn at a waypoint depends on the line the car arrived on, so the search runs over states of a waypoint and
+    the angle it was reached by. The states of a waypoint are addressed by the index of that angle in the angles of the
+    waypoint, the last state of a waypoint is used when it was reached by a line without an angle back. The turn costs
+    of all states and the state every angle leads to are precomputed once, the angles of the waypoints must not change
+    afterwards. The start waypoint is a separate state with the heading given by its incoming angle.
+    """
+
+    VIOLATION_COST = PathPlanner.VIOLATION_COST
+
+    def __init__(self, waypoints, turn_cost_model: TurnCostModel):
+        self.waypoints = waypoints
+        self.turn_cost_model = turn_cost_model
+        # index of the first state by waypoint index
+        self.state_offsets = []
+        # waypoint index by state
+        self.state_waypoint_indexes = []
+        # state reached by every angle by waypoint index, in the order of the angles
+        self.entry_states = []
+        # turn cost of every angle by state, in the order of the angles
+        self.turn_costs = []
+        self.__build_tables()
+        # searches over the states, the per-search arrays of the planner are indexed by state
+        self.planner = PathPlanner(waypoints, self.__get_steps, self.__get_step_cost, self.__get_state_waypoint_id)
+        self.start_waypoint = None
+        self.start_state = None
+        self.start_turn_costs = ()
+
+    def __build_tables(self):
+        waypoints = self.waypoints
+        for waypoint in waypoints:
+            self.state_offsets.append(len(self.state_waypoint_indexes))
+            self.state_waypoint_indexes.extend([waypoint.index] * (len(waypoint.angles) + 1))
+        for waypoint in waypoints:
+            entry_states = []
+            for angle in waypoint.angles:
+                outgoing_waypoint = angle.outgoing_waypoint
+                back_indexes = [i for i, a in enumerate(outgoing_waypoint.angles) if a.outgoing_waypoint is waypoint]
+                back_index = back_indexes[0] if back_indexes else len(outgoing_waypoint.angles)
+                entry_states.append(self.state_offsets[outgoing_waypoint.index] + back_index)
+            self.entry_states.append(tuple(entry_states))
+            for incoming_angle in waypoint.angles:
+                self.turn_costs.append(self.__get_turn_costs(waypoint, incoming_angle.value + 180.0))
+            # the heading is unknown, turns are free
+            self.turn_costs.append((0,) * len(waypoint.angles))
+
+    def __get_turn_costs(self, waypoint, heading):
+        return tuple(self.turn_cost_model.get_cost(heading, angle.value) for angle in waypoint.angles)
+
+    def __get_steps(self, state):
+        if state == self.start_state:
+            current_node = self.start_waypoint
+            state_turn_costs = self.start_turn_costs
+        else:
+            current_node = self.waypoints[self.state_waypoint_indexes[state]]
+            state_turn_costs = self.turn_costs[state]
+        if not current_node.traversable:
+            return ()
+        return zip(self.entry_states[current_node.index], zip(current_node.angles, state_turn_costs))
+
+    def __get_state_waypoint_id(self, state):
+        if state == self.start_state:
+            return self.start_waypoint.id
+        return self.waypoints[self.state_waypoint_indexes[state]].id
+
+    @staticmethod
+    def __get_step_cost(step):
+        angle, turn_cost = step
+        outgoing_waypoint = angle.outgoing_waypoint
+        edge = angle.edge
+        if not (outgoing_waypoint.traversable and edge.traversable):
+            return None
+        return (
+            turn_cost + edge.get_weight() + outgoing_waypoint.expected_block_cost,
+            outgoing_waypoint.violation + edge.violation,
+        )
+
+    @Instrumentation.timed()
+    def calculate(self, start_waypoint, target_waypoint=None):
+        """
+        Calculates the fastest paths to all waypoints or, if a target waypoint is given, stops once the path to it is
+        known. The costs and paths of the other waypoints are incomplete then.
+        """
+        # the start state is added behind the states of the waypoints
+        start_state = len(self.state_waypoint_indexes)
+        self.start_waypoint = start_waypoint
+        self.start_state = start_state
+        self.start_turn_costs = self.__get_turn_costs(start_waypoint, start_waypoint.incoming_angle + 180.0)
+        if target_waypoint is None:
+            target_states = ()
+        elif target_waypoint is start_waypoint:
+            target_states = (start_state,)
+        else:
+            # the first state of the target waypoint is the one with the lowest cost
+            offset = self.state_offsets[target_waypoint.index]
+            target_states = range(offset, offset + len(target_waypoint.angles) + 1)
+        self.planner.search(start_state + 1, start_state, target_states)
+
+    def __get_best_state(self, waypoint):
+        if waypoint is self.start_waypoint:
+            return self.start_state
+        offset = self.state_offsets[waypoint.index]
+        states = range(offset, offset + len(waypoint.angles) + 1)
+        return min(states, key=self.planner.costs.__getitem__)
+
+    def get_cost_to(self, waypoint):
+        """
+        Returns the lexicographic cost of the fastest path, which orders paths by violations first and drive time second,
+        or sys.maxsize if the waypoint is not reachable.
+        """
+        return self.planner.costs[self.__get_best_state(waypoint)]
+
+    def get_weight_to(self, waypoint):
+        cost = self.get_cost_to(waypoint)
+        return cost if cost == sys.maxsize else cost % self.VIOLATION_COST
+
+    def get_violations_to(self, waypoint):
+        cost = self.get_cost_to(waypoint)
+        return cost if cost == sys.maxsize else cost // self.VIOLATION_COST
+
+    def get_path_to(self, target_waypoint):
+        """
+        Returns the waypoints of the fastest path from the start waypoint (exclusive) to the target waypoint (inclusive)
+        or None if the target waypoint is not reachable.
+        """
+        state = self.__get_best_state(target_waypoint)
+        if self.planner.costs[state] == sys.maxsize:
+            return None
+        path = []
+        while state != self.start_state:
+            path.append(self.waypoints[self.state_waypoint_indexes[state]])
+            state = self.planner.previous_indexes[state]
+        path.reverse()
+        return path
@@ -0,0 +1,30 @@
+class TurnCostModel:
+    """
+    Time the car needs to turn at a waypoint, in the units of the edge weights, where following a free line of length
+    1 costs 110. The car stops, turns towards the target line the shorter way round and starts again, so a turn costs
+    a fixed amount plus an amount per degree. Turns up to the straight tolerance are driven without stopping.
+    """
+
+    def __init__(self, cost_per_degree: float = 0.2, turn_cost: float = 5.0, straight_tolerance: float = 10.0):
+        if cost_per_degree < 0 or turn_cost < 0 or straight_tolerance < 0:
+            raise ValueError(
+                f"Turn costs and tolerance must not be negative, got {cost_per_degree}, {turn_cost}, {straight_tolerance}"
+            )
+        self.cost_per_degree = cost_per_degree
+        self.turn_cost = turn_cost
+        self.straight_tolerance = straight_tolerance
+
+    @staticmethod
+    def get_turn_angle(heading: float, angle: float) -> float:
+        """
+        Returns the angle in degrees between 0 and 180 the car turns from the heading to the line with the angle.
+        """
+        turn_angle = (angle - heading) % 360
+        return min(turn_angle, 360 - turn_angle)
+
+    def get_cost(self, heading: float, angle: float) -> int:
+        turn_angle = self.get_turn_angle(heading, angle)
+        if turn_angle <= self.straight_tolerance:
+            return 0
+        # the planner adds up integers
+        return round(self.turn_cost + self.cost_per_degree * turn_angle)
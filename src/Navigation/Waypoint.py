@@ -1,63 +1,178 @@
-import sys
+from bisect import bisect_left
 from typing import List
 from Navigation.WaypointStatus import WaypointStatus
 from Navigation.EdgeStatus import EdgeStatus
 from Navigation.Angle import Angle
+from Navigation.Belief import Belief
+from Navigation.Edge import NOT_TRAVERSABLE_EDGE_STATUSES
 from Validation.Validator import Validator
 
+# waypoints with these statuses can not be driven to
+NOT_TRAVERSABLE_WAYPOINT_STATUSES = frozenset([WaypointStatus.BLOCKED])
+# waypoints with these statuses are only driven to by the planner if there is no path without uncertain blocks
+POTENTIALLY_NOT_TRAVERSABLE_WAYPOINT_STATUSES = frozenset([WaypointStatus.POTENTIALLY_BLOCKED])
+# statuses which are known for sure, observations of the object detection do not change them
+CONFIRMED_WAYPOINT_STATUSES = frozenset([WaypointStatus.BLOCKED, WaypointStatus.FREE])
+# additional cost of driving to a waypoint which turns out to be blocked, the line is driven there and back again
+BLOCKED_WAYPOINT_COST = 2 * EdgeStatus.UNKNOWN.value
+
 class Waypoint:
-    def __init__(self, id: str):
-        self.status = WaypointStatus.UNKNOWN
+    __slots__ = ("_status", "id", "index", "angles", "incoming_angle", "traversable", "violation", "expected_block_cost",
+                 "block_belief", "incoming_waypoints", "possible_angles", "status_listener", "angle_table",
+                 "relative_values")
+
+    def __init__(self, id: str, index: int = 0):
+        self._status = WaypointStatus.UNKNOWN
         self.id = id
+        # position of this waypoint in the graph, used by the planner to address its per-search arrays
+        self.index = index
         self.angles: List[Angle] = []
         # default to 180 for first waypoint
         self.incoming_angle: float = 180.0
-        self.weight_to_target: int = sys.maxsize
-        self.dijkstra_visied = False
-        # The previous node to this waypoint in the shortest path from the current waypoint to the target waypoint.
-        self.previous_node_to_this_waypoint = None
+        # precomputed from the status, so the planner only has to check this flag
+        self.traversable = True
+        # 1 if the status is an uncertain block, the planner counts it as a violation
+        self.violation = 0
+        # expected additional cost of driving to this waypoint, added by the planner to the weight of the edge
+        self.expected_block_cost = 0
+        # probability that the waypoint is blocked, None if the status was not set by observations
+        self.block_belief = None
+        # waypoints with an angle to this waypoint, their possible angles depend on the traversability of this waypoint
+        self.incoming_waypoints: List["Waypoint"] = []
+        # cached result of get_possible_angles, None when it has to be recomputed
+        self.possible_angles = None
+        # notified with on_status_changed whenever the status of this waypoint or of one of its edges changes
+        self.status_listener = None
+        # (values modulo 360 in ascending order, (angle, position in angles) by value, angles by waypoint id) of the
+        # angles, None when it has to be rebuilt
+        self.angle_table = None
+        # values of the angles relative to the heading on arrival by waypoint id, by incoming angle
+        self.relative_values = {}
+
+    def reset(self):
+        """
+        Restores the initial status and incoming angle without notifying the status listener, e.g. to reuse the graph for
+        another mission.
+        """
+        self._status = WaypointStatus.UNKNOWN
+        self.incoming_angle = 180.0
+        self.traversable = True
+        self.violation = 0
+        self.expected_block_cost = 0
+        self.block_belief = None
+        self.possible_angles = None
+
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, status: WaypointStatus):
+        if status == self._status and self.block_belief is None:
+            return
+        # a status which is set directly replaces all observations
+        self.block_belief = None
+        self.__update_status(status, 0)
+
+    def observe_block(self, is_blocked: bool, confidence: float = None):
+        """
+        Fuses an observation of the object detection into the probability that the waypoint is blocked. The status is
+        set to the more likely one of POTENTIALLY_BLOCKED and POTENTIALLY_FREE and the expected cost of a detour is
+        added to the cost of driving here. Confirmed statuses are kept.
+        """
+        if self.is_confirmed():
+            return
+        belief = self.block_belief or Belief()
+        belief.observe(is_blocked, confidence)
+        self.set_block_belief(belief)
+
+    def is_confirmed(self):
+        """
+        Returns True if the status is known for sure, so observations of the object detection do not change it.
+        """
+        return self._status in CONFIRMED_WAYPOINT_STATUSES
+
+    def set_block_belief(self, belief: Belief):
+        """
+        Sets the status and the expected cost of a detour from the probability of the belief, e.g. to restore a
+        recorded belief.
+        """
+        probability = belief.get_probability()
+        status = WaypointStatus.POTENTIALLY_BLOCKED if probability > 0.5 else WaypointStatus.POTENTIALLY_FREE
+        self.__update_status(status, round(probability * BLOCKED_WAYPOINT_COST))
+        self.block_belief = belief
+
+    def __update_status(self, status: WaypointStatus, expected_block_cost: int):
+        self._status = status
+        self.expected_block_cost = expected_block_cost
+        self.violation = int(status in POTENTIALLY_NOT_TRAVERSABLE_WAYPOINT_STATUSES)
+        traversable = status not in NOT_TRAVERSABLE_WAYPOINT_STATUSES
+        if traversable != self.traversable:
+            self.traversable = traversable
+            for waypoint in self.incoming_waypoints:
+                waypoint.invalidate_possible_angles()
+        self.notify_status_changed()
+
+    def notify_status_changed(self):
+        if self.status_listener is not None:
+            self.status_listener.on_status_changed()
 
     def get_id(self):
         return self.id
+
+    def get_index(self):
+        return self.index
     
     def get_status(self):
-        return self.status
+        return self._status
+
+    def is_traversable(self):
+        return self.traversable
+
+    def get_violation(self):
+        return self.violation
+
+    def get_block_probability(self):
+        """
+        Returns the fused probability that the waypoint is blocked or None if the status was not set by observations.
+        """
+        return self.block_belief.get_probability() if self.block_belief is not None else None
 
     def set_angles(self, angles: List[Angle]):
+        for angle in self.angles:
+            angle.get_waypoint().incoming_waypoints.remove(self)
+            angle.get_edge().owner = None
         self.angles = angles
+        for angle in angles:
+            angle.get_waypoint().incoming_waypoints.append(self)
+            angle.get_edge().owner = self
+        self.possible_angles = None
+        self.angle_table = None
+        self.relative_values = {}
+        self.notify_status_changed()
 
     def set_status(self, status: WaypointStatus):
         self.status = status
 
-    def set_previous_node_to_this_waypoint(self, waypoint):
-        self.previous_node_to_this_waypoint = waypoint
-
-    def get_previous_node_to_this_waypoint(self):
-        return self.previous_node_to_this_waypoint
-
     def set_incoming_angle_by_id(self, waypoint_id: str):
         Validator.validate_waypoint_id_format(waypoint_id)
         angle = [a for a in self.angles if a.get_waypoint().get_id() == waypoint_id][0]
         self.incoming_angle = angle.get_value()
 
-    def set_weight_to_target(self, weight: int):
-        self.weight_to_target = weight
-
-    def set_dijkstra_visited(self, visited: bool):
-        self.dijkstra_visied = visited
-
-    def get_dijkstra_visited(self):
-        return self.dijkstra_visied
-
-    def get_weight_to_target(self):
-        return self.weight_to_target
-
     def get_angles(self):
         return self.angles
 
     def get_possible_angles(self):
-        unblocked_angles = [a for a in self.angles if a.get_waypoint().get_status() not in [WaypointStatus.BLOCKED, WaypointStatus.POTENTIALLY_BLOCKED]]
-        return [a for a in unblocked_angles if a.get_edge().get_status() not in [EdgeStatus.MISSING, EdgeStatus.POTENTIALLY_MISSING]]
+        """
+        Returns the angles whose waypoint and edge are traversable. The result is cached until the traversability of one
+        of the outgoing waypoints or edges changes and must not be modified.
+        """
+        if self.possible_angles is None:
+            self.possible_angles = tuple(a for a in self.angles if a.outgoing_waypoint.traversable and a.edge.traversable)
+        return self.possible_angles
+
+    def invalidate_possible_angles(self):
+        self.possible_angles = None
     
     def set_angle_to_waypoint_as_missing(self, waypoint_id: str):
         Validator.validate_waypoint_id_format(waypoint_id)
@@ -66,22 +181,39 @@ class Waypoint:
         
     
     def get_angle_to_waypoint(self, waypoint_id: str):
-        return [a for a in self.angles if a.get_waypoint().get_id() == waypoint_id][0]
+        return self.__get_angle_table()[2][waypoint_id]
     
     def get_edge_to_waypoint(self, waypoint_id: str):
         Validator.validate_waypoint_id_format(waypoint_id)
         angle = self.get_angle_to_waypoint(waypoint_id)
         return angle.get_edge()
     
-    def update_angle(self, value: float, waypoint_status: WaypointStatus, edge_status: EdgeStatus):
+    def update_angle(
+        self,
+        value: float,
+        waypoint_status: WaypointStatus,
+        edge_status: EdgeStatus,
+        waypoint_confidence: float = None,
+        edge_confidence: float = None,
+    ):
+        """
+        Updates the waypoint and edge of the angle closest to the value. Statuses from the object detection are fused
+        with the earlier observations, weighted by the confidence of the detection.
+        """
         Validator.validate_angle_value(value)
         Validator.validate_waypoint_status(waypoint_status)
         Validator.validate_edge_status(edge_status)
         angle = self.__get_angle_from_value(value)
-        if not angle.get_waypoint().get_status() in [WaypointStatus.BLOCKED, WaypointStatus.FREE]:
-            angle.get_waypoint().set_status(waypoint_status)
-        if not angle.get_edge().get_status() in [EdgeStatus.OBSTRUCTED, EdgeStatus.FREE]:
-            angle.get_edge().set_status(edge_status)
+        waypoint = angle.get_waypoint()
+        edge = angle.get_edge()
+        if waypoint_status in [WaypointStatus.POTENTIALLY_BLOCKED, WaypointStatus.POTENTIALLY_FREE]:
+            waypoint.observe_block(waypoint_status == WaypointStatus.POTENTIALLY_BLOCKED, waypoint_confidence)
+        elif not waypoint.get_status() in CONFIRMED_WAYPOINT_STATUSES:
+            waypoint.set_status(waypoint_status)
+        if edge_status in [EdgeStatus.POTENTIALLY_OBSTRUCTED, EdgeStatus.POTENTIALLY_FREE]:
+            edge.observe_obstruction(edge_status == EdgeStatus.POTENTIALLY_OBSTRUCTED, edge_confidence)
+        elif not edge.get_status() in [EdgeStatus.OBSTRUCTED, EdgeStatus.FREE]:
+            edge.set_status(edge_status)
         return angle
     
     def update_edge_to_waypoint(self, waypoint_id: str, status: EdgeStatus):
@@ -90,15 +222,52 @@ class Waypoint:
         if edge.get_status() is not EdgeStatus.OBSTRUCTED:
             edge.set_status(status)
 
+    def get_angles_from_values(self, values: List[float]):
+        """
+        Returns the angles closest to the values measured during a point scan, relative to the heading on arrival.
+        """
+        for value in values:
+            Validator.validate_angle_value(value)
+        return [self.__get_angle_from_value(value) for value in values]
+
+    def __get_angle_table(self):
+        if self.angle_table is None:
+            # of angles with the same value the first one is used
+            angles_by_value = {}
+            angles_by_waypoint_id = {}
+            for position, angle in enumerate(self.angles):
+                angles_by_value.setdefault(angle.value % 360, (angle, position))
+                angles_by_waypoint_id.setdefault(angle.outgoing_waypoint.id, angle)
+            values = sorted(angles_by_value)
+            self.angle_table = (values, [angles_by_value[v] for v in values], angles_by_waypoint_id)
+        return self.angle_table
+
     def __get_angle_from_value(self, value):
         calculated_angle = self.__calculate_angle_from_value(value)
-        # returns the angle with the predefined value that is closest to the calculated angle
-        return min(self.angles, key=lambda a: self.__modulo_360_difference(a.get_value(),calculated_angle))
+        # returns the angle with the predefined value that is closest to the calculated angle, which is one of the two
+        # neighbours of the calculated angle in the sorted values, and the first one of the angles if both are as close
+        values, angles, _ = self.__get_angle_table()
+        if not values:
+            raise ValueError(f"Waypoint {self.id} has no angles")
+        position = bisect_left(values, calculated_angle)
+        lower_angle, lower_position = angles[position - 1]
+        upper_angle, upper_position = angles[position % len(angles)]
+        lower_difference = self.__modulo_360_difference(lower_angle.value, calculated_angle)
+        upper_difference = self.__modulo_360_difference(upper_angle.value, calculated_angle)
+        if (lower_difference, lower_position) < (upper_difference, upper_position):
+            return lower_angle
+        return upper_angle
     
     def get_value_from_angle_to_waypoint(self, waypoint_id: str):
         Validator.validate_waypoint_id_format(waypoint_id)
-        angle = self.get_angle_to_waypoint(waypoint_id)
-        return self.__calculate_value_from_angle(angle.get_value())
+        relative_values = self.relative_values.get(self.incoming_angle)
+        if relative_values is None:
+            # the car only arrives from the waypoints of the angles, so few incoming angles are cached
+            relative_values = {
+                i: self.__calculate_value_from_angle(a.value) for i, a in self.__get_angle_table()[2].items()
+            }
+            self.relative_values[self.incoming_angle] = relative_values
+        return relative_values[waypoint_id]
     
     def __modulo_360_difference(self, a, b):
         diff = (a - b) % 360
@@ -113,4 +282,4 @@ class Waypoint:
         return (angle - (self.incoming_angle + 180.0)) % 360
     
     def __str__(self):
-        return f"Waypoint[Status:{self.status};ID:{self.id};Angles:{self.angles};Incoming_Angle:{self.incoming_angle};Weight_To_Target:{self.weight_to_target};Dijkstra_Visited:{self.dijkstra_visied};previous_node_to_this_waypoint:{self.previous_node_to_this_waypoint}]"
\ No newline at end of file
+        return f"Waypoint[Status:{self.status};ID:{self.id};Angles:{self.angles};Incoming_Angle:{self.incoming_angle}]"
\ No newline at end of file
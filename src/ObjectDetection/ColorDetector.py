@@ -1,7 +1,7 @@
 from Navigation.WaypointStatus import WaypointStatus
 from Navigation.EdgeStatus import EdgeStatus
 from ObjectDetection.ObjectDetector import ObjectDetector
-from Navigation.Graph import Graph
+from Instrumentation.Instrumentation import Instrumentation
 
 class ColorDetector(ObjectDetector):
 
@@ -17,6 +17,7 @@ class ColorDetector(ObjectDetector):
             and abs(b - target_b) <= tolerance
         )
 
+    @Instrumentation.timed()
     def detect(self):
         self.camera.enable()
 
@@ -65,5 +66,6 @@ class ColorDetector(ObjectDetector):
         return waypoint_status, edge_status
     
 
+    @Instrumentation.timed()
     def start_up_process_detect(self):
-        return Graph()
+        return self._get_start_up_graph()
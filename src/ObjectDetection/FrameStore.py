@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+import numpy as np
+from ObjectDetection.FrameStoreWriter import FrameStoreWriter
+
+
+class FrameStore:
+    """
+    Decoded camera frames in a single memory-mapped file, so recorded frames can be served to the detectors without
+    decoding the JPEG images again on every run.
+    A frame store is a directory with the raw uint8 pixels of all frames in frames.bin and an index.json which maps the
+    name of every frame to its offset and shape. Frames are returned as read-only views of the memory map, pages are
+    only read from disk when a frame is used and are shared between processes reading the same store.
+    """
+
+    DATA_FILE_NAME = FrameStoreWriter.DATA_FILE_NAME
+    INDEX_FILE_NAME = FrameStoreWriter.INDEX_FILE_NAME
+    ALIGNMENT = FrameStoreWriter.ALIGNMENT
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / self.INDEX_FILE_NAME) as index_file:
+            self.index = {entry["name"]: (entry["offset"], tuple(entry["shape"])) for entry in json.load(index_file)}
+        data_path = self.path / self.DATA_FILE_NAME
+        # numpy can not map an empty file
+        self.data = np.memmap(data_path, dtype=np.uint8, mode="r") if data_path.stat().st_size > 0 else None
+
+    @staticmethod
+    def create(path, frames):
+        """
+        Writes the (name, frame) pairs to a new frame store at the path and returns it. The frames are uint8 arrays.
+        """
+        writer = FrameStoreWriter(path)
+        try:
+            for name, frame in frames:
+                writer.add(name, frame)
+        finally:
+            writer.close()
+        return FrameStore(path)
+
+    @staticmethod
+    def create_from_images(path, image_paths):
+        """
+        Decodes the images once and writes them to a new frame store at the path, every frame is named after the file
+        name of its image.
+        """
+        import cv2
+
+        def decode():
+            for image_path in image_paths:
+                image = cv2.imread(str(image_path))
+                if image is None:
+                    raise ValueError(f"Could not read image {image_path}")
+                yield Path(image_path).name, image
+
+        return FrameStore.create(path, decode())
+
+    def get_frame(self, name):
+        """
+        Returns a read-only view of the frame without copying it.
+        """
+        if name not in self.index:
+            raise KeyError(f"Frame {name} is not in the frame store")
+        offset, shape = self.index[name]
+        size = int(np.prod(shape))
+        return self.data[offset:offset + size].reshape(shape)
+
+    def get_names(self):
+        return list(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.index)
@@ -0,0 +1,40 @@
+from ObjectDetection.Camera import Camera
+from ObjectDetection.FrameStore import FrameStore
+
+
+class FrameStoreCamera(Camera):
+    """
+    Camera which replays the frames of a FrameStore in the given order and starts over after the last frame. The
+    frames are zero-copy views of the store, so tests and replays do not decode images.
+    """
+
+    def __init__(self, frame_store: FrameStore, names=None):
+        self.frame_store = frame_store
+        self.names = list(names) if names is not None else frame_store.get_names()
+        if not self.names:
+            raise ValueError("FrameStoreCamera needs at least one frame")
+        for name in self.names:
+            if name not in frame_store:
+                raise ValueError(f"Frame {name} is not in the frame store")
+        self.position = 0
+        # the detections measure the frame they got, so the size is the one of the frame returned last, the size of
+        # the first frame before one was returned
+        self.frame_name = self.names[0]
+        self.enabled = False
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def get_width(self) -> int:
+        return self.frame_store.get_frame(self.frame_name).shape[1]
+
+    def get_height(self) -> int:
+        return self.frame_store.get_frame(self.frame_name).shape[0]
+
+    def get_image_array(self):
+        self.frame_name = self.names[self.position]
+        self.position = (self.position + 1) % len(self.names)
+        return self.frame_store.get_frame(self.frame_name)
@@ -0,0 +1,44 @@
+import json
+from pathlib import Path
+import numpy as np
+
+
+class FrameStoreWriter:
+    """
+    Appends frames to a new frame store, see FrameStore for the format. The index is written when the writer is closed,
+    so a store is only readable after close.
+    """
+
+    DATA_FILE_NAME = "frames.bin"
+    INDEX_FILE_NAME = "index.json"
+    # frames start at aligned offsets, so the rows of a view are aligned as in a freshly allocated array
+    ALIGNMENT = 64
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.data_file = open(self.path / self.DATA_FILE_NAME, "wb")
+        self.index = []
+        self.names = set()
+        self.offset = 0
+
+    def add(self, name: str, frame):
+        if name in self.names:
+            raise ValueError(f"Frame {name} is already in the frame store")
+        frame = np.ascontiguousarray(frame)
+        if frame.dtype != np.uint8:
+            raise ValueError(f"Frame {name} has dtype {frame.dtype}, expected uint8")
+        padding = -self.offset % self.ALIGNMENT
+        self.data_file.write(bytes(padding))
+        self.offset += padding
+        self.data_file.write(frame.tobytes())
+        self.names.add(name)
+        self.index.append({"name": name, "offset": self.offset, "shape": list(frame.shape)})
+        self.offset += frame.nbytes
+
+    def close(self):
+        if self.data_file.closed:
+            return
+        self.data_file.close()
+        with open(self.path / self.INDEX_FILE_NAME, "w") as index_file:
+            json.dump(self.index, index_file)
@@ -0,0 +1,105 @@
+from Logger.Logger import Logger
+
+logger = Logger("InferenceResolutionController")
+
+
+class InferenceResolutionController:
+    """
+    Chooses the input resolution of the inference per call site within a latency budget.
+    The inference times are measured per call site and smoothed with an exponential moving average. When the average
+    exceeds the budget, the resolution is stepped down. When the average stayed well below the budget for a few calls
+    and the next larger resolution is expected to fit into the budget, it is stepped up again. The inference time is
+    expected to grow with the number of pixels. Call sites without a budget keep their resolution.
+    """
+
+    # multiples of the stride of the YOLO models
+    RESOLUTIONS = (320, 416, 512, 640, 800, 960, 1280)
+
+    def __init__(self, smoothing: float = 0.3, headroom: float = 0.7, stable_count: int = 3):
+        if not 0.0 < smoothing <= 1.0:
+            raise ValueError(f"Smoothing must be in (0, 1], got {smoothing}")
+        if not 0.0 < headroom < 1.0:
+            raise ValueError(f"Headroom must be in (0, 1), got {headroom}")
+        # weight of the latest inference time in the average
+        self.smoothing = smoothing
+        # share of the budget the average has to stay below before the resolution is stepped up
+        self.headroom = headroom
+        # number of calls in a row with headroom before the resolution is stepped up
+        self.stable_count = stable_count
+        self.call_sites = {}
+
+    def add_call_site(
+        self,
+        name: str,
+        latency_budget: float = None,
+        resolution: int = 640,
+        min_resolution: int = RESOLUTIONS[0],
+        max_resolution: int = RESOLUTIONS[-1],
+    ):
+        resolutions = [r for r in self.RESOLUTIONS if min_resolution <= r <= max_resolution]
+        if resolution not in resolutions:
+            raise ValueError(f"Resolution {resolution} is not one of {resolutions}")
+        if latency_budget is not None and latency_budget <= 0:
+            raise ValueError(f"Latency budget must be positive, got {latency_budget}")
+        self.call_sites[name] = {
+            "latency_budget": latency_budget,
+            "resolutions": resolutions,
+            "resolution": resolution,
+            "latency": None,
+            "calls_with_headroom": 0,
+            "changes": 0,
+        }
+
+    def get_resolution(self, name: str) -> int:
+        return self.call_sites[name]["resolution"]
+
+    def record(self, name: str, resolution: int, latency: float):
+        """
+        Records the inference time in seconds of a call at the given resolution and adapts the resolution of the call
+        site. Calls at another resolution than the current one, e.g. during a change, are ignored.
+        """
+        call_site = self.call_sites[name]
+        if resolution != call_site["resolution"]:
+            return
+        if call_site["latency"] is None:
+            call_site["latency"] = latency
+        else:
+            call_site["latency"] += self.smoothing * (latency - call_site["latency"])
+        latency_budget = call_site["latency_budget"]
+        if latency_budget is None:
+            return
+        index = call_site["resolutions"].index(resolution)
+        if call_site["latency"] > latency_budget and index > 0:
+            self.__change_resolution(name, call_site, index - 1)
+        elif call_site["latency"] <= self.headroom * latency_budget and index < len(call_site["resolutions"]) - 1:
+            call_site["calls_with_headroom"] += 1
+            next_resolution = call_site["resolutions"][index + 1]
+            expected_latency = call_site["latency"] * (next_resolution / resolution) ** 2
+            if call_site["calls_with_headroom"] >= self.stable_count and expected_latency <= latency_budget:
+                self.__change_resolution(name, call_site, index + 1)
+        else:
+            call_site["calls_with_headroom"] = 0
+
+    def __change_resolution(self, name, call_site, index):
+        resolution = call_site["resolutions"][index]
+        # the average is scaled to the new resolution until it is measured there
+        call_site["latency"] *= (resolution / call_site["resolution"]) ** 2
+        call_site["resolution"] = resolution
+        call_site["calls_with_headroom"] = 0
+        call_site["changes"] += 1
+        logger.info("inference resolution changed", call_site=name, resolution=resolution,
+                    expected_latency=round(call_site["latency"], 4), budget=call_site["latency_budget"])
+
+    def get_report(self):
+        """
+        Returns the chosen resolution, the budget, the average inference time and the number of changes by call site.
+        """
+        return {
+            name: {
+                "resolution": call_site["resolution"],
+                "latency_budget": call_site["latency_budget"],
+                "latency": call_site["latency"],
+                "changes": call_site["changes"],
+            }
+            for name, call_site in self.call_sites.items()
+        }
@@ -1,9 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Optional, Tuple
 from Navigation.WaypointStatus import WaypointStatus
 from Navigation.EdgeStatus import EdgeStatus
+from Navigation.Graph import Graph
+from Configuration.Configurator import Configurator
 
 class ObjectDetector(ABC):
+    # graph of the last start up detection, reset and returned again by the next start up of the same configuration
+    start_up_graph: Graph = None
+
     @abstractmethod
     def detect(self) -> Tuple[WaypointStatus, EdgeStatus]:
         pass
@@ -11,3 +16,40 @@ class ObjectDetector(ABC):
     @abstractmethod
     def start_up_process_detect(self):
         pass
+
+    def _get_start_up_graph(self, waypoints_configuration=None) -> Graph:
+        """
+        Returns the graph for a start up detection of the configuration, by default the one of the Configurator.
+        The graph of the previous start up is reset and returned again if it reflects the same configuration, so a
+        restarted navigation only sets the statuses instead of allocating every waypoint, angle and edge again.
+        The previous graph must not be used by a controller anymore.
+        """
+        if waypoints_configuration is None:
+            waypoints_configuration = Configurator().get_waypoints()
+        graph = self.start_up_graph
+        if graph is not None and graph.waypoints_configuration is waypoints_configuration:
+            graph.reset()
+        else:
+            graph = Graph(waypoints_configuration)
+            self.start_up_graph = graph
+        return graph
+
+    def get_confidences(self) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Returns the confidences of the waypoint status and the edge status of the last detection.
+        None means that the detector does not know how confident it is.
+        """
+        return None, None
+
+    def start_warm_up(self):
+        """
+        Starts loading the models in the background, so the first detection does not have to wait for it.
+        """
+        pass
+
+    def reload_configuration(self):
+        """
+        Applies a configuration reloaded by the Configurator. Detectors which read the tolerances and coordinates from
+        the Configurator on every detection, like the YOLODetector, use it without this.
+        """
+        pass
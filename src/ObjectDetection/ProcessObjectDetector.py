@@ -0,0 +1,236 @@
+import multiprocessing
+from multiprocessing import shared_memory
+from pathlib import Path
+import numpy as np
+from Configuration.Configurator import Configurator
+from Exceptions.DetectionWorkerError import DetectionWorkerError
+from Instrumentation.Instrumentation import Instrumentation
+from Logger.Logger import Logger
+from Navigation.EdgeStatus import EdgeStatus
+from Navigation.WaypointStatus import WaypointStatus
+from ObjectDetection.ObjectDetector import ObjectDetector
+from ObjectDetection.SharedFrameCamera import SharedFrameCamera
+from Recording.GraphState import GraphState
+
+logger = Logger("ProcessObjectDetector")
+
+
+class ProcessObjectDetector(ObjectDetector):
+    """
+    Runs an object detector in a worker process, so a long inference neither blocks the handling of other events nor
+    competes with the navigation for the GIL.
+    The frames of the cameras are written to a ring of shared memory slots, the worker reads them as views of the slots
+    without copying. Image paths are sent as paths. The worker returns the statuses and confidences of a detection and
+    the statuses of the start up graph over a pipe.
+    If the worker crashes or does not answer within the timeout, it is restarted and the request is sent once more.
+    The detector factory is called in the worker with the top and bottom camera of the worker and the frame count as
+    keyword, so the detector reads as many frames per detection as are sent. It has to be picklable, e.g. the
+    YOLODetector class or a function of a module.
+    """
+
+    def __init__(
+        self,
+        detector_factory,
+        top_camera,
+        bottom_camera,
+        frame_count: int = 1,
+        slot_count: int = 4,
+        timeout: float = 30.0,
+        start_timeout: float = 120.0,
+    ):
+        if frame_count <= 0 or slot_count < frame_count:
+            raise ValueError(f"Slot count {slot_count} must be at least the frame count {frame_count}, which must be positive")
+        self.detector_factory = detector_factory
+        self.top_camera = top_camera
+        self.bottom_camera = bottom_camera
+        # frames per detection, they are all sent with one request
+        self.frame_count = frame_count
+        self.timeout = timeout
+        # loading the models takes much longer than a detection
+        self.start_timeout = start_timeout
+        self.slots = [None] * slot_count
+        self.next_slot_index = 0
+        self.restart_count = 0
+        self.last_confidences = (None, None)
+        # a forked worker would inherit the threads and the torch state of this process
+        self.context = multiprocessing.get_context("spawn")
+        self.process = None
+        self.connection = None
+        self.is_ready = False
+        self.__start_worker()
+
+    def __start_worker(self):
+        connection, worker_connection = self.context.Pipe()
+        self.process = self.context.Process(
+            target=ProcessObjectDetector._serve,
+            args=(worker_connection, self.detector_factory, self.frame_count, Configurator._configuration_path),
+            name="detection-worker",
+            daemon=True,
+        )
+        self.process.start()
+        worker_connection.close()
+        self.connection = connection
+        self.is_ready = False
+
+    def __restart_worker(self):
+        self.restart_count += 1
+        logger.warning("restarting detection worker", restarts=self.restart_count)
+        self.__stop_worker()
+        self.__start_worker()
+
+    def __stop_worker(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+    @Instrumentation.timed()
+    def detect(self):
+        bottom_frames = [self.__share_frame(self.bottom_camera.get_image_array()) for _ in range(self.frame_count)]
+        waypoint_status, edge_status, confidences = self.__request("detect", [], bottom_frames)
+        self.last_confidences = tuple(confidences)
+        return WaypointStatus[waypoint_status], EdgeStatus[edge_status]
+
+    def get_confidences(self):
+        return self.last_confidences
+
+    @Instrumentation.timed()
+    def start_up_process_detect(self):
+        top_frames = [self.__share_frame(self.top_camera.get_image_array())]
+        return GraphState.restore(self.__request("start_up_process_detect", top_frames, []))
+
+    def reload_configuration(self):
+        """
+        Reloads the configuration in the worker, it has its own Configurator.
+        """
+        self.__request("reload_configuration", [], [])
+
+    def close(self):
+        """
+        Stops the worker and releases the shared memory slots.
+        """
+        if self.process is not None:
+            try:
+                self.connection.send(("stop",))
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(self.timeout)
+            self.__stop_worker()
+            self.process = None
+        for slot in self.slots:
+            if slot is not None:
+                slot.close()
+                slot.unlink()
+        self.slots = [None] * len(self.slots)
+
+    def __share_frame(self, frame):
+        if isinstance(frame, (str, Path)):
+            return ("path", str(frame))
+        frame = np.asarray(frame)
+        slot_index = self.next_slot_index
+        self.next_slot_index = (self.next_slot_index + 1) % len(self.slots)
+        slot = self.slots[slot_index]
+        if slot is None or slot.size < frame.nbytes:
+            if slot is not None:
+                slot.close()
+                slot.unlink()
+            slot = self.slots[slot_index] = shared_memory.SharedMemory(create=True, size=max(1, frame.nbytes))
+        np.ndarray(frame.shape, frame.dtype, buffer=slot.buf)[...] = frame
+        return ("slot", slot_index, slot.name, frame.shape, frame.dtype.str)
+
+    def __request(self, command, top_frames, bottom_frames):
+        request = (
+            command,
+            (top_frames, self.top_camera.get_width(), self.top_camera.get_height()),
+            (bottom_frames, self.bottom_camera.get_width(), self.bottom_camera.get_height()),
+        )
+        for attempt in range(2):
+            try:
+                response = self.__send(request)
+            except (EOFError, OSError, TimeoutError) as e:
+                logger.warning("detection worker failed", command=command, error=repr(e))
+                self.__restart_worker()
+                continue
+            status, result = response
+            if status == "error":
+                raise DetectionWorkerError(f"{command} failed in the detection worker: {result}")
+            return result
+        raise DetectionWorkerError(f"{command} failed in the detection worker, which was restarted")
+
+    def __send(self, request):
+        if not self.is_ready:
+            if not self.connection.poll(self.start_timeout):
+                raise TimeoutError("detection worker did not start")
+            self.connection.recv()
+            self.is_ready = True
+        self.connection.send(request)
+        if not self.connection.poll(self.timeout):
+            raise TimeoutError("detection worker did not answer")
+        return self.connection.recv()
+
+    @staticmethod
+    def _serve(connection, detector_factory, frame_count, configuration_path):
+        """
+        Main loop of the worker process, handles requests until it receives stop or the pipe is closed.
+        """
+        if configuration_path is not None:
+            Configurator.initialize(configuration_path)
+        top_camera = SharedFrameCamera()
+        bottom_camera = SharedFrameCamera()
+        detector = detector_factory(top_camera, bottom_camera, frame_count=frame_count)
+        # the first request waits for the warm up, so a restarted worker is ready as soon as possible
+        detector.start_warm_up()
+        # shared memory slots by slot index, attached once and replaced when the main process replaces a slot
+        slots = {}
+        connection.send(("ready",))
+        while True:
+            try:
+                request = connection.recv()
+            except EOFError:
+                break
+            if request[0] == "stop":
+                break
+            command, (top_frames, top_width, top_height), (bottom_frames, bottom_width, bottom_height) = request
+            top_camera.set_frames([ProcessObjectDetector.__open_frame(slots, f) for f in top_frames], top_width, top_height)
+            bottom_camera.set_frames(
+                [ProcessObjectDetector.__open_frame(slots, f) for f in bottom_frames], bottom_width, bottom_height
+            )
+            try:
+                if command == "detect":
+                    waypoint_status, edge_status = detector.detect()
+                    result = (waypoint_status.name, edge_status.name, tuple(detector.get_confidences()))
+                elif command == "reload_configuration":
+                    if configuration_path is not None:
+                        Configurator.reload()
+                    detector.reload_configuration()
+                    result = None
+                else:
+                    result = GraphState.capture(detector.start_up_process_detect())
+                response = ("ok", result)
+            except Exception as e:
+                response = ("error", f"{type(e).__name__}: {e}")
+            # the views must be released before a slot can be closed
+            top_camera.set_frames([], top_width, top_height)
+            bottom_camera.set_frames([], bottom_width, bottom_height)
+            connection.send(response)
+        for slot in slots.values():
+            try:
+                slot.close()
+            except BufferError:
+                # the detector still holds a view of the slot, it is released when the process ends
+                pass
+
+    @staticmethod
+    def __open_frame(slots, frame):
+        if frame[0] == "path":
+            return frame[1]
+        _, slot_index, name, shape, dtype = frame
+        slot = slots.get(slot_index)
+        if slot is None or slot.name != name:
+            if slot is not None:
+                try:
+                    slot.close()
+                except BufferError:
+                    pass
+            slot = slots[slot_index] = shared_memory.SharedMemory(name=name)
+        return np.ndarray(shape, np.dtype(dtype), buffer=slot.buf)
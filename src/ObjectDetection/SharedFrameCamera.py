@@ -0,0 +1,40 @@
+from ObjectDetection.Camera import Camera
+
+
+class SharedFrameCamera(Camera):
+    """
+    Camera of the detection worker process. It serves the frames of the current request, which are views of shared
+    memory slots or image paths, in order and starts over after the last one. The size is the size reported by the
+    camera of the main process.
+    """
+
+    def __init__(self):
+        self.frames = []
+        self.position = 0
+        self.width = 0
+        self.height = 0
+
+    def set_frames(self, frames, width: int, height: int):
+        self.frames = frames
+        self.position = 0
+        self.width = width
+        self.height = height
+
+    def enable(self):
+        pass
+
+    def disable(self):
+        pass
+
+    def get_width(self) -> int:
+        return self.width
+
+    def get_height(self) -> int:
+        return self.height
+
+    def get_image_array(self):
+        if not self.frames:
+            raise ValueError("No frame was sent to the detection worker")
+        frame = self.frames[self.position]
+        self.position = (self.position + 1) % len(self.frames)
+        return frame
@@ -0,0 +1,155 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from Instrumentation.Instrumentation import Instrumentation
+
+
+class TiledInference:
+    """
+    Runs a YOLO model on overlapping tiles of a high resolution frame instead of on the downsized frame, so that small
+    and distant objects keep enough pixels to be detected.
+    The tiles are predicted in batches on a pool of worker threads. Every worker uses its own model created by the
+    model factory, because the models are not thread safe. The boxes of all tiles are translated to frame coordinates
+    and duplicates from the overlapping areas are removed with a non-maximum suppression across the tiles.
+    """
+
+    def __init__(
+        self,
+        model_factory,
+        tile_size: int = 640,
+        overlap: float = 0.2,
+        batch_size: int = 8,
+        worker_count: int = 2,
+        iou_threshold: float = 0.5,
+        containment_threshold: float = 0.8,
+    ):
+        if tile_size <= 0:
+            raise ValueError(f"Tile size must be positive, got {tile_size}")
+        if not 0.0 <= overlap < 1.0:
+            raise ValueError(f"Overlap must be in [0, 1), got {overlap}")
+        if batch_size <= 0 or worker_count <= 0:
+            raise ValueError(f"Batch size and worker count must be positive, got {batch_size} and {worker_count}")
+        self.model_factory = model_factory
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.batch_size = batch_size
+        self.worker_count = worker_count
+        self.iou_threshold = iou_threshold
+        # an object cut by a tile border is detected as a smaller box inside the box of the complete object
+        self.containment_threshold = containment_threshold
+        self.__models = threading.local()
+        self.__executor = None
+
+    def get_tiles(self, width: int, height: int):
+        """
+        Returns the (x, y, width, height) windows of the tiles which cover the frame. Neighbouring tiles overlap by at
+        least the configured share of the tile size and the last tile of each row and column ends at the frame border.
+        """
+        return [
+            (x, y, min(self.tile_size, width), min(self.tile_size, height))
+            for y in self.__get_offsets(height)
+            for x in self.__get_offsets(width)
+        ]
+
+    def __get_offsets(self, length):
+        if length <= self.tile_size:
+            return [0]
+        stride = max(1, int(self.tile_size * (1.0 - self.overlap)))
+        offsets = list(range(0, length - self.tile_size, stride))
+        offsets.append(length - self.tile_size)
+        return offsets
+
+    @Instrumentation.timed()
+    def predict(self, frame):
+        """
+        Returns the objects detected in the frame, in the format of YOLODetector with bounding boxes in frame
+        coordinates. The frame is an image array or the path of an image.
+        """
+        if not hasattr(frame, "shape"):
+            import cv2
+            frame = cv2.imread(str(frame))
+        height, width = frame.shape[:2]
+        tiles = self.get_tiles(width, height)
+        batches = [tiles[i:i + self.batch_size] for i in range(0, len(tiles), self.batch_size)]
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.worker_count, thread_name_prefix="tiled-inference")
+        objects = []
+        for batch_objects in self.__executor.map(lambda batch: self.__predict_batch(frame, batch), batches):
+            objects.extend(batch_objects)
+        return self.non_max_suppression(objects, self.iou_threshold, self.containment_threshold)
+
+    def __predict_batch(self, frame, tiles):
+        model = getattr(self.__models, "model", None)
+        if model is None:
+            model = self.__models.model = self.model_factory()
+        images = [frame[y:y + tile_height, x:x + tile_width] for x, y, tile_width, tile_height in tiles]
+        results = model.predict(images, imgsz=self.tile_size, verbose=False)
+        objects = []
+        for (x, y, _, _), result in zip(tiles, results):
+            objects.extend(self.parse_result(result, model.names, x, y))
+        return objects
+
+    def shutdown(self):
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    @staticmethod
+    def parse_result(result, names, x_offset: int = 0, y_offset: int = 0):
+        """
+        Converts the boxes of a YOLO result to object dicts, translated by the offset of the tile.
+        """
+        objects = []
+        for box in result.boxes:
+            x_min, y_min, x_max, y_max = map(int, box.xyxy[0])
+            x_min += x_offset
+            x_max += x_offset
+            y_min += y_offset
+            y_max += y_offset
+            objects.append(
+                {
+                    "label": names[int(box.cls[0])],
+                    "confidence": box.conf[0].item(),
+                    "bounding_box": {
+                        "x_min": x_min,
+                        "x_max": x_max,
+                        "y_min": y_min,
+                        "y_max": y_max,
+                        "width": x_max - x_min,
+                        "height": y_max - y_min,
+                    },
+                }
+            )
+        return objects
+
+    @staticmethod
+    def non_max_suppression(objects, iou_threshold: float = 0.5, containment_threshold: float = 0.8):
+        """
+        Keeps the most confident object of every group of overlapping objects with the same label. Objects overlap if
+        their intersection over union exceeds the iou threshold or the smaller box lies within the larger one by more
+        than the containment threshold.
+        """
+        kept = []
+        for obj in sorted(objects, key=lambda o: o["confidence"], reverse=True):
+            box = obj["bounding_box"]
+            area = max(0, box["width"]) * max(0, box["height"])
+            is_duplicate = False
+            for kept_obj in kept:
+                if kept_obj["label"] != obj["label"]:
+                    continue
+                kept_box = kept_obj["bounding_box"]
+                intersection_width = min(box["x_max"], kept_box["x_max"]) - max(box["x_min"], kept_box["x_min"])
+                intersection_height = min(box["y_max"], kept_box["y_max"]) - max(box["y_min"], kept_box["y_min"])
+                if intersection_width <= 0 or intersection_height <= 0:
+                    continue
+                intersection = intersection_width * intersection_height
+                kept_area = kept_box["width"] * kept_box["height"]
+                union = area + kept_area - intersection
+                smaller_area = min(area, kept_area)
+                if intersection / union > iou_threshold or (
+                    smaller_area > 0 and intersection / smaller_area > containment_threshold
+                ):
+                    is_duplicate = True
+                    break
+            if not is_duplicate:
+                kept.append(obj)
+        return kept
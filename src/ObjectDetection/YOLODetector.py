@@ -1,41 +1,177 @@
 from datetime import datetime
-import cv2
 import json
 import os
+import threading
+import time
 from pathlib import Path
-from ultralytics import YOLO
+import numpy as np
 from Navigation.WaypointStatus import WaypointStatus
 from Navigation.Waypoint import Waypoint
 from Navigation.EdgeStatus import EdgeStatus
 from Navigation.Angle import Angle
 from ObjectDetection.ObjectDetector import ObjectDetector
-from Navigation.Graph import Graph
+from ObjectDetection.TiledInference import TiledInference
+from ObjectDetection.InferenceResolutionController import InferenceResolutionController
 from Configuration.Configurator import Configurator
+from Instrumentation.Instrumentation import Instrumentation
+from Logger.Logger import Logger
+
+logger = Logger("YOLODetector")
 
 
 class YOLODetector(ObjectDetector):
-    def __init__(self, top_camera, bottom_camera, center_stripe_percentage=0.5):
+    def __init__(
+        self,
+        top_camera,
+        bottom_camera,
+        center_stripe_percentage=0.5,
+        frame_count=1,
+        tile_size=None,
+        tile_overlap=0.2,
+        tile_batch_size=8,
+        detect_latency_budget=None,
+        start_up_latency_budget=None,
+    ):
         self.top_camera = top_camera
         self.bottom_camera = bottom_camera
-        path_to_object_model = Path(__file__).resolve().parent / "small_object_model.pt"
-        path_to_line_model = Path(__file__).resolve().parent / "small_line_model.pt"
-        self.object_model = YOLO(path_to_object_model)
-        self.line_model = YOLO(path_to_line_model)
+        # ultralytics, torch and cv2 take seconds to import, so they are imported and the models are loaded on first
+        # use or by the warm up, not when this module is imported
+        self.path_to_object_model = Path(__file__).resolve().parent / "small_object_model.pt"
+        self.path_to_line_model = Path(__file__).resolve().parent / "small_line_model.pt"
+        self.object_model = None
+        self.line_model = None
+        self.tile_size = tile_size
+        self.tile_overlap = tile_overlap
+        self.tile_batch_size = tile_batch_size
+        # with a tile size, the objects of the start up detection are detected on tiles of the full resolution frame
+        self.tiled_inference = None
+        # held while the models are loaded, warmed up and predict, so a detection waits for a running warm up and the
+        # models never predict on two threads at once
+        self.model_lock = threading.Lock()
+        self.warm_up_thread = None
+        # seconds spent on import, model_load, warm_up and first_inference, see get_start_up_timings
+        self.start_up_timings = {}
         # percentage of the image width that is considered the center stripe and is checked for obstacles
         self.center_stripe_percentage = center_stripe_percentage
+        # number of bottom camera frames per detection, the objects of the frames are combined by majority vote
+        self.frame_count = frame_count
+        # confidences of the waypoint and edge status of the last detection
+        self.last_confidences = (None, None)
+        # the detections on the angles need a short latency, the start up detection needs a high recall, without a
+        # latency budget the resolution stays at 640. A controller runs the start up detection once, so its measurement
+        # only changes the resolution of later start up detections of this detector
+        self.resolution_controller = InferenceResolutionController()
+        self.resolution_controller.add_call_site("detect", detect_latency_budget, max_resolution=640)
+        self.resolution_controller.add_call_site("start_up", start_up_latency_budget)
+
+    def start_warm_up(self):
+        """
+        Loads the models and runs a dummy inference on a background thread, e.g. while the controller waits for the
+        communication to the car.
+        """
+        if self.warm_up_thread is None:
+            self.warm_up_thread = threading.Thread(target=self.warm_up, name="yolo-warm-up", daemon=True)
+            self.warm_up_thread.start()
+
+    def warm_up(self):
+        """
+        Loads the models and runs a dummy inference, which sets up the inference graph and the memory allocator.
+        """
+        with self.model_lock:
+            self.__load_models()
+            if "warm_up" in self.start_up_timings:
+                return
+            start = time.perf_counter()
+            dummy_frame = np.zeros((640, 640, 3), dtype=np.uint8)
+            self.object_model.predict(dummy_frame, imgsz=640, verbose=False)
+            self.line_model.predict(dummy_frame, imgsz=640, verbose=False)
+            self.start_up_timings["warm_up"] = time.perf_counter() - start
+        logger.info("models warmed up", seconds=round(self.start_up_timings["warm_up"], 3))
+
+    def get_start_up_timings(self):
+        """
+        Returns the seconds spent on importing the inference packages, loading the models, the warm up and the first
+        real inference. Steps which did not happen yet are missing.
+        """
+        return dict(self.start_up_timings)
+
+    def __load_models(self):
+        # must be called with the model lock
+        if self.line_model is not None:
+            return
+        start = time.perf_counter()
+        from ultralytics import YOLO
+        # cv2 is only used to draw and save the results, it is imported with the models so a detection does not wait for it
+        import cv2
+        self.start_up_timings["import"] = time.perf_counter() - start
+        start = time.perf_counter()
+        self.object_model = YOLO(self.path_to_object_model)
+        if self.tile_size is not None:
+            path_to_object_model = self.path_to_object_model
+            self.tiled_inference = TiledInference(
+                lambda: YOLO(path_to_object_model), self.tile_size, self.tile_overlap, self.tile_batch_size
+            )
+        self.line_model = YOLO(self.path_to_line_model)
+        self.start_up_timings["model_load"] = time.perf_counter() - start
 
+    def __record_first_inference(self, start):
+        if "first_inference" not in self.start_up_timings:
+            self.start_up_timings["first_inference"] = time.perf_counter() - start
+            logger.info("start up timings", **{k: round(v, 3) for k, v in self.start_up_timings.items()})
+
+    @Instrumentation.timed()
     def detect(self):
-        frame = self.bottom_camera.get_image_array()
-        results = self.object_model.predict(frame, imgsz=640)
-        objects = self.__parse_results(results)
-        return self.__get_object_status(objects)
+        start = Instrumentation.start()
+        frames = [self.bottom_camera.get_image_array() for _ in range(self.frame_count)]
+        start = Instrumentation.stop("YOLODetector.detect.preprocess", start)
+        # all frames are predicted as one batch, which is much cheaper than one prediction per frame
+        resolution = self.resolution_controller.get_resolution("detect")
+        with self.model_lock:
+            self.__load_models()
+            inference_start = time.perf_counter()
+            results = self.object_model.predict(frames if self.frame_count > 1 else frames[0], imgsz=resolution)
+            self.resolution_controller.record("detect", resolution, time.perf_counter() - inference_start)
+            self.__record_first_inference(inference_start)
+        start = Instrumentation.stop("YOLODetector.detect.inference", start)
+        frame_objects = [self.__parse_result(result) for result in results]
+        object_status = self.__get_object_status(frame_objects)
+        Instrumentation.stop("YOLODetector.detect.parse", start)
+        return object_status
     
+    @Instrumentation.timed()
     def start_up_process_detect(self):
-        graph = Graph()
+        start = Instrumentation.start()
+        graph = self._get_start_up_graph()
         frame = self.top_camera.get_image_array()
-        object_results = self.object_model.predict(frame, imgsz=640)
-        line_results = self.line_model.predict(frame, imgsz=640)
-        objects = self.__parse_results(object_results)
+        start = Instrumentation.stop("YOLODetector.start_up_process_detect.preprocess", start)
+        resolution = self.resolution_controller.get_resolution("start_up")
+        with self.model_lock:
+            self.__load_models()
+            if self.tiled_inference is not None and not hasattr(frame, "shape"):
+                # cv2 is imported with the models
+                import cv2
+                frame = cv2.imread(str(frame))
+            inference_start = time.perf_counter()
+            # only the predictions at the chosen resolution are timed for the resolution controller, the tiles are
+            # predicted at their own size
+            resolution_time = 0.0
+            if self.tiled_inference is not None:
+                # cones and obstacles are small in the full frame, the lines span the whole frame and need no tiling
+                objects = self.tiled_inference.predict(frame)
+                object_image = frame
+            else:
+                object_results = self.object_model.predict(frame, imgsz=resolution)
+                resolution_time += time.perf_counter() - inference_start
+                objects = self.__parse_result(object_results[0])
+                object_image = object_results[0].orig_img
+            line_start = time.perf_counter()
+            line_results = self.line_model.predict(frame, imgsz=resolution)
+            resolution_time += time.perf_counter() - line_start
+            line_objects = self.__parse_result(line_results[0], line_model=True)
+            self.resolution_controller.record("start_up", resolution, resolution_time)
+            self.__record_first_inference(inference_start)
+        logger.info("start up detection", resolution=resolution, tiled=self.tiled_inference is not None)
+        start = Instrumentation.stop("YOLODetector.start_up_process_detect.inference", start)
         # self.__print_object_coordinates(objects)
         # self.__visualize_results(line_results)
 
@@ -46,30 +182,63 @@ class YOLODetector(ObjectDetector):
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         object_detection_file_path = os.path.join(output_dir, f"{timestamp}_objects.jpg")
         line_detection_file_path = os.path.join(output_dir, f"{timestamp}_lines.jpg")
-        self.__save_results_to_file(object_results, object_detection_file_path)
-        self.__save_results_to_file(line_results, line_detection_file_path)
-        line_objects = self.__parse_results(line_results, line_model=True)
+        self.__save_objects_to_file(object_image, objects, object_detection_file_path)
+        self.__save_objects_to_file(line_results[0].orig_img, line_objects, line_detection_file_path)
+        start = Instrumentation.stop("YOLODetector.start_up_process_detect.save", start)
 
         self.__update_waypoints(graph, objects, "cone")
         self.__update_edges(graph, objects, line_objects, ["obstacle", "edge"])
+        Instrumentation.stop("YOLODetector.start_up_process_detect.parse", start)
         return graph
 
-    def __get_object_status(self, objects):
-        waypoint_status = WaypointStatus.POTENTIALLY_FREE if not self.__check_for_label_in_center_stripe(objects, "cone") else WaypointStatus.POTENTIALLY_BLOCKED
-        edge_status = EdgeStatus.POTENTIALLY_FREE if not self.__check_for_label_in_center_stripe(objects, "obstacle") else EdgeStatus.POTENTIALLY_OBSTRUCTED
+    def get_confidences(self):
+        return self.last_confidences
+
+    def get_resolution_report(self):
+        """
+        Returns the inference resolution chosen for the detections on the angles and for the start up detection, with
+        the latency budget and the measured average inference time.
+        """
+        return self.resolution_controller.get_report()
+
+    def __get_object_status(self, frame_objects):
+        has_cone, cone_confidence = self.__vote_for_label_in_center_stripe(frame_objects, "cone")
+        has_obstacle, obstacle_confidence = self.__vote_for_label_in_center_stripe(frame_objects, "obstacle")
+        waypoint_status = WaypointStatus.POTENTIALLY_BLOCKED if has_cone else WaypointStatus.POTENTIALLY_FREE
+        edge_status = EdgeStatus.POTENTIALLY_OBSTRUCTED if has_obstacle else EdgeStatus.POTENTIALLY_FREE
+        self.last_confidences = (cone_confidence, obstacle_confidence)
         return waypoint_status, edge_status
 
-    def __check_for_label_in_center_stripe(self, objects, label):
+    def __vote_for_label_in_center_stripe(self, frame_objects, label):
+        """
+        Returns whether the label is in the center stripe of more than half of the frames and the confidence of that
+        decision. A detection is as confident as the mean confidence of the label over all frames, counting frames
+        without the label as 0. The absence of the label is as confident as the share of frames without it, a single
+        frame without the label has no confidence.
+        """
+        confidences = [self.__get_label_confidence_in_center_stripe(objects, label) for objects in frame_objects]
+        detected_confidences = [c for c in confidences if c is not None]
+        if len(detected_confidences) * 2 > len(confidences):
+            return True, sum(detected_confidences) / len(confidences)
+        if len(confidences) == 1:
+            return False, None
+        return False, (len(confidences) - len(detected_confidences)) / len(confidences)
+
+    def __get_label_confidence_in_center_stripe(self, objects, label):
+        """
+        Returns the highest confidence of the objects with the label in the center stripe or None if there is none.
+        """
         center_stripe_width = self.bottom_camera.get_width() * self.center_stripe_percentage
         center = self.bottom_camera.get_width() / 2
         center_stripe_left_bound = center - center_stripe_width / 2
         center_stripe_right_bound = center + center_stripe_width / 2
+        confidence = None
         for obj in objects:
             if obj["label"] == label:
                 center = obj["bounding_box"]["x_min"] + obj["bounding_box"]["width"] / 2
                 if center_stripe_left_bound < center < center_stripe_right_bound:
-                    return True
-        return False
+                    confidence = max(confidence or 0.0, obj["confidence"])
+        return confidence
     
 
     def __update_waypoints(self, graph, objects, label):
@@ -80,19 +249,19 @@ class YOLODetector(ObjectDetector):
             x = waypoint_data["x"]
             y = waypoint_data["y"]
             waypoint = graph._get_waypoint_by_id(waypoint_name)
+            cone_confidence = None
             for obj in objects:
                 if obj["label"] == label:
                     if (x - tolerance) <= obj["bounding_box"]["x_min"] + (obj["bounding_box"]["width"] / 2) <= (x + tolerance) and \
                        (y - tolerance) <= obj["bounding_box"]["y_max"] <= (y + tolerance):
-                        #Set status to POTENTIALLY_BLOCKED if cone is detected
-                        waypoint.set_status(WaypointStatus.POTENTIALLY_BLOCKED)
+                        cone_confidence = obj["confidence"]
                         # check next waypoint
                         break
 
-            if waypoint.get_status() != WaypointStatus.POTENTIALLY_BLOCKED:
-                waypoint.set_status(WaypointStatus.POTENTIALLY_FREE)
+            # POTENTIALLY_BLOCKED if a cone is detected, weighted by the confidence of the detection
+            waypoint.observe_block(cone_confidence is not None, cone_confidence)
             waypoint_statuses[waypoint_name] = waypoint.get_status()
-            print(waypoint_statuses)
+        logger.debug("waypoint statuses", statuses=waypoint_statuses)
         return waypoint_statuses
     
     def __update_edges(self, graph, objects, line_objects, labels):
@@ -120,15 +289,17 @@ class YOLODetector(ObjectDetector):
                 outgoing_y = waypoints[outgoing_waypoint_id]["y"]
                 edge_waypoint_coords, edge_outgoing_waypoint_coords = self.__get_relevant_edge_coords(bounding_box_corners) #which coordinates to use for the edge
                 # Check for obstucted edges
+                obstacle_confidence = None
                 for obj in objects:
                     if obj["label"] == labels[0]:
                         obstacle_x = edge_data["obstacle_coords"]["x"]
                         obstacle_y = edge_data["obstacle_coords"]["y"]
                         if (obstacle_x - obstacle_tolerance) <= obj["bounding_box"]["x_min"] <= (obstacle_x + obstacle_tolerance) and \
                             (obstacle_y - obstacle_tolerance) <= obj["bounding_box"]["y_max"] <= (obstacle_y + obstacle_tolerance):
-                            edge.set_status(EdgeStatus.POTENTIALLY_OBSTRUCTED)
-                            continue #check next edge
-
+                            obstacle_confidence = obj["confidence"]
+                            break
+                if obstacle_confidence is not None:
+                    edge.observe_obstruction(True, obstacle_confidence)
 
                 # Check for free edges
                 for line_obj in line_objects:
@@ -153,14 +324,14 @@ class YOLODetector(ObjectDetector):
                             condition_met = within_x1 and within_y1 and within_x2 and within_y2
                         # Update edge status if conditions are met
                         if condition_met:
-                            if edge.get_status() != EdgeStatus.POTENTIALLY_OBSTRUCTED:
-                                edge.set_status(EdgeStatus.POTENTIALLY_FREE)
+                            if obstacle_confidence is None:
+                                edge.observe_obstruction(False, line_obj["confidence"])
                                 break  # check next edge    
                 edge_statuses[f"{waypoint_id}_to_{outgoing_waypoint_id}"] = edge.get_status()
 
                 edge_statuses[f"{waypoint_id}_to_{outgoing_waypoint_id}"] = edge.get_status()
 
-        print(edge_statuses)
+        logger.debug("edge statuses", statuses=edge_statuses)
         return edge_statuses
     
     def __get_relevant_edge_coords(self, bounding_box_corners):
@@ -186,9 +357,10 @@ class YOLODetector(ObjectDetector):
             height = obj["bounding_box"]["height"]
             label = obj["label"]
             confidence = obj["confidence"]
-            print(f"Detected {label} with confidence {confidence:.2f} at x_min: {x_min}, x_max: {x_max}, y_min: {y_min}, y_max: {y_max} with size ({width}, {height})")
+            logger.info("Detected %s with confidence %.2f at x_min: %d, x_max: %d, y_min: %d, y_max: %d with size (%d, %d)", label, confidence, x_min, x_max, y_min, y_max, width, height)
 
     def __visualize_results(self, results):
+        import cv2
         def mouse_callback(event, x, y, flags, param):
             nonlocal annotated_frame
             if event == cv2.EVENT_LBUTTONDOWN:  # Left mouse button click
@@ -224,11 +396,13 @@ class YOLODetector(ObjectDetector):
         cv2.waitKey(0)
         cv2.destroyAllWindows()
 
-    def __save_results_to_file(self, results, save_path):
-        annotated_frame = results[0].orig_img.copy()
-        for result in results[0].boxes:
-            x_min, y_min, x_max, y_max = map(int, result.xyxy[0])
-            confidence = result.conf[0].item()
+    def __save_objects_to_file(self, image, objects, save_path):
+        import cv2
+        annotated_frame = image.copy()
+        for obj in objects:
+            bounding_box = obj["bounding_box"]
+            x_min, y_min, x_max, y_max = bounding_box["x_min"], bounding_box["y_min"], bounding_box["x_max"], bounding_box["y_max"]
+            confidence = obj["confidence"]
             # Draw thicker bounding boxes
             cv2.rectangle(annotated_frame, (x_min, y_min), (x_max, y_max), (0, 255, 0), 3)
             text = f"({confidence:.2f})"
@@ -253,6 +427,7 @@ class YOLODetector(ObjectDetector):
         cv2.imwrite(save_path, annotated_frame)
 
     def __write_text(self, annotated_frame, text, x, y):
+        import cv2
         font = cv2.FONT_HERSHEY_SIMPLEX
         font_scale = 2  # Reduced font scale for smaller text
         thickness = 3  # Reduced thickness for smaller text
@@ -262,26 +437,6 @@ class YOLODetector(ObjectDetector):
         cv2.rectangle(annotated_frame, background_top_left, background_bottom_right, (0, 0, 0), -1)
         cv2.putText(annotated_frame, text, (x, y), font, font_scale, (255, 255, 255), thickness)
 
-    def __parse_results(self, results, line_model=False):
-        objects = []
-        for result in results[0].boxes:
-            x_min, y_min, x_max, y_max = map(int, result.xyxy[0])
-            width = x_max - x_min
-            height = y_max - y_min
-            label = self.object_model.names[int(result.cls[0])] if not line_model else self.line_model.names[int(result.cls[0])]
-            confidence = result.conf[0].item()
-            objects.append(
-                {
-                    "label": label,
-                    "confidence": confidence,
-                    "bounding_box": {
-                        "x_min": x_min,
-                        "x_max": x_max,
-                        "y_min": y_min,
-                        "y_max": y_max,
-                        "width": width,
-                        "height": height,
-                    },
-                }
-            )
-        return objects
+    def __parse_result(self, result, line_model=False):
+        names = self.object_model.names if not line_model else self.line_model.names
+        return TiledInference.parse_result(result, names)
@@ -0,0 +1,65 @@
+from Navigation.Belief import Belief
+from Navigation.EdgeStatus import EdgeStatus
+from Navigation.Graph import Graph
+from Navigation.GraphTemplate import GraphTemplate
+from Navigation.WaypointStatus import WaypointStatus
+
+
+class GraphState:
+    """
+    Converts a graph to JSON serializable data and back. The data contains the angles of all waypoints as well as the
+    statuses and beliefs of the waypoints and edges, so a graph can be restored without the configuration files.
+    """
+
+    @staticmethod
+    def capture(graph: Graph):
+        waypoints = {}
+        for waypoint in graph.waypoints:
+            edges = {}
+            for angle in waypoint.get_angles():
+                edge = angle.get_edge()
+                edges[angle.get_waypoint().get_id()] = {
+                    "angle": angle.get_value(),
+                    "status": edge.get_status().name,
+                    "belief": GraphState.__capture_belief(edge.obstruction_belief),
+                }
+            waypoints[waypoint.get_id()] = {
+                "status": waypoint.get_status().name,
+                "belief": GraphState.__capture_belief(waypoint.block_belief),
+                "edges": edges,
+            }
+        return waypoints
+
+    @staticmethod
+    def restore(state):
+        # every state is a new configuration, caching its template would only replace the cached ones
+        graph = Graph(template=GraphTemplate(state))
+        for waypoint_id, waypoint_state in state.items():
+            waypoint = graph._get_waypoint_by_id(waypoint_id)
+            if waypoint_state["belief"] is not None:
+                waypoint.set_block_belief(Belief.from_log_odds(*waypoint_state["belief"]))
+            else:
+                waypoint.set_status(WaypointStatus[waypoint_state["status"]])
+            for outgoing_waypoint_id, edge_state in waypoint_state["edges"].items():
+                edge = waypoint.get_angle_to_waypoint(outgoing_waypoint_id).get_edge()
+                if edge_state["belief"] is not None:
+                    edge.set_obstruction_belief(Belief.from_log_odds(*edge_state["belief"]))
+                else:
+                    edge.set_status(EdgeStatus[edge_state["status"]])
+        return graph
+
+    @staticmethod
+    def get_statuses(state):
+        """
+        Returns the statuses of all waypoints and edges of the state by id, edges have the id <waypoint>_to_<waypoint>.
+        """
+        statuses = {}
+        for waypoint_id, waypoint_state in state.items():
+            statuses[waypoint_id] = waypoint_state["status"]
+            for outgoing_waypoint_id, edge_state in waypoint_state["edges"].items():
+                statuses[f"{waypoint_id}_to_{outgoing_waypoint_id}"] = edge_state["status"]
+        return statuses
+
+    @staticmethod
+    def __capture_belief(belief):
+        return None if belief is None else [belief.log_odds, belief.observation_count]
@@ -0,0 +1,82 @@
+import json
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from Recording.RecordType import RecordType
+
+
+class MissionLog:
+    """
+    Append-only binary log of the records of missions. The file starts with a magic number, every record consists of a
+    header with the length of the payload, the wall clock timestamp and the record type followed by the JSON payload.
+    Records are flushed when they are appended, so a crash loses at most the record being written. Readers skip such an
+    incomplete record at the end of the file, and opening the log again cuts it off, so the next record is appended
+    after the last complete one.
+    """
+
+    MAGIC = b"MLOG\x01"
+    # length of the payload, timestamp, record type
+    RECORD_HEADER = struct.Struct("<IdB")
+
+    def __init__(self, path):
+        self.path = Path(path)
+        is_new = not self.path.exists() or self.path.stat().st_size == 0
+        if not is_new:
+            end = self.__get_complete_length(self.path)
+            if end < self.path.stat().st_size:
+                os.truncate(self.path, end)
+        self.file = open(self.path, "ab")
+        if is_new:
+            self.file.write(self.MAGIC)
+            self.file.flush()
+        # records are appended from the controller and from background threads of the detectors
+        self.lock = threading.Lock()
+
+    def append(self, record_type: RecordType, data, timestamp: float = None):
+        if timestamp is None:
+            timestamp = time.time()
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        with self.lock:
+            self.file.write(self.RECORD_HEADER.pack(len(payload), timestamp, record_type) + payload)
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+    @staticmethod
+    def read(path):
+        """
+        Yields the (timestamp, record type, data) tuples of all complete records of the log.
+        """
+        with open(path, "rb") as log_file:
+            if log_file.read(len(MissionLog.MAGIC)) != MissionLog.MAGIC:
+                raise ValueError(f"{path} is not a mission log")
+            while True:
+                header = log_file.read(MissionLog.RECORD_HEADER.size)
+                if len(header) < MissionLog.RECORD_HEADER.size:
+                    return
+                length, timestamp, record_type = MissionLog.RECORD_HEADER.unpack(header)
+                payload = log_file.read(length)
+                if len(payload) < length:
+                    return
+                yield timestamp, RecordType(record_type), json.loads(payload)
+
+    @staticmethod
+    def __get_complete_length(path):
+        # the records are skipped by their lengths, the payloads are not decoded
+        size = path.stat().st_size
+        header_size = MissionLog.RECORD_HEADER.size
+        with open(path, "rb") as log_file:
+            if log_file.read(len(MissionLog.MAGIC)) != MissionLog.MAGIC:
+                raise ValueError(f"{path} is not a mission log")
+            end = len(MissionLog.MAGIC)
+            while end + header_size <= size:
+                log_file.seek(end)
+                length = MissionLog.RECORD_HEADER.unpack(log_file.read(header_size))[0]
+                if end + header_size + length > size:
+                    break
+                end += header_size + length
+        return end
@@ -0,0 +1,132 @@
+import time
+from pathlib import Path
+from Navigation.NavigationController import NavigationController
+from ObjectDetection.FrameStoreWriter import FrameStoreWriter
+from Recording.GraphState import GraphState
+from Recording.MissionLog import MissionLog
+from Recording.RecordType import RecordType
+
+
+class MissionRecorder:
+    """
+    Records everything a NavigationController receives and emits into a MissionLog, so missions can be replayed with
+    the MissionReplayer. attach wraps the handlers of the controller, the emitter, the object detector and its cameras.
+    Frames which are image arrays are written to a frame store if a path for it is given, otherwise only their shape is
+    recorded. Frames which are image paths are recorded as the path.
+    """
+
+    # the cameras of the object detectors, recorded under the name of the attribute
+    CAMERA_ATTRIBUTES = ("top_camera", "bottom_camera")
+
+    def __init__(self, log_path, frame_store_path=None):
+        self.log = MissionLog(log_path)
+        self.frame_writer = FrameStoreWriter(frame_store_path) if frame_store_path is not None else None
+        self.frame_count = 0
+        # handlers call other handlers (on_set_target calls on_set_mission), only the outermost one is an event
+        self.handler_depth = 0
+
+    def attach(self, controller: NavigationController):
+        for name in dir(NavigationController):
+            if name.startswith("on_"):
+                setattr(controller, name, self.__record_handler(name[len("on_"):], getattr(controller, name)))
+        use_pointscanning = controller.use_pointscanning
+
+        def recording_use_pointscanning():
+            use_pointscanning()
+            self.__record_controller(controller)
+
+        controller.use_pointscanning = recording_use_pointscanning
+        self.__record_controller(controller)
+        emitter = controller.emitter
+        emit = emitter.emit
+
+        def recording_emit(message):
+            self.log.append(RecordType.COMMAND, {"message": message})
+            return emit(message)
+
+        emitter.emit = recording_emit
+        self.__record_object_detector(controller.object_detector)
+
+    def close(self):
+        self.log.close()
+        if self.frame_writer is not None:
+            self.frame_writer.close()
+
+    def __record_controller(self, controller):
+        self.log.append(RecordType.CONTROLLER, {"is_on_ideal_path": controller.is_on_ideal_path})
+
+    def __record_handler(self, name, handler):
+        def recording_handler(*arguments):
+            if self.handler_depth > 0:
+                return handler(*arguments)
+            self.log.append(RecordType.EVENT, {"name": name, "arguments": list(arguments)})
+            self.handler_depth += 1
+            error = None
+            start = time.perf_counter()
+            try:
+                return handler(*arguments)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                latency = time.perf_counter() - start
+                self.handler_depth -= 1
+                self.log.append(RecordType.EVENT_HANDLED, {"name": name, "latency": latency, "error": error})
+
+        return recording_handler
+
+    def __record_object_detector(self, object_detector):
+        detect = object_detector.detect
+        start_up_process_detect = object_detector.start_up_process_detect
+
+        def recording_detect():
+            start = time.perf_counter()
+            waypoint_status, edge_status = detect()
+            latency = time.perf_counter() - start
+            waypoint_confidence, edge_confidence = object_detector.get_confidences()
+            self.log.append(
+                RecordType.DETECTION,
+                {
+                    "waypoint_status": waypoint_status.name,
+                    "edge_status": edge_status.name,
+                    "confidences": [waypoint_confidence, edge_confidence],
+                    "latency": latency,
+                },
+            )
+            return waypoint_status, edge_status
+
+        def recording_start_up_process_detect():
+            start = time.perf_counter()
+            graph = start_up_process_detect()
+            latency = time.perf_counter() - start
+            self.log.append(RecordType.START_UP, {"graph": GraphState.capture(graph), "latency": latency})
+            return graph
+
+        object_detector.detect = recording_detect
+        object_detector.start_up_process_detect = recording_start_up_process_detect
+        recorded_cameras = []
+        for attribute in self.CAMERA_ATTRIBUTES:
+            camera = getattr(object_detector, attribute, None)
+            # a single camera can be used as top and bottom camera
+            if camera is not None and not any(camera is c for c in recorded_cameras):
+                self.__record_camera(attribute, camera)
+                recorded_cameras.append(camera)
+
+    def __record_camera(self, camera_name, camera):
+        get_image_array = camera.get_image_array
+
+        def recording_get_image_array():
+            frame = get_image_array()
+            data = {"camera": camera_name, "frame": None}
+            if isinstance(frame, (str, Path)):
+                data["frame"] = str(frame)
+            else:
+                data["shape"] = list(frame.shape)
+                if self.frame_writer is not None:
+                    data["frame"] = f"{camera_name}_{self.frame_count:06d}"
+                    self.frame_writer.add(data["frame"], frame)
+            self.frame_count += 1
+            self.log.append(RecordType.FRAME, data)
+            return frame
+
+        camera.get_image_array = recording_get_image_array
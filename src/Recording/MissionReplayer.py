@@ -0,0 +1,153 @@
+import time
+from Communication.Emitter import Emitter
+from Navigation.NavigationController import NavigationController
+from ObjectDetection.ObjectDetector import ObjectDetector
+from Recording.GraphState import GraphState
+from Recording.MissionLog import MissionLog
+from Recording.RecordType import RecordType
+from Recording.RecordedObjectDetector import RecordedObjectDetector
+from Recording.ReplayReport import ReplayReport
+from Validation.Validator import Validator
+
+
+class MissionReplayer(Emitter):
+    """
+    Feeds the events of a recorded mission back through a new NavigationController, as fast as possible or at the
+    recorded speed, and reports where the emitted commands and the detections diverge from the recording.
+    Without an object detector the recorded detections are replayed, which checks the navigation alone. With an object
+    detector, e.g. a YOLODetector on FrameStoreCameras of the recorded frames (see get_frame_names), its detections are
+    compared to the recorded ones as well.
+    Like the simulation, the replay waits for the alternative routes before every event, so replays are deterministic.
+    """
+
+    def __init__(self, log_path):
+        self.frame_references = []
+        self.events = self.__group_events(MissionLog.read(log_path))
+        self.commands = []
+
+    def __group_events(self, records):
+        events = []
+        # controller settings are applied before the next event
+        controller_settings = None
+        for timestamp, record_type, data in records:
+            if record_type == RecordType.FRAME:
+                self.frame_references.append(data)
+            elif record_type == RecordType.CONTROLLER:
+                controller_settings = data
+            elif record_type == RecordType.EVENT:
+                events.append(
+                    {
+                        "name": data["name"],
+                        "arguments": data["arguments"],
+                        "timestamp": timestamp,
+                        "controller": controller_settings,
+                        "latency": None,
+                        "error": None,
+                        "commands": [],
+                        "detections": [],
+                        "start_ups": [],
+                    }
+                )
+                controller_settings = None
+            elif not events:
+                # records of an event whose EVENT record was lost
+                continue
+            elif record_type == RecordType.EVENT_HANDLED:
+                events[-1]["latency"] = data["latency"]
+                events[-1]["error"] = data["error"]
+            elif record_type == RecordType.COMMAND:
+                events[-1]["commands"].append(data["message"])
+            elif record_type == RecordType.DETECTION:
+                events[-1]["detections"].append(data)
+            elif record_type == RecordType.START_UP:
+                events[-1]["start_ups"].append(data)
+        return events
+
+    def get_events(self):
+        return self.events
+
+    def get_frame_names(self, camera_name: str):
+        """
+        Returns the recorded frame references of the camera in the order the frames were read.
+        """
+        return [r["frame"] for r in self.frame_references if r["camera"] == camera_name and r["frame"] is not None]
+
+    def emit(self, message):
+        self.commands.append(message)
+
+    def replay(self, object_detector: ObjectDetector = None, realtime: bool = False) -> ReplayReport:
+        if object_detector is None:
+            object_detector = RecordedObjectDetector(
+                [d for e in self.events for d in e["detections"]], [s for e in self.events for s in e["start_ups"]]
+            )
+        detections = []
+        start_ups = []
+        self.__collect_detections(object_detector, detections, start_ups)
+        controller = NavigationController(self, object_detector)
+        report = ReplayReport()
+        replay_start = time.perf_counter()
+        # the log may be recorded on a generated map of the simulation
+        with Validator.generated_waypoint_ids():
+            for event_index, event in enumerate(self.events):
+                if event["name"] == "stop":
+                    break
+                if realtime:
+                    delay = (event["timestamp"] - self.events[0]["timestamp"]) - (time.perf_counter() - replay_start)
+                    if delay > 0:
+                        time.sleep(delay)
+                if event["controller"] is not None:
+                    controller.is_on_ideal_path = event["controller"]["is_on_ideal_path"]
+                if controller.graph is not None:
+                    controller.graph.wait_for_alternative_routes()
+                self.commands = []
+                detections.clear()
+                start_ups.clear()
+                error = None
+                start = time.perf_counter()
+                try:
+                    getattr(controller, f"on_{event['name']}")(*event["arguments"])
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                report.add_event_latencies(event["name"], event["latency"], time.perf_counter() - start)
+                report.emitted_commands.extend(self.commands)
+                self.__compare(report, event_index, event, error, detections, start_ups)
+        return report
+
+    def __compare(self, report, event_index, event, error, detections, start_ups):
+        name = event["name"]
+        if self.commands != event["commands"]:
+            report.add_divergence(event_index, name, "commands", event["commands"], self.commands)
+        if error != event["error"]:
+            report.add_divergence(event_index, name, "error", event["error"], error)
+        recorded_detections = [(d["waypoint_status"], d["edge_status"]) for d in event["detections"]]
+        if detections != recorded_detections:
+            report.add_divergence(event_index, name, "detection", recorded_detections, detections)
+        for recorded_start_up, statuses in zip(event["start_ups"], start_ups):
+            recorded_statuses = GraphState.get_statuses(recorded_start_up["graph"])
+            different_ids = sorted(i for i in recorded_statuses if recorded_statuses[i] != statuses.get(i))
+            if different_ids:
+                report.add_divergence(
+                    event_index,
+                    name,
+                    "start_up",
+                    {i: recorded_statuses[i] for i in different_ids},
+                    {i: statuses.get(i) for i in different_ids},
+                )
+
+    @staticmethod
+    def __collect_detections(object_detector, detections, start_ups):
+        detect = object_detector.detect
+        start_up_process_detect = object_detector.start_up_process_detect
+
+        def collecting_detect():
+            waypoint_status, edge_status = detect()
+            detections.append((waypoint_status.name, edge_status.name))
+            return waypoint_status, edge_status
+
+        def collecting_start_up_process_detect():
+            graph = start_up_process_detect()
+            start_ups.append(GraphState.get_statuses(GraphState.capture(graph)))
+            return graph
+
+        object_detector.detect = collecting_detect
+        object_detector.start_up_process_detect = collecting_start_up_process_detect
@@ -0,0 +1,17 @@
+from enum import IntEnum
+
+class RecordType(IntEnum):
+    # message received from the microcontroller, written before it is handled
+    EVENT = 1
+    # written after the event was handled, with the latency of the handler
+    EVENT_HANDLED = 2
+    # message emitted to the microcontroller
+    COMMAND = 3
+    # reference to a frame read from a camera
+    FRAME = 4
+    # result of a detection on an angle
+    DETECTION = 5
+    # graph created by the start up detection
+    START_UP = 6
+    # settings of the controller which are not set by events
+    CONTROLLER = 7
@@ -0,0 +1,37 @@
+from Navigation.EdgeStatus import EdgeStatus
+from Navigation.WaypointStatus import WaypointStatus
+from ObjectDetection.ObjectDetector import ObjectDetector
+from Recording.GraphState import GraphState
+
+
+class RecordedObjectDetector(ObjectDetector):
+    """
+    Object detector which returns the detections of a recorded mission in the recorded order, so the navigation can be
+    replayed without cameras and models.
+    """
+
+    def __init__(self, detections, start_up_graphs):
+        # DETECTION and START_UP record data in the order they were recorded
+        self.detections = list(detections)
+        self.start_up_graphs = list(start_up_graphs)
+        self.detection_position = 0
+        self.start_up_position = 0
+        self.last_confidences = (None, None)
+
+    def detect(self):
+        if self.detection_position >= len(self.detections):
+            raise ValueError("No recorded detection left")
+        detection = self.detections[self.detection_position]
+        self.detection_position += 1
+        self.last_confidences = tuple(detection["confidences"])
+        return WaypointStatus[detection["waypoint_status"]], EdgeStatus[detection["edge_status"]]
+
+    def get_confidences(self):
+        return self.last_confidences
+
+    def start_up_process_detect(self):
+        if self.start_up_position >= len(self.start_up_graphs):
+            raise ValueError("No recorded start up detection left")
+        start_up_graph = self.start_up_graphs[self.start_up_position]
+        self.start_up_position += 1
+        return GraphState.restore(start_up_graph["graph"])
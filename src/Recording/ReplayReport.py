@@ -0,0 +1,51 @@
+from collections import defaultdict
+
+
+class ReplayReport:
+    """
+    Differences between a recorded mission and its replay. A divergence is a dict with the index and name of the
+    event, the kind of the divergence (commands, error, detection or start_up) and the recorded and replayed values.
+    """
+
+    def __init__(self):
+        self.event_count = 0
+        self.divergences = []
+        self.emitted_commands = []
+        # latencies in seconds of the handled events, grouped by the event name
+        self.recorded_latencies = defaultdict(list)
+        self.replayed_latencies = defaultdict(list)
+
+    def add_event_latencies(self, event_name: str, recorded_latency: float, replayed_latency: float):
+        if recorded_latency is not None:
+            self.recorded_latencies[event_name].append(recorded_latency)
+        self.replayed_latencies[event_name].append(replayed_latency)
+        self.event_count += 1
+
+    def add_divergence(self, event_index: int, event_name: str, kind: str, recorded, replayed):
+        self.divergences.append(
+            {"event": event_index, "name": event_name, "kind": kind, "recorded": recorded, "replayed": replayed}
+        )
+
+    def has_diverged(self):
+        return len(self.divergences) > 0
+
+    def summary(self):
+        lines = [f"{self.event_count} events, {len(self.divergences)} divergences"]
+        for divergence in self.divergences:
+            lines.append(
+                f"  event {divergence['event']} {divergence['name']} {divergence['kind']}: "
+                f"recorded {divergence['recorded']} replayed {divergence['replayed']}"
+            )
+        for event_name, latencies in sorted(self.replayed_latencies.items()):
+            recorded_latencies = self.recorded_latencies.get(event_name, [])
+            recorded = f"{self.__median(recorded_latencies) * 1000:8.2f} ms" if recorded_latencies else "       -   "
+            lines.append(
+                f"  {event_name:<24} n={len(latencies):>6} "
+                f"p50 recorded={recorded} replayed={self.__median(latencies) * 1000:8.2f} ms"
+            )
+        return "\n".join(lines)
+
+    @staticmethod
+    def __median(values):
+        ordered = sorted(values)
+        return ordered[len(ordered) // 2]
@@ -0,0 +1,80 @@
+import math
+import random
+from Simulation.SimulatedMap import SimulatedMap
+
+
+class MapGenerator:
+    """
+    Generates synthetic maps shaped as a square grid with hidden cones, obstacles and missing lines.
+    The start position X is connected to waypoint S in the lower left corner of the grid. Waypoint ids of the other
+    waypoints are "W" followed by their position in the grid.
+    """
+
+    # angle of the edge for each direction (row offset, column offset) in the grid
+    DIRECTIONS = [(1, 0, 0.0), (0, 1, 90.0), (-1, 0, 180.0), (0, -1, 270.0)]
+
+    def __init__(
+        self,
+        waypoint_count: int,
+        cone_probability: float = 0.0,
+        obstacle_probability: float = 0.0,
+        missing_line_probability: float = 0.0,
+        seed: int = 0,
+    ):
+        if waypoint_count < 2:
+            raise ValueError(f"A map needs at least 2 waypoints, got {waypoint_count}")
+        self.waypoint_count = waypoint_count
+        self.cone_probability = cone_probability
+        self.obstacle_probability = obstacle_probability
+        self.missing_line_probability = missing_line_probability
+        self.random = random.Random(seed)
+
+    def generate(self) -> SimulatedMap:
+        waypoints_configuration = self.generate_waypoints_configuration()
+        cone_waypoint_ids = set()
+        obstructed_edges = set()
+        missing_edges = set()
+        for waypoint_id, waypoint_data in waypoints_configuration.items():
+            if waypoint_id in ["X", "S"]:
+                continue
+            if self.random.random() < self.cone_probability:
+                cone_waypoint_ids.add(waypoint_id)
+            for outgoing_waypoint_id in waypoint_data["edges"]:
+                # every line is only rolled once, from the waypoint which comes first in the configuration
+                edge = frozenset([waypoint_id, outgoing_waypoint_id])
+                if outgoing_waypoint_id in ["X", "S"] or edge in obstructed_edges or edge in missing_edges:
+                    continue
+                roll = self.random.random()
+                if roll < self.missing_line_probability:
+                    missing_edges.add(edge)
+                elif roll < self.missing_line_probability + self.obstacle_probability:
+                    obstructed_edges.add(edge)
+        return SimulatedMap(waypoints_configuration, cone_waypoint_ids, obstructed_edges, missing_edges)
+
+    def generate_waypoints_configuration(self):
+        columns = math.ceil(math.sqrt(self.waypoint_count - 1))
+        grid_size = self.waypoint_count - 1
+
+        def waypoint_id(position):
+            return "S" if position == 0 else f"W{position}"
+
+        def edge_data(angle):
+            return {
+                "angle": angle,
+                "obstacle_coords": {"x": 0, "y": 0},
+                "bounding_box_corners": {"from": "LOWER_LEFT", "to": "UPPER_RIGHT"},
+            }
+
+        waypoints = {"X": {"x": 0, "y": -1, "edges": {"S": edge_data(0.0)}}}
+        for position in range(grid_size):
+            row, column = divmod(position, columns)
+            edges = {}
+            for row_offset, column_offset, angle in self.DIRECTIONS:
+                neighbour_row, neighbour_column = row + row_offset, column + column_offset
+                neighbour_position = neighbour_row * columns + neighbour_column
+                if neighbour_row >= 0 and 0 <= neighbour_column < columns and neighbour_position < grid_size:
+                    edges[waypoint_id(neighbour_position)] = edge_data(angle)
+            if position == 0:
+                edges["X"] = edge_data(180.0)
+            waypoints[waypoint_id(position)] = {"x": column, "y": row, "edges": edges}
+        return waypoints
@@ -0,0 +1,157 @@
+import time
+from collections import deque
+from typing import List
+from Communication.Emitter import Emitter
+from Exceptions.NoPathLeftError import NoPathLeftError
+from Navigation.Graph import Graph
+from Navigation.NavigationController import NavigationController
+from Simulation.SimulatedMap import SimulatedMap
+from Simulation.SimulatedObjectDetector import SimulatedObjectDetector
+from Simulation.SimulationResult import SimulationResult
+from Validation.Validator import Validator
+
+
+class NavigationSimulator(Emitter):
+    """
+    Headless stand-in for the microcontroller. The commands emitted by the NavigationController are answered with the
+    events the car would send on the simulated map, until the target is reached.
+    """
+
+    def __init__(
+        self,
+        simulated_map: SimulatedMap,
+        is_on_ideal_path: bool = True,
+        detection_accuracy: float = 1.0,
+        seed: int = 0,
+        max_event_count: int = None,
+        world_model=None,
+    ):
+        self.simulated_map = simulated_map
+        self.object_detector = SimulatedObjectDetector(simulated_map, detection_accuracy, seed)
+        self.object_detector.on_graph_created = self.__instrument_graph
+        # shared with the simulators of other cars on the same map
+        self.controller = NavigationController(self, self.object_detector, world_model)
+        if not is_on_ideal_path:
+            self.controller.use_pointscanning()
+        # prevents endless missions, e.g. when the car keeps turning back in front of cones
+        self.max_event_count = max_event_count or 50 * len(simulated_map.get_waypoint_ids())
+        self.command_handlers = {
+            "ping": self.__on_ping,
+            "target_line_angle": self.__on_target_line_angle,
+            "target_line": self.__on_target_line,
+            "follow_line": self.__on_follow_line,
+            "scan_point": self.__on_scan_point,
+            "target_reached": self.__on_target_reached,
+        }
+        # events are (name, arguments, id of the waypoint the bottom camera looks at) tuples
+        self.pending_events = deque()
+        self.result = SimulationResult()
+        # ground truth state of the car
+        self.position = Graph.START_WAYPOINT_ID
+        # angle of the line at the current position which leads back to the waypoint the car came from
+        self.arrival_angle = 180.0
+        # angle the car has turned since it arrived at the current position
+        self.turned_angle = 0.0
+        self.line_waypoint_id = None
+        self.scanned_waypoint_ids = ["S"]
+
+    def run_mission(self, target_waypoint_ids: List[str]) -> SimulationResult:
+        self.pending_events.append(("set_mission", (target_waypoint_ids,), None))
+        try:
+            with Validator.generated_waypoint_ids():
+                self.__run_events()
+        except NoPathLeftError as e:
+            self.result.error = str(e)
+        self.result.scan_report = self.controller.get_scan_report()
+        return self.result
+
+    def __run_events(self):
+        while self.pending_events and not self.result.is_target_reached:
+            if self.result.event_count >= self.max_event_count:
+                self.result.error = f"aborted after {self.result.event_count} events"
+                break
+            self.__dispatch(*self.pending_events.popleft())
+
+    def emit(self, message):
+        self.result.emitted_commands.append(message)
+        command, _, argument = message.partition(":")
+        if command not in self.command_handlers:
+            raise ValueError(f"Unknown command {message}")
+        self.command_handlers[command](argument)
+
+    def __dispatch(self, name, arguments, looked_at_waypoint_id):
+        if looked_at_waypoint_id is not None:
+            self.object_detector.look_at(self.position, looked_at_waypoint_id)
+        if self.controller.graph is not None:
+            # the car drives much longer than the background calculations take, waiting keeps the simulation deterministic
+            self.controller.graph.wait_for_alternative_routes()
+        handler = getattr(self.controller, f"on_{name}")
+        start = time.perf_counter()
+        handler(*arguments)
+        self.result.add_event_latency(name, time.perf_counter() - start)
+
+    def __instrument_graph(self, graph):
+        get_next_best_waypoint = graph.get_next_best_waypoint
+
+        def timed_get_next_best_waypoint():
+            start = time.perf_counter()
+            try:
+                return get_next_best_waypoint()
+            finally:
+                self.result.add_planning_time(time.perf_counter() - start)
+
+        graph.get_next_best_waypoint = timed_get_next_best_waypoint
+
+    def __get_heading(self):
+        return (self.arrival_angle + 180.0 + self.turned_angle) % 360
+
+    def __on_ping(self, argument):
+        self.pending_events.append(("pong", (), None))
+
+    def __on_target_line_angle(self, argument):
+        # the controller keeps the emitted angle as the angle the car turned since it arrived
+        self.turned_angle = float(argument) % 360
+        self.line_waypoint_id = self.simulated_map.get_outgoing_waypoint_id_by_angle(self.position, self.__get_heading())
+        if self.simulated_map.is_missing(self.position, self.line_waypoint_id):
+            self.pending_events.append(("line_missing", (), None))
+        else:
+            self.pending_events.append(("turned_to_target_line", (), None))
+
+    def __on_target_line(self, argument):
+        self.line_waypoint_id = self.scanned_waypoint_ids[int(argument)]
+        self.pending_events.append(("turned_to_target_line", (), None))
+
+    def __on_follow_line(self, argument):
+        origin = self.position
+        destination = self.line_waypoint_id
+        if self.simulated_map.is_obstructed(origin, destination):
+            self.pending_events.append(("obstacle_detected", (), None))
+        self.turned_angle = 0.0
+        if self.simulated_map.has_cone(destination):
+            # the car turns around in front of the cone and drives back to the waypoint it came from
+            self.pending_events.append(("cone_detected", (), None))
+            self.arrival_angle = self.simulated_map.get_angle(origin, destination)
+        else:
+            self.position = destination
+            self.arrival_angle = self.simulated_map.get_angle(destination, origin)
+        self.pending_events.append(("waypoint", (), None))
+
+    def __on_scan_point(self, argument):
+        heading = self.__get_heading()
+        lines = []
+        for outgoing_waypoint_id in self.simulated_map.get_outgoing_waypoint_ids(self.position):
+            if self.simulated_map.is_missing(self.position, outgoing_waypoint_id):
+                continue
+            value = (self.simulated_map.get_angle(self.position, outgoing_waypoint_id) - heading) % 360
+            lines.append((value, outgoing_waypoint_id))
+        lines.sort()
+        self.scanned_waypoint_ids = [outgoing_waypoint_id for _, outgoing_waypoint_id in lines]
+        for value, outgoing_waypoint_id in lines:
+            self.pending_events.append(("angle", (float(value),), outgoing_waypoint_id))
+        self.pending_events.append(("point_scanning_finished", (), None))
+        # the car is back at its heading after a full turn, which the controller treats as not turned
+        self.turned_angle = 0.0
+
+    def __on_target_reached(self, argument):
+        self.result.is_target_reached = True
+        self.result.final_waypoint_id = self.position
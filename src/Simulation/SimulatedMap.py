@@ -0,0 +1,57 @@
+class SimulatedMap:
+    """
+    Ground truth of a simulated track. The navigation only gets to know the hidden cones, obstacles and missing lines
+    through the simulated sensors.
+    """
+
+    def __init__(self, waypoints_configuration, cone_waypoint_ids=None, obstructed_edges=None, missing_edges=None):
+        self.waypoints_configuration = waypoints_configuration
+        self.cone_waypoint_ids = set(cone_waypoint_ids or [])
+        # edges are stored as frozensets of the two waypoint ids, a line is obstructed or missing in both directions
+        self.obstructed_edges = set(obstructed_edges or [])
+        self.missing_edges = set(missing_edges or [])
+
+    def get_waypoint_ids(self):
+        return list(self.waypoints_configuration)
+
+    def get_angle(self, waypoint_id: str, outgoing_waypoint_id: str):
+        return self.waypoints_configuration[waypoint_id]["edges"][outgoing_waypoint_id]["angle"]
+
+    def get_outgoing_waypoint_ids(self, waypoint_id: str):
+        return list(self.waypoints_configuration[waypoint_id]["edges"])
+
+    def get_outgoing_waypoint_id_by_angle(self, waypoint_id: str, angle: float):
+        """
+        Returns the id of the waypoint whose line at the given waypoint is closest to the absolute angle.
+        """
+        def difference(outgoing_waypoint_id):
+            diff = abs(self.get_angle(waypoint_id, outgoing_waypoint_id) - angle) % 360
+            return min(diff, 360 - diff)
+
+        return min(self.get_outgoing_waypoint_ids(waypoint_id), key=difference)
+
+    def has_cone(self, waypoint_id: str):
+        return waypoint_id in self.cone_waypoint_ids
+
+    def is_obstructed(self, waypoint_id: str, outgoing_waypoint_id: str):
+        return frozenset([waypoint_id, outgoing_waypoint_id]) in self.obstructed_edges
+
+    def is_missing(self, waypoint_id: str, outgoing_waypoint_id: str):
+        return frozenset([waypoint_id, outgoing_waypoint_id]) in self.missing_edges
+
+    def is_reachable(self, target_waypoint_id: str, start_waypoint_id: str = "X"):
+        """
+        Returns whether the target waypoint can be reached without passing cones or missing lines.
+        """
+        reached = {start_waypoint_id}
+        waypoint_ids_to_visit = [start_waypoint_id]
+        while waypoint_ids_to_visit:
+            waypoint_id = waypoint_ids_to_visit.pop()
+            for outgoing_waypoint_id in self.get_outgoing_waypoint_ids(waypoint_id):
+                if outgoing_waypoint_id in reached or self.has_cone(outgoing_waypoint_id):
+                    continue
+                if self.is_missing(waypoint_id, outgoing_waypoint_id):
+                    continue
+                reached.add(outgoing_waypoint_id)
+                waypoint_ids_to_visit.append(outgoing_waypoint_id)
+        return target_waypoint_id in reached
@@ -0,0 +1,62 @@
+import random
+from Navigation.WaypointStatus import WaypointStatus
+from Navigation.EdgeStatus import EdgeStatus
+from Navigation.Graph import Graph
+from ObjectDetection.ObjectDetector import ObjectDetector
+from Simulation.SimulatedMap import SimulatedMap
+
+
+class SimulatedObjectDetector(ObjectDetector):
+    """
+    Object detector which reads the ground truth of a simulated map instead of camera frames.
+    Every detection is correct with the probability given by accuracy.
+    """
+
+    def __init__(self, simulated_map: SimulatedMap, accuracy: float = 1.0, seed: int = 0):
+        self.simulated_map = simulated_map
+        self.accuracy = accuracy
+        self.random = random.Random(seed)
+        # the line the bottom camera is currently looking at, set by the simulator before each angle
+        self.waypoint_id = None
+        self.outgoing_waypoint_id = None
+        # called with every graph created by the start up detection
+        self.on_graph_created = None
+
+    def look_at(self, waypoint_id: str, outgoing_waypoint_id: str):
+        self.waypoint_id = waypoint_id
+        self.outgoing_waypoint_id = outgoing_waypoint_id
+
+    def detect(self):
+        has_cone = self.__observe(self.simulated_map.has_cone(self.outgoing_waypoint_id))
+        is_obstructed = self.__observe(self.simulated_map.is_obstructed(self.waypoint_id, self.outgoing_waypoint_id))
+        waypoint_status = WaypointStatus.POTENTIALLY_BLOCKED if has_cone else WaypointStatus.POTENTIALLY_FREE
+        edge_status = EdgeStatus.POTENTIALLY_OBSTRUCTED if is_obstructed else EdgeStatus.POTENTIALLY_FREE
+        return waypoint_status, edge_status
+
+    def get_confidences(self):
+        return self.accuracy, self.accuracy
+
+    def start_up_process_detect(self):
+        graph = self._get_start_up_graph(self.simulated_map.waypoints_configuration)
+        for waypoint in graph.waypoints:
+            waypoint_id = waypoint.get_id()
+            if waypoint_id == Graph.START_WAYPOINT_ID:
+                continue
+            waypoint.observe_block(self.__observe(self.simulated_map.has_cone(waypoint_id)), self.accuracy)
+            for angle in waypoint.get_angles():
+                outgoing_waypoint_id = angle.get_waypoint().get_id()
+                if outgoing_waypoint_id == Graph.START_WAYPOINT_ID:
+                    continue
+                if self.__observe(self.simulated_map.is_missing(waypoint_id, outgoing_waypoint_id)):
+                    angle.get_edge().set_status(EdgeStatus.POTENTIALLY_MISSING)
+                else:
+                    is_obstructed = self.__observe(self.simulated_map.is_obstructed(waypoint_id, outgoing_waypoint_id))
+                    angle.get_edge().observe_obstruction(is_obstructed, self.accuracy)
+        if self.on_graph_created is not None:
+            self.on_graph_created(graph)
+        return graph
+
+    def __observe(self, truth: bool):
+        if self.accuracy >= 1.0 or self.random.random() < self.accuracy:
+            return truth
+        return not truth
@@ -0,0 +1,34 @@
+from collections import defaultdict
+
+
+class SimulationResult:
+    """
+    Everything recorded during a simulated mission.
+    """
+
+    def __init__(self):
+        self.emitted_commands = []
+        # latencies in seconds of every handled event, grouped by the event name
+        self.event_latencies = defaultdict(list)
+        self.event_count = 0
+        self.planning_time = 0.0
+        self.planning_count = 0
+        self.is_target_reached = False
+        self.final_waypoint_id = None
+        self.error = None
+        # point scan counts and durations of the controller, see NavigationController.get_scan_report
+        self.scan_report = None
+
+    def add_event_latency(self, event_name: str, latency: float):
+        self.event_latencies[event_name].append(latency)
+        self.event_count += 1
+
+    def add_planning_time(self, planning_time: float):
+        self.planning_time += planning_time
+        self.planning_count += 1
+
+    def get_all_event_latencies(self):
+        return [latency for latencies in self.event_latencies.values() for latency in latencies]
+
+    def __str__(self):
+        return f"SimulationResult[Target_Reached:{self.is_target_reached};Events:{self.event_count};Planning_Time:{self.planning_time};Error:{self.error}]"
\ No newline at end of file
@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 from Navigation.WaypointStatus import WaypointStatus
 from Navigation.EdgeStatus import EdgeStatus
 
@@ -6,6 +7,24 @@ class Validator:
     Contains static methods for recurring validation tasks.
     """
 
+    # the car only knows single letter waypoint ids, the longer ids of generated maps are accepted within
+    # generated_waypoint_ids
+    generated_waypoint_ids_allowed = False
+
+    @staticmethod
+    @contextmanager
+    def generated_waypoint_ids():
+        """
+        Accepts the waypoint ids of maps generated for the simulation, an uppercase letter followed by uppercase letters
+        or digits like W12, within the context.
+        """
+        previous_value = Validator.generated_waypoint_ids_allowed
+        Validator.generated_waypoint_ids_allowed = True
+        try:
+            yield
+        finally:
+            Validator.generated_waypoint_ids_allowed = previous_value
+
     @staticmethod
     def validate_waypoint_status(waypoint_status):
         if waypoint_status not in WaypointStatus:
@@ -78,6 +97,10 @@ class Validator:
     def validate_waypoint_id_format(waypoint_id):
         if not isinstance(waypoint_id, str):
             raise ValueError(f"Waypoint ID {waypoint_id} is not a string")
+        if Validator.generated_waypoint_ids_allowed and len(waypoint_id) > 1:
+            if not (waypoint_id[0].isalpha() and waypoint_id.isalnum() and waypoint_id.isupper()):
+                raise ValueError(f"Waypoint ID {waypoint_id} is not a generated waypoint id")
+            return
         if len(waypoint_id) != 1:
             raise ValueError(f"Waypoint ID {waypoint_id} is not of length 1")
         if not waypoint_id.isalpha():
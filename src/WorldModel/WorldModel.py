@@ -0,0 +1,149 @@
+import threading
+from bisect import bisect_right
+from Navigation.Belief import Belief
+from Navigation.Edge import Edge, CONFIRMED_EDGE_STATUSES
+from Navigation.EdgeStatus import EdgeStatus
+from Navigation.Waypoint import Waypoint, CONFIRMED_WAYPOINT_STATUSES
+from Navigation.WaypointStatus import WaypointStatus
+
+
+class WorldModel:
+    """
+    Merges the waypoint and edge observations of many controllers. Used in-process directly, e.g. in tests, or served
+    to other processes by the WorldModelServer.
+    Waypoints are addressed by their id, edges by <waypoint id>_to_<waypoint id>. An update either sets a status or adds
+    evidence, the log-odds and the number of observations a controller fused since its last update. Evidence of all
+    controllers is added up, statuses set directly replace the evidence and confirmed statuses are not replaced by
+    uncertain ones, by the same rule as Edge.is_confirmed and Waypoint.is_confirmed.
+    Updates may carry the id of the client and a sequence number the client increments for every update. An update
+    whose sequence number was already applied for the client is ignored, so evidence resent after a timeout of a request
+    which did arrive is not counted twice.
+    The elements are distributed over stripes which are locked independently, so concurrent clients mostly do not wait
+    for each other. Every stripe counts its own version, a client passes the versions it has seen and gets the states of
+    the elements which changed since.
+    """
+
+    def __init__(self, stripe_count: int = 16):
+        if stripe_count <= 0:
+            raise ValueError(f"Stripe count must be positive, got {stripe_count}")
+        self.stripe_count = stripe_count
+        self.locks = [threading.Lock() for _ in range(stripe_count)]
+        # element id -> (waypoint or edge, version of the last change)
+        self.elements = [{} for _ in range(stripe_count)]
+        self.versions = [0] * stripe_count
+        # versions and element ids of the changes of every stripe in the order of the versions
+        self.change_versions = [[] for _ in range(stripe_count)]
+        self.change_ids = [[] for _ in range(stripe_count)]
+        # client id -> sequence number of the last update applied for the client
+        self.client_sequences = {}
+        self.clients_lock = threading.Lock()
+
+    def get_stripe_count(self):
+        return self.stripe_count
+
+    def update(self, updates, client_id: str = None, sequence: int = None):
+        """
+        Applies the updates, dicts with the id of the element and either a status name or evidence as
+        [log-odds, observation count]. With a client id, the updates are ignored if the sequence number is not higher
+        than the one of the last update of the client.
+        """
+        if client_id is not None:
+            with self.clients_lock:
+                if sequence <= self.client_sequences.get(client_id, 0):
+                    return
+                self.client_sequences[client_id] = sequence
+        updates_by_stripe = {}
+        for update in updates:
+            updates_by_stripe.setdefault(self.__get_stripe(update["id"]), []).append(update)
+        for stripe, stripe_updates in updates_by_stripe.items():
+            with self.locks[stripe]:
+                for update in stripe_updates:
+                    self.__apply(stripe, update)
+
+    def get_changes(self, since=None):
+        """
+        Returns the versions of all stripes and the states of the elements which changed after the given versions, all
+        elements if no versions are given. A state is a dict with the status name and the belief as
+        [log-odds, observation count] or None.
+        """
+        if since is None:
+            since = [0] * self.stripe_count
+        if len(since) != self.stripe_count:
+            raise ValueError(f"Expected {self.stripe_count} stripe versions, got {len(since)}")
+        versions = []
+        changes = {}
+        for stripe in range(self.stripe_count):
+            with self.locks[stripe]:
+                version = self.versions[stripe]
+                versions.append(version)
+                if since[stripe] >= version:
+                    continue
+                elements = self.elements[stripe]
+                first_change = bisect_right(self.change_versions[stripe], since[stripe])
+                for element_id in self.change_ids[stripe][first_change:]:
+                    changes[element_id] = self.get_state(elements[element_id][0])
+        return {"versions": versions, "changes": changes}
+
+    def __get_stripe(self, element_id):
+        return hash(element_id) % self.stripe_count
+
+    def __apply(self, stripe, update):
+        element_id = update["id"]
+        elements = self.elements[stripe]
+        if element_id in elements:
+            element = elements[element_id][0]
+        else:
+            element = Edge() if "_to_" in element_id else Waypoint(element_id)
+        state = self.get_state(element)
+        if "status" in update:
+            self.__set_status(element, update["status"])
+        else:
+            self.__add_evidence(element, *update["evidence"])
+        if element_id in elements and self.get_state(element) == state:
+            return
+        self.versions[stripe] += 1
+        version = self.versions[stripe]
+        elements[element_id] = (element, version)
+        self.change_versions[stripe].append(version)
+        self.change_ids[stripe].append(element_id)
+        # the log only has to contain the last change of every element
+        if len(self.change_ids[stripe]) > 2 * len(elements) + 64:
+            changes = sorted((v, i) for i, (_, v) in elements.items())
+            self.change_versions[stripe] = [v for v, _ in changes]
+            self.change_ids[stripe] = [i for _, i in changes]
+
+    @staticmethod
+    def __set_status(element, status_name):
+        if isinstance(element, Edge):
+            status = EdgeStatus[status_name]
+            # POTENTIALLY_OBSTRUCTED is the same member as OBSTRUCTED, so only FREE replaces a confirmed edge
+            if element.is_confirmed() and status not in CONFIRMED_EDGE_STATUSES:
+                return
+        else:
+            status = WaypointStatus[status_name]
+            if element.is_confirmed() and status not in CONFIRMED_WAYPOINT_STATUSES:
+                return
+        element.set_status(status)
+
+    @staticmethod
+    def __add_evidence(element, log_odds, observation_count):
+        if element.is_confirmed():
+            return
+        belief = element.obstruction_belief if isinstance(element, Edge) else element.block_belief
+        if belief is not None:
+            log_odds += belief.log_odds
+            observation_count += belief.observation_count
+        log_odds = min(max(log_odds, -Belief.MAX_LOG_ODDS), Belief.MAX_LOG_ODDS)
+        belief = Belief.from_log_odds(log_odds, observation_count)
+        if isinstance(element, Edge):
+            element.set_obstruction_belief(belief)
+        else:
+            element.set_block_belief(belief)
+
+    @staticmethod
+    def get_state(element):
+        belief = element.obstruction_belief if isinstance(element, Edge) else element.block_belief
+        return {
+            "status": element.get_status().name,
+            "belief": None if belief is None else [belief.log_odds, belief.observation_count],
+        }
@@ -0,0 +1,74 @@
+import json
+import socket
+import threading
+
+
+class WorldModelClient:
+    """
+    Connects to a WorldModelServer and offers the same methods as the WorldModel, so both can be used by the
+    WorldModelSync. Requests of different threads are sent one after the other over the single connection.
+    The controllers synchronize between the events of the car, so the timeout is short. A request which fails raises an
+    OSError, the connection is opened again by the next request.
+    """
+
+    def __init__(self, address, timeout: float = 0.5):
+        self.address = address
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.socket = None
+        self.file = None
+
+    def update(self, updates, client_id: str = None, sequence: int = None):
+        self.__request({"method": "update", "updates": updates, "client_id": client_id, "sequence": sequence})
+
+    def get_changes(self, since=None):
+        return self.__request({"method": "get_changes", "since": since})
+
+    def get_stripe_count(self):
+        return self.__request({"method": "get_stripe_count"})
+
+    def close(self):
+        with self.lock:
+            self.__disconnect()
+
+    def __connect(self):
+        if isinstance(self.address, tuple):
+            connection = socket.create_connection(self.address, timeout=self.timeout)
+            # requests are small and answered immediately
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(self.timeout)
+            try:
+                connection.connect(str(self.address))
+            except OSError:
+                connection.close()
+                raise
+        self.socket = connection
+        self.file = connection.makefile("rwb")
+
+    def __disconnect(self):
+        if self.socket is not None:
+            self.file.close()
+            self.socket.close()
+            self.socket = None
+            self.file = None
+
+    def __request(self, request):
+        with self.lock:
+            if self.socket is None:
+                self.__connect()
+            try:
+                self.file.write(json.dumps(request, separators=(",", ":")).encode("utf-8") + b"\n")
+                self.file.flush()
+                line = self.file.readline()
+            except OSError:
+                self.__disconnect()
+                raise
+            if not line:
+                self.__disconnect()
+                raise ConnectionError("World model server closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response["result"]
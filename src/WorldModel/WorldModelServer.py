@@ -0,0 +1,83 @@
+import json
+import socketserver
+import threading
+from WorldModel.WorldModel import WorldModel
+from Logger.Logger import Logger
+
+logger = Logger("WorldModelServer")
+
+
+class _WorldModelRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handles the requests of one client, one JSON object per line with the method and its arguments. Every request is
+    answered with a JSON object with the result or the error.
+    """
+
+    def handle(self):
+        world_model = self.server.world_model
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request["method"] == "update":
+                    response = {
+                        "result": world_model.update(request["updates"], request.get("client_id"), request.get("sequence"))
+                    }
+                elif request["method"] == "get_changes":
+                    response = {"result": world_model.get_changes(request.get("since"))}
+                elif request["method"] == "get_stripe_count":
+                    response = {"result": world_model.get_stripe_count()}
+                else:
+                    response = {"error": f"Unknown method {request['method']}"}
+            except (ValueError, KeyError, TypeError) as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response, separators=(",", ":")).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    # dozens of controllers may connect at the same time
+    request_queue_size = 128
+
+
+class _ThreadingUnixStreamServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class WorldModelServer:
+    """
+    Serves a WorldModel to WorldModelClients over TCP, if the address is a (host, port) tuple, or over a local socket,
+    if the address is a path. Every client is handled by its own thread, the world model locks only the stripes a request
+    touches.
+    """
+
+    def __init__(self, address, world_model: WorldModel = None):
+        self.world_model = world_model or WorldModel()
+        if isinstance(address, tuple):
+            self.server = _ThreadingTCPServer(address, _WorldModelRequestHandler)
+        else:
+            self.server = _ThreadingUnixStreamServer(str(address), _WorldModelRequestHandler)
+        self.server.world_model = self.world_model
+        self.thread = None
+
+    def get_address(self):
+        """
+        Returns the address the server listens on, with the actual port if it was started on port 0.
+        """
+        return self.server.server_address
+
+    def serve_in_background(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="world-model-server", daemon=True)
+        self.thread.start()
+        logger.info("world model server started", address=str(self.get_address()))
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread is not None:
+            self.thread.join()
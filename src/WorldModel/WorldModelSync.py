@@ -0,0 +1,116 @@
+import uuid
+from Navigation.Belief import Belief
+from Navigation.Edge import Edge
+from Navigation.EdgeStatus import EdgeStatus
+from Navigation.Graph import Graph
+from Navigation.WaypointStatus import WaypointStatus
+from WorldModel.WorldModel import WorldModel
+
+
+class WorldModelSync:
+    """
+    Shares what the graph of one controller learns through a world model, a WorldModel or a WorldModelClient.
+    synchronize sends what changed locally since the last call and applies the merged changes of all controllers.
+    Statuses which were set directly are sent as statuses, observations as the evidence added since the last call, so
+    the evidence of a controller is counted once even though it gets the merged beliefs back.
+    Every update is sent with the id of this sync and a sequence number. An update which failed, e.g. by a timeout, is
+    sent again unchanged with the same number before anything new, so the world model applies it once even if the
+    failed request did arrive.
+    """
+
+    def __init__(self, graph: Graph, world_model):
+        self.graph = graph
+        self.world_model = world_model
+        # element id -> waypoint or edge of the graph
+        self.elements = {}
+        # states of the elements after the last synchronization, everything else was learned locally since
+        self.known_states = {}
+        self.update_elements()
+        self.versions = None
+        self.client_id = uuid.uuid4().hex
+        self.sequence = 0
+        # (sequence number, updates, states of the updated elements) of the update which was not sent yet, or None
+        self.pending_update = None
+        # graph version after the last synchronization, nothing has to be sent if it did not change
+        self.graph_version = None
+
+    def update_elements(self):
+        """
+        Collects the waypoints and edges of the graph again, e.g. after Graph.update_configuration. Known elements keep
+        their synchronized states, new elements start unknown.
+        """
+        self.elements = {}
+        for waypoint in self.graph.waypoints:
+            self.elements[waypoint.get_id()] = waypoint
+            for angle in waypoint.get_angles():
+                self.elements[f"{waypoint.get_id()}_to_{angle.get_waypoint().get_id()}"] = angle.get_edge()
+        self.known_states = {
+            element_id: self.known_states.get(element_id, {"status": "UNKNOWN", "belief": None})
+            for element_id in self.elements
+        }
+
+    def synchronize(self):
+        """
+        Raises the errors of the world model, e.g. an OSError of a WorldModelClient. Nothing is lost then, the next
+        call sends what was not sent yet and gets the changes which were not applied yet.
+        """
+        if self.pending_update is not None:
+            self.__send_pending_update()
+        if self.graph.version != self.graph_version:
+            updates = self.__get_local_updates()
+            if updates:
+                self.sequence += 1
+                states = {update["id"]: WorldModel.get_state(self.elements[update["id"]]) for update in updates}
+                self.pending_update = (self.sequence, updates, states)
+                self.__send_pending_update()
+        changes = self.world_model.get_changes(self.versions)
+        self.versions = changes["versions"]
+        for element_id, state in changes["changes"].items():
+            element = self.elements.get(element_id)
+            if element is not None and WorldModel.get_state(element) != state:
+                self.__apply(element, state)
+        for element_id in changes["changes"]:
+            if element_id in self.elements:
+                self.known_states[element_id] = WorldModel.get_state(self.elements[element_id])
+        self.graph_version = self.graph.version
+
+    def __send_pending_update(self):
+        sequence, updates, states = self.pending_update
+        self.world_model.update(updates, self.client_id, sequence)
+        # the updates are sent, so they are not sent again if getting the changes fails
+        self.pending_update = None
+        for element_id, state in states.items():
+            if element_id in self.known_states:
+                self.known_states[element_id] = state
+
+    def __get_local_updates(self):
+        updates = []
+        for element_id, element in self.elements.items():
+            state = WorldModel.get_state(element)
+            known_state = self.known_states[element_id]
+            if state == known_state:
+                continue
+            if state["belief"] is None:
+                updates.append({"id": element_id, "status": state["status"]})
+                continue
+            log_odds, observation_count = state["belief"]
+            if known_state["belief"] is not None:
+                # only the observations since the last synchronization are new
+                log_odds -= known_state["belief"][0]
+                observation_count -= known_state["belief"][1]
+            if observation_count > 0:
+                updates.append({"id": element_id, "evidence": [log_odds, observation_count]})
+        return updates
+
+    @staticmethod
+    def __apply(element, state):
+        if isinstance(element, Edge):
+            if state["belief"] is not None:
+                element.set_obstruction_belief(Belief.from_log_odds(*state["belief"]))
+            else:
+                element.set_status(EdgeStatus[state["status"]])
+        else:
+            if state["belief"] is not None:
+                element.set_block_belief(Belief.from_log_odds(*state["belief"]))
+            else:
+                element.set_status(WaypointStatus[state["status"]])
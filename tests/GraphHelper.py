@@ -0,0 +1,16 @@
+from Navigation.Angle import Angle
+from Navigation.Edge import Edge
+from Navigation.EdgeStatus import EdgeStatus
+
+
+def connect(waypoint_a, waypoint_b, value, edge_status=EdgeStatus.UNKNOWN):
+    """
+    Connects the waypoints in both directions, the line from waypoint_b back to waypoint_a has the opposite angle.
+    Both edges get the given status.
+    """
+    edge_ab = Edge()
+    edge_ab.set_status(edge_status)
+    edge_ba = Edge()
+    edge_ba.set_status(edge_status)
+    waypoint_a.set_angles(waypoint_a.get_angles() + [Angle(waypoint_b, value, edge_ab)])
+    waypoint_b.set_angles(waypoint_b.get_angles() + [Angle(waypoint_a, (value + 180.0) % 360, edge_ba)])
@@ -0,0 +1,56 @@
+import os
+import numpy as np
+from Navigation.EdgeStatus import EdgeStatus
+from Navigation.Graph import Graph
+from Navigation.WaypointStatus import WaypointStatus
+from ObjectDetection.ObjectDetector import ObjectDetector
+
+WAYPOINTS_CONFIGURATION = {
+    "X": {"edges": {"A": {"angle": 0}}},
+    "A": {"edges": {"X": {"angle": 180}}},
+}
+# frames with this value in the first pixel make the detector crash the process
+CRASH_VALUE = 255
+
+
+class ObjectDetectorStub(ObjectDetector):
+    """
+    Detects a cone on frames whose first pixel is not 0 and an obstacle on frames with an odd first pixel. The statuses
+    are the ones of the first frame of a detection, the confidences the shares of its frames which agree with them.
+    """
+
+    def __init__(self, top_camera, bottom_camera, frame_count=1):
+        self.top_camera = top_camera
+        self.bottom_camera = bottom_camera
+        self.frame_count = frame_count
+        self.last_confidences = (None, None)
+
+    def detect(self):
+        values = [self.__read_first_pixel(self.bottom_camera) for _ in range(self.frame_count)]
+        has_cone = values[0] > 0
+        is_obstructed = values[0] % 2 == 1
+        self.last_confidences = (
+            sum((v > 0) == has_cone for v in values) / len(values),
+            sum((v % 2 == 1) == is_obstructed for v in values) / len(values),
+        )
+        waypoint_status = WaypointStatus.POTENTIALLY_BLOCKED if has_cone else WaypointStatus.POTENTIALLY_FREE
+        edge_status = EdgeStatus.POTENTIALLY_OBSTRUCTED if is_obstructed else EdgeStatus.POTENTIALLY_FREE
+        return waypoint_status, edge_status
+
+    def get_confidences(self):
+        return self.last_confidences
+
+    def start_up_process_detect(self):
+        graph = Graph(WAYPOINTS_CONFIGURATION)
+        graph._get_waypoint_by_id("A").observe_block(self.__read_first_pixel(self.top_camera) > 0, 0.9)
+        return graph
+
+    @staticmethod
+    def __read_first_pixel(camera):
+        frame = camera.get_image_array()
+        if not isinstance(frame, np.ndarray):
+            raise ValueError(f"Unexpected frame {frame}")
+        value = int(frame.flat[0])
+        if value == CRASH_VALUE:
+            os._exit(1)
+        return value
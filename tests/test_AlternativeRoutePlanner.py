@@ -0,0 +1,69 @@
+import pytest
+from Navigation.AlternativeRoutePlanner import AlternativeRoutePlanner
+from Navigation.PathPlanner import PathPlanner
+from Navigation.Waypoint import Waypoint
+from Navigation.WaypointStatus import WaypointStatus
+from Navigation.EdgeStatus import EdgeStatus
+from GraphHelper import connect
+
+
+def ids(route):
+    return [w.get_id() for w in route]
+
+
+class TestAlternativeRoutePlanner:
+
+    @pytest.fixture
+    def waypoints(self):
+        # A - B - D, A - C - D and A - E - F - D, the edges via C are free
+        waypoints = [Waypoint(waypoint_id, index) for index, waypoint_id in enumerate("ABCDEF")]
+        a, b, c, d, e, f = waypoints
+        connect(a, b, 0.0)
+        connect(b, d, 90.0)
+        connect(a, c, 90.0, EdgeStatus.FREE)
+        connect(c, d, 0.0, EdgeStatus.FREE)
+        connect(a, e, 180.0)
+        connect(e, f, 90.0)
+        connect(f, d, 0.0)
+        return waypoints
+
+    def shortest_route(self, waypoints):
+        planner = PathPlanner(waypoints)
+        planner.calculate(waypoints[0])
+        return [waypoints[0]] + planner.get_path_to(waypoints[3])
+
+    def test_calculate_k_best_routes(self, waypoints):
+        routes = AlternativeRoutePlanner(waypoints, 3).calculate(self.shortest_route(waypoints))
+        assert [ids(route) for route, _ in routes] == [["A", "C", "D"], ["A", "B", "D"], ["A", "E", "F", "D"]]
+        assert [costs[-1] for _, costs in routes] == sorted(costs[-1] for _, costs in routes)
+
+    def test_detour_around_next_waypoint_is_added(self, waypoints):
+        # the second best route is A - C - B - D, which still passes C
+        connect(waypoints[2], waypoints[1], 270.0, EdgeStatus.FREE)
+        waypoints[0].get_edge_to_waypoint("B").set_status(EdgeStatus.MISSING)
+        routes = AlternativeRoutePlanner(waypoints, 2).calculate(self.shortest_route(waypoints))
+        assert [ids(route) for route, _ in routes] == [["A", "C", "D"], ["A", "C", "B", "D"], ["A", "E", "F", "D"]]
+
+    def test_get_cumulative_costs(self, waypoints):
+        route = [waypoints[0], waypoints[2], waypoints[3]]
+        step = EdgeStatus.FREE.value + 10
+        assert AlternativeRoutePlanner.get_cumulative_costs(route) == [0, step, 2 * step]
+        waypoints[2].set_status(WaypointStatus.BLOCKED)
+        assert AlternativeRoutePlanner.get_cumulative_costs(route) is None
+
+    def test_unreachable_route(self, waypoints):
+        route = self.shortest_route(waypoints)
+        waypoints[3].set_status(WaypointStatus.BLOCKED)
+        assert AlternativeRoutePlanner(waypoints, 3).calculate(route) == []
+
+    def test_calculate_on_snapshot(self, waypoints):
+        route = self.shortest_route(waypoints)
+        planner = AlternativeRoutePlanner(waypoints, 3)
+        snapshot = planner.take_snapshot()
+        # changed while the routes are calculated on a background thread
+        waypoints[1].set_status(WaypointStatus.BLOCKED)
+        for waypoint in waypoints:
+            waypoint.invalidate_possible_angles()
+        routes = planner.calculate(route, snapshot)
+        assert [ids(route) for route, _ in routes] == [["A", "C", "D"], ["A", "B", "D"], ["A", "E", "F", "D"]]
+        assert all(waypoint.possible_angles is None for waypoint in waypoints)
@@ -0,0 +1,42 @@
+import pytest
+from Navigation.Belief import Belief
+
+
+def test_initial_probability():
+    assert Belief().get_probability() == pytest.approx(0.5)
+
+
+def test_observe_present():
+    belief = Belief()
+    belief.observe(True, 0.9)
+    assert belief.get_probability() == pytest.approx(0.9)
+    assert belief.get_observation_count() == 1
+
+
+def test_observations_are_fused():
+    belief = Belief()
+    belief.observe(True, 0.9)
+    belief.observe(True, 0.9)
+    assert belief.get_probability() == pytest.approx(0.81 / 0.82)
+
+
+def test_contradicting_observations_cancel_out():
+    belief = Belief()
+    belief.observe(True, 0.7)
+    belief.observe(False, 0.7)
+    assert belief.get_probability() == pytest.approx(0.5)
+
+
+def test_default_confidence():
+    belief = Belief()
+    belief.observe(False)
+    assert belief.get_probability() == pytest.approx(1 - Belief.DEFAULT_CONFIDENCE)
+
+
+def test_confidence_is_clamped():
+    belief = Belief()
+    belief.observe(True, 0.1)
+    assert belief.get_probability() == pytest.approx(Belief.MIN_CONFIDENCE)
+    belief = Belief()
+    belief.observe(True, 1.0)
+    assert belief.get_probability() == pytest.approx(Belief.MAX_CONFIDENCE)
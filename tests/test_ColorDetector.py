@@ -3,6 +3,10 @@ from unittest.mock import Mock
 from ObjectDetection.ColorDetector import ColorDetector
 from Navigation.WaypointStatus import WaypointStatus
 from Navigation.EdgeStatus import EdgeStatus
+from Navigation.Graph import Graph
+from Configuration.Configurator import Configurator
+from pathlib import Path
+import copy
 
 @pytest.fixture
 def mock_camera():
@@ -51,4 +55,29 @@ def test_detect_blocked_and_obstructed(color_detector, mock_camera):
     ]
     waypoint_status, edge_status = color_detector.detect()
     assert waypoint_status == WaypointStatus.POTENTIALLY_BLOCKED
-    assert edge_status == EdgeStatus.POTENTIALLY_OBSTRUCTED
\ No newline at end of file
+    assert edge_status == EdgeStatus.POTENTIALLY_OBSTRUCTED
+def test_start_up_process_detect_reuses_graph(color_detector):
+    Configurator.initialize(str(Path(__file__).resolve().parent / "mock_config.json"))
+    graph = color_detector.start_up_process_detect()
+    graph.set_target_waypoint("A")
+    graph.target_waypoint.set_status(WaypointStatus.BLOCKED)
+    waypoints = list(graph.waypoints)
+    reused_graph = color_detector.start_up_process_detect()
+    assert reused_graph is graph
+    assert reused_graph.waypoints == waypoints
+    assert reused_graph.get_current_waypoint().get_id() == Graph.START_WAYPOINT_ID
+    assert reused_graph.target_waypoint is None
+    assert all(waypoint.get_status() == Graph().waypoints[waypoint.get_index()].get_status() for waypoint in waypoints)
+
+def test_start_up_process_detect_after_configuration_change(color_detector):
+    Configurator.initialize(str(Path(__file__).resolve().parent / "mock_config.json"))
+    graph = color_detector.start_up_process_detect()
+    original_configuration = Configurator().configuration
+    configuration = copy.deepcopy(original_configuration)
+    Configurator.set_configuration(configuration)
+    try:
+        new_graph = color_detector.start_up_process_detect()
+    finally:
+        Configurator.set_configuration(original_configuration)
+    assert new_graph is not graph
+    assert new_graph.waypoints_configuration is configuration["waypoints"]
@@ -0,0 +1,108 @@
+import json
+from pathlib import Path
+import pytest
+from Configuration.Configurator import Configurator
+from Configuration.ConfigurationWatcher import ConfigurationWatcher
+
+mock_config_path = Path(__file__).resolve().parent / "mock_config.json"
+
+
+@pytest.fixture
+def configuration_path(tmp_path):
+    Configurator.initialize(str(mock_config_path))
+    path = tmp_path / "config.json"
+    path.write_text(mock_config_path.read_text())
+    Configurator.reload(str(path))
+    yield path
+    # the Configurator is shared by all tests
+    Configurator.reload(str(mock_config_path))
+
+
+def write_configuration(path, change):
+    configuration = json.loads(path.read_text())
+    change(configuration)
+    path.write_text(json.dumps(configuration))
+
+
+def test_reload(configuration_path):
+    def change(configuration):
+        configuration["tolerances"]["waypoint"] = 150
+        configuration["waypoints"]["H"]["x"] = 230
+        configuration["waypoints"]["S"]["edges"]["G"]["angle"] = 35.0
+        configuration["waypoints"]["G"]["edges"]["C"]["obstacle_coords"]["x"] += 10
+        del configuration["waypoints"]["B"]["edges"]["A"]
+
+    write_configuration(configuration_path, change)
+    diff = Configurator.reload()
+    assert Configurator().get_tolerances()["waypoint"] == 150
+    assert diff.changed_tolerances == {"waypoint": (200, 150)}
+    assert diff.changed_communication == {}
+    assert diff.moved_waypoint_ids == ["H"]
+    assert diff.changed_edges == [("S", "G")]
+    assert diff.changed_matcher_edges == [("G", "C")]
+    assert diff.removed_edges == [("B", "A")]
+    assert diff.added_waypoint_ids == [] and diff.removed_waypoint_ids == [] and diff.added_edges == []
+    assert diff.has_graph_changes()
+
+
+def test_reload_keeps_the_configuration_if_invalid(configuration_path):
+    configuration = Configurator().configuration
+    configuration_path.write_text("{")
+    with pytest.raises(ValueError):
+        Configurator.reload()
+    configuration_path.write_text(mock_config_path.read_text())
+    write_configuration(configuration_path, lambda c: c["waypoints"]["S"]["edges"].update(Z=c["waypoints"]["S"]["edges"]["G"]))
+    with pytest.raises(ValueError, match="unknown waypoint"):
+        Configurator.reload()
+    assert Configurator().configuration is configuration
+
+
+def test_watcher_notifies_changes(configuration_path):
+    diffs = []
+    watcher = ConfigurationWatcher(diffs.append, configuration_path)
+    assert watcher.check() is None
+    write_configuration(configuration_path, lambda c: c["tolerances"].update(obstacle=180))
+    diff = watcher.check()
+    assert diffs == [diff] and diff.changed_tolerances == {"obstacle": (200, 180)}
+    assert watcher.check() is None
+    # an unchanged configuration is not passed to the listener
+    configuration_path.write_text(configuration_path.read_text() + "\n")
+    assert watcher.check().is_empty()
+    assert len(diffs) == 1
+
+
+def test_watcher_keeps_the_configuration_if_invalid(configuration_path):
+    diffs = []
+    watcher = ConfigurationWatcher(diffs.append, configuration_path)
+    configuration_path.write_text("{")
+    assert watcher.check() is None
+    assert watcher.error_count == 1 and diffs == []
+    assert Configurator().get_tolerances()["waypoint"] == 200
+
+
+def test_watcher_does_not_replace_the_configuration(configuration_path):
+    configuration = Configurator().configuration
+    watcher = ConfigurationWatcher(lambda diff: None, configuration_path)
+    write_configuration(configuration_path, lambda c: c["tolerances"].update(obstacle=180))
+    first_diff = watcher.check()
+    write_configuration(configuration_path, lambda c: c["tolerances"].update(obstacle=170))
+    second_diff = watcher.check()
+    # the handler which applies the changes publishes them
+    assert Configurator().configuration is configuration
+    assert first_diff.old_configuration is configuration
+    assert second_diff.old_configuration is first_diff.new_configuration
+    assert second_diff.changed_tolerances == {"obstacle": (180, 170)}
+    Configurator.set_configuration(second_diff.new_configuration)
+    assert Configurator().get_tolerances()["obstacle"] == 170
+
+
+def test_watcher_logs_unexpected_errors(configuration_path, monkeypatch):
+    watcher = ConfigurationWatcher(lambda diff: None, configuration_path)
+
+    def read(configuration_path=None):
+        raise RuntimeError("file system gone")
+
+    monkeypatch.setattr(Configurator, "read", read)
+    write_configuration(configuration_path, lambda c: c["tolerances"].update(obstacle=180))
+    assert watcher.check() is None
+    assert watcher.error_count == 1
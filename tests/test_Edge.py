@@ -55,3 +55,72 @@ def test_get_weight_large_length():
     edge.status = EdgeStatus.FREE
     edge.length = 1000
     assert edge.get_weight() == 10100
+
+def test_traversable_flag():
+    edge = Edge()
+    assert edge.is_traversable() is True
+    edge.set_status(EdgeStatus.MISSING)
+    assert edge.is_traversable() is False
+    edge.status = EdgeStatus.OBSTRUCTED
+    assert edge.is_traversable() is True
+
+def test_uncertain_block_is_traversable_with_violation():
+    edge = Edge()
+    edge.set_status(EdgeStatus.POTENTIALLY_MISSING)
+    assert edge.is_traversable() is True
+    assert edge.get_violation() == 1
+    edge.set_status(EdgeStatus.POTENTIALLY_FREE)
+    assert edge.get_violation() == 0
+
+def test_observe_obstruction():
+    edge = Edge()
+    edge.observe_obstruction(True, 0.9)
+    assert edge.get_status() == EdgeStatus.POTENTIALLY_OBSTRUCTED
+    assert edge.get_obstruction_probability() == pytest.approx(0.9)
+    edge.observe_obstruction(False, 0.9)
+    edge.observe_obstruction(False, 0.9)
+    assert edge.get_status() == EdgeStatus.POTENTIALLY_FREE
+    assert edge.get_obstruction_probability() == pytest.approx(0.1)
+
+def test_observe_obstruction_expected_weight():
+    edge = Edge()
+    edge.observe_obstruction(False, 0.9)
+    expected_cost = 0.1 * EdgeStatus.POTENTIALLY_OBSTRUCTED.value + 0.9 * EdgeStatus.POTENTIALLY_FREE.value
+    assert edge.get_weight() == round(expected_cost) + 10
+
+def test_observe_obstruction_keeps_confirmed_status():
+    edge = Edge()
+    edge.set_status(EdgeStatus.OBSTRUCTED)
+    edge.observe_obstruction(False, 0.9)
+    assert edge.get_status() == EdgeStatus.OBSTRUCTED
+    assert edge.get_obstruction_probability() is None
+
+def test_set_status_replaces_observations():
+    edge = Edge()
+    edge.observe_obstruction(False, 0.9)
+    edge.set_status(EdgeStatus.POTENTIALLY_FREE)
+    assert edge.get_obstruction_probability() is None
+    assert edge.get_weight() == EdgeStatus.POTENTIALLY_FREE.value + 10
+
+def test_is_confirmed():
+    edge = Edge()
+    assert edge.is_confirmed() is False
+    edge.observe_obstruction(True, 0.9)
+    # obstructed by observations only
+    assert edge.get_status() == EdgeStatus.OBSTRUCTED
+    assert edge.is_confirmed() is False
+    edge.set_status(EdgeStatus.OBSTRUCTED)
+    assert edge.is_confirmed() is True
+    edge.set_status(EdgeStatus.MISSING)
+    assert edge.is_confirmed() is False
+    edge.set_status(EdgeStatus.FREE)
+    assert edge.is_confirmed() is True
+
+def test_observe_obstruction_of_missing_edge():
+    edge = Edge()
+    edge.set_status(EdgeStatus.MISSING)
+    assert edge.is_traversable() is False
+    # the line was not seen during an earlier scan, now it is
+    edge.observe_obstruction(False, 0.9)
+    assert edge.get_status() == EdgeStatus.POTENTIALLY_FREE
+    assert edge.is_traversable() is True
@@ -0,0 +1,175 @@
+import sys
+import threading
+import pytest
+from Communication.EventQueue import EventQueue
+
+
+class ControllerStub:
+    def __init__(self):
+        self.events = []
+        self.handled = threading.Event()
+
+    def on_angle(self, angle_value):
+        self.events.append(("angle", angle_value))
+
+    def on_waypoint(self):
+        self.events.append(("waypoint",))
+
+    def on_line_missing(self):
+        raise ValueError("no shortest path")
+
+    def on_point_scanning_finished(self):
+        self.events.append(("point_scanning_finished",))
+        self.handled.set()
+
+    def on_stop(self):
+        self.events.append(("stop",))
+
+
+def get_all(event_queue):
+    events = []
+    while len(event_queue):
+        events.append(event_queue.get())
+    return events
+
+
+def test_events_are_handled_in_order():
+    event_queue = EventQueue()
+    event_queue.put("waypoint")
+    event_queue.put("angle", 30.0)
+    event_queue.put("angle", 30.0)
+    event_queue.put("cone_detected")
+    event_queue.put("set_target", "A")
+    event_queue.put("set_target", "B")
+    assert get_all(event_queue) == [
+        ("waypoint", ()),
+        ("angle", (30.0,)),
+        ("angle", (30.0,)),
+        ("cone_detected", ()),
+        ("set_target", ("A",)),
+        ("set_target", ("B",)),
+    ]
+
+
+def test_coalescing():
+    event_queue = EventQueue()
+    assert event_queue.put("pong")
+    assert not event_queue.put("pong")
+    event_queue.put("waypoint")
+    assert get_all(event_queue) == [("pong", ()), ("waypoint", ())]
+    # handled events are not coalesced anymore
+    assert event_queue.put("pong")
+    metrics = event_queue.get_metrics()
+    assert metrics["coalesced"] == 1
+    assert metrics["max_depth"] == 2
+
+
+def test_stop_discards_queued_events():
+    event_queue = EventQueue()
+    event_queue.put("waypoint")
+    event_queue.put("cone_detected")
+    event_queue.put("stop")
+    assert not event_queue.put("angle", 30.0)
+    assert get_all(event_queue) == [("stop", ())]
+    assert event_queue.get_metrics()["discarded"] == 3
+
+
+def test_full_queue_waits():
+    event_queue = EventQueue(max_size=2)
+    event_queue.put("angle", 30.0)
+    event_queue.put("angle", 90.0)
+    receiver = threading.Thread(target=event_queue.put, args=("waypoint",))
+    receiver.start()
+    receiver.join(0.05)
+    # the receiver waits for room instead of dropping the event
+    assert receiver.is_alive()
+    assert event_queue.get() == ("angle", (30.0,))
+    receiver.join(5)
+    assert get_all(event_queue) == [("angle", (90.0,)), ("waypoint", ())]
+    assert event_queue.get_metrics()["waited"] == 1
+
+
+def test_stop_while_full():
+    event_queue = EventQueue(max_size=1)
+    event_queue.put("angle", 30.0)
+    results = []
+    receiver = threading.Thread(target=lambda: results.append(event_queue.put("waypoint")))
+    receiver.start()
+    receiver.join(0.05)
+    assert event_queue.put("stop")
+    receiver.join(5)
+    assert results == [False]
+    assert get_all(event_queue) == [("stop", ())]
+
+
+def test_invalid_max_size():
+    with pytest.raises(ValueError):
+        EventQueue(max_size=0)
+
+
+def test_handle_next():
+    event_queue = EventQueue()
+    controller = ControllerStub()
+    event_queue.put("line_missing")
+    event_queue.put("angle", 30.0)
+    assert event_queue.handle_next(controller)
+    assert event_queue.handle_next(controller)
+    assert not event_queue.handle_next(controller, timeout=0.01)
+    assert controller.events == [("angle", 30.0)]
+    metrics = event_queue.get_metrics()
+    assert metrics["handled"] == 2 and metrics["depth"] == 0
+    assert metrics["wait_time"]["count"] == 2
+
+
+def test_background_dispatch():
+    # large enough for the whole burst
+    event_queue = EventQueue(max_size=512)
+    controller = ControllerStub()
+    event_queue.start(controller)
+
+    def receive(values):
+        for value in values:
+            event_queue.put("angle", value)
+
+    receivers = [threading.Thread(target=receive, args=([float(v) for v in range(i, 360, 4)],)) for i in range(4)]
+    for receiver in receivers:
+        receiver.start()
+    for receiver in receivers:
+        receiver.join()
+    event_queue.put("point_scanning_finished")
+    assert controller.handled.wait(5)
+    event_queue.close()
+    assert sorted(v for _, v in controller.events[:-1]) == [float(v) for v in range(360)]
+    assert event_queue.get_metrics()["handled"] == 361
+
+
+def test_stop_ends_dispatching():
+    event_queue = EventQueue()
+    controller = ControllerStub()
+    event_queue.start(controller)
+    event_queue.put("waypoint")
+    event_queue.put("stop")
+    assert event_queue.join(5)
+    assert event_queue.is_closed
+    assert controller.events[-1] == ("stop",)
+    assert not event_queue.put("waypoint")
+
+
+def test_run_returns_after_stop():
+    event_queue = EventQueue()
+    controller = ControllerStub()
+    event_queue.put("angle", 30.0)
+    event_queue.put("stop")
+    event_queue.run(controller)
+    assert controller.events == [("stop",)]
+
+
+def test_exit_of_the_stop_handler_after_closing():
+    event_queue = EventQueue()
+    controller = ControllerStub()
+    controller.on_stop = sys.exit
+    event_queue.put("stop")
+    with pytest.raises(SystemExit):
+        event_queue.run(controller)
+    assert event_queue.is_closed
+    assert event_queue.get_metrics()["handled"] == 1
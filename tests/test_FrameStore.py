@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from ObjectDetection.FrameStore import FrameStore
+from ObjectDetection.FrameStoreCamera import FrameStoreCamera
+
+
+def frame(height, width, value):
+    return np.full((height, width, 3), value, dtype=np.uint8)
+
+
+@pytest.fixture
+def frame_store(tmp_path):
+    return FrameStore.create(tmp_path / "store", [("a", frame(4, 6, 1)), ("b", frame(3, 5, 2))])
+
+
+def test_frames_are_stored(frame_store):
+    assert frame_store.get_names() == ["a", "b"]
+    assert len(frame_store) == 2
+    assert np.array_equal(frame_store.get_frame("a"), frame(4, 6, 1))
+    assert np.array_equal(frame_store.get_frame("b"), frame(3, 5, 2))
+
+
+def test_frames_are_views_of_the_memory_map(frame_store):
+    first = frame_store.get_frame("b")
+    second = frame_store.get_frame("b")
+    assert np.shares_memory(first, second)
+    assert not first.flags.writeable
+
+
+def test_frames_are_aligned(frame_store):
+    offset, _ = frame_store.index["b"]
+    assert offset % FrameStore.ALIGNMENT == 0
+
+
+def test_reopen(frame_store, tmp_path):
+    reopened = FrameStore(tmp_path / "store")
+    assert "b" in reopened
+    assert np.array_equal(reopened.get_frame("b"), frame(3, 5, 2))
+
+
+def test_empty_store(tmp_path):
+    assert len(FrameStore.create(tmp_path / "empty", [])) == 0
+
+
+def test_invalid_frames(tmp_path):
+    with pytest.raises(ValueError):
+        FrameStore.create(tmp_path / "store", [("a", frame(1, 1, 0)), ("a", frame(1, 1, 0))])
+    with pytest.raises(ValueError):
+        FrameStore.create(tmp_path / "store", [("a", np.zeros((1, 1), dtype=np.float32))])
+    with pytest.raises(KeyError):
+        FrameStore.create(tmp_path / "store", []).get_frame("a")
+
+
+def test_camera_replays_frames(frame_store):
+    camera = FrameStoreCamera(frame_store, ["b", "a"])
+    assert (camera.get_width(), camera.get_height()) == (5, 3)
+    assert camera.get_image_array()[0, 0, 0] == 2
+    assert camera.get_image_array()[0, 0, 0] == 1
+    assert camera.get_image_array()[0, 0, 0] == 2
+
+
+def test_camera_size_of_the_returned_frame(frame_store):
+    camera = FrameStoreCamera(frame_store, ["b", "a"])
+    image = camera.get_image_array()
+    assert (camera.get_width(), camera.get_height()) == (image.shape[1], image.shape[0]) == (5, 3)
+    image = camera.get_image_array()
+    assert (camera.get_width(), camera.get_height()) == (image.shape[1], image.shape[0]) == (6, 4)
+
+
+def test_camera_with_unknown_frame(frame_store):
+    with pytest.raises(ValueError):
+        FrameStoreCamera(frame_store, ["c"])
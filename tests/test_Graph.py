@@ -4,10 +4,12 @@ from Navigation.Graph import Graph
 from Navigation.Waypoint import Waypoint
 from Navigation.WaypointStatus import WaypointStatus
 from Navigation.EdgeStatus import EdgeStatus
+from Configuration.ConfigurationDiff import ConfigurationDiff
 from Configuration.Configurator import Configurator
 from Exceptions.NoPathLeftError import NoPathLeftError
 from pathlib import Path
 import json
+import threading
 
 
 class TestGraph:
@@ -24,7 +26,8 @@ class TestGraph:
     def test_initialize_waypoints(self, graph):
         assert len(graph.waypoints) == 9
         assert graph.current_waypoint.get_id() == "X"
-        assert graph.current_waypoint.get_dijkstra_visited() is True
+        assert graph.current_waypoint.get_index() == 0
+        assert [w.get_index() for w in graph.waypoints] == list(range(9))
         assert graph.current_waypoint.get_status() == WaypointStatus.FREE
 
     def test_set_target_waypoint(self, graph):
@@ -126,16 +129,17 @@ class TestGraph:
             == EdgeStatus.OBSTRUCTED
         )
 
-    def test_reset_object_detection_data_waypoints(self, graph):
+    def test_uncertain_blocks_are_kept_waypoints(self, graph):
         graph.set_target_waypoint("A")
         graph._get_waypoint_by_id("H").set_status(WaypointStatus.POTENTIALLY_BLOCKED)
         graph._get_waypoint_by_id("G").set_status(WaypointStatus.POTENTIALLY_BLOCKED)
         graph._get_waypoint_by_id("F").set_status(WaypointStatus.POTENTIALLY_BLOCKED)
 
         graph.go_to_next_best_waypoint()
-        assert graph._get_waypoint_by_id("H").get_status() == WaypointStatus.UNKNOWN
-        assert graph._get_waypoint_by_id("G").get_status() == WaypointStatus.UNKNOWN
-        assert graph._get_waypoint_by_id("F").get_status() == WaypointStatus.UNKNOWN
+        assert graph._get_waypoint_by_id("H").get_status() == WaypointStatus.POTENTIALLY_BLOCKED
+        assert graph._get_waypoint_by_id("G").get_status() == WaypointStatus.POTENTIALLY_BLOCKED
+        assert graph._get_waypoint_by_id("F").get_status() == WaypointStatus.POTENTIALLY_BLOCKED
+        assert graph.planner.get_violations_to(graph.target_waypoint) == 1
 
     def test_no_paths_left_waypoints(self, graph):
         graph.set_target_waypoint("A")
@@ -146,7 +150,7 @@ class TestGraph:
         with pytest.raises(NoPathLeftError):
             graph.go_to_next_best_waypoint()
 
-    def test_reset_object_detection_data_edges(self, graph):
+    def test_uncertain_blocks_are_kept_edges(self, graph):
         graph.set_target_waypoint("A")
         edge1 = graph._get_waypoint_by_id("S").get_edge_to_waypoint("H")
         edge2 = graph._get_waypoint_by_id("S").get_edge_to_waypoint("G")
@@ -155,9 +159,10 @@ class TestGraph:
         edge2.set_status(EdgeStatus.POTENTIALLY_MISSING)
         edge3.set_status(EdgeStatus.POTENTIALLY_MISSING)
         graph.go_to_next_best_waypoint()
-        assert edge1.get_status() == EdgeStatus.UNKNOWN
-        assert edge2.get_status() == EdgeStatus.UNKNOWN
-        assert edge3.get_status() == EdgeStatus.UNKNOWN
+        assert edge1.get_status() == EdgeStatus.POTENTIALLY_MISSING
+        assert edge2.get_status() == EdgeStatus.POTENTIALLY_MISSING
+        assert edge3.get_status() == EdgeStatus.POTENTIALLY_MISSING
+        assert graph.planner.get_violations_to(graph.target_waypoint) == 1
 
     def test_no_paths_left_edges(self, graph):
         graph.set_target_waypoint("A")
@@ -170,7 +175,7 @@ class TestGraph:
         with pytest.raises(NoPathLeftError):
             graph.go_to_next_best_waypoint()
 
-    def test_reset_object_detection_data_mixed(self, graph):
+    def test_uncertain_blocks_are_kept_mixed(self, graph):
         graph.set_target_waypoint("A")
         edge1 = graph._get_waypoint_by_id("S").get_edge_to_waypoint("H")
         edge2 = graph._get_waypoint_by_id("S").get_edge_to_waypoint("G")
@@ -178,9 +183,18 @@ class TestGraph:
         edge2.set_status(EdgeStatus.POTENTIALLY_MISSING)
         graph._get_waypoint_by_id("F").set_status(WaypointStatus.POTENTIALLY_BLOCKED)
         graph.go_to_next_best_waypoint()
-        assert edge1.get_status() == EdgeStatus.UNKNOWN
-        assert edge2.get_status() == EdgeStatus.UNKNOWN
-        assert graph._get_waypoint_by_id("F").get_status() == WaypointStatus.UNKNOWN
+        assert edge1.get_status() == EdgeStatus.POTENTIALLY_MISSING
+        assert edge2.get_status() == EdgeStatus.POTENTIALLY_MISSING
+        assert graph._get_waypoint_by_id("F").get_status() == WaypointStatus.POTENTIALLY_BLOCKED
+        assert graph.planner.get_violations_to(graph.target_waypoint) == 1
+
+    def test_no_path_left_is_found_with_one_search(self, graph):
+        graph.set_target_waypoint("A")
+        graph._get_waypoint_by_id("S").set_status(WaypointStatus.BLOCKED)
+        with patch.object(graph.planner, "calculate", wraps=graph.planner.calculate) as calculate:
+            with pytest.raises(NoPathLeftError):
+                graph.go_to_next_best_waypoint()
+            assert calculate.call_count == 1
 
     def test_no_paths_left_mixed(self, graph):
         graph.set_target_waypoint("A")
@@ -192,4 +206,226 @@ class TestGraph:
         with pytest.raises(NoPathLeftError):
             graph.go_to_next_best_waypoint()
 
-    
\ No newline at end of file
+    def test_set_mission(self, graph):
+        graph.set_mission(["B", "H"])
+        assert graph.target_waypoint.get_id() == "H"
+        assert [w.get_id() for w in graph.get_mission_target_waypoints()] == ["H", "B"]
+
+    def test_set_mission_invalid(self, graph):
+        with pytest.raises(ValueError):
+            graph.set_mission(["A", "Z"])
+        with pytest.raises(ValueError):
+            graph.set_mission([])
+
+    def test_set_mission_on_current_waypoint(self, graph):
+        graph.set_target_waypoint("A")
+        graph.go_to_next_best_waypoint()
+        current_waypoint_id = graph.current_waypoint.get_id()
+        graph.set_mission([current_waypoint_id, "B"])
+        assert [w.get_id() for w in graph.get_mission_target_waypoints()] == ["B"]
+        graph.set_mission([current_waypoint_id])
+        assert graph.has_reached_target_waypoint()
+        assert graph.advance_mission() is False
+
+    def test_advance_mission(self, graph):
+        graph.set_mission(["B", "H"])
+        while not graph.has_reached_target_waypoint():
+            graph.go_to_next_best_waypoint()
+        assert graph.advance_mission() is True
+        assert graph.target_waypoint.get_id() == "B"
+        while not graph.has_reached_target_waypoint():
+            graph.go_to_next_best_waypoint()
+        assert graph.advance_mission() is False
+
+    def test_get_next_best_waypoint_reuses_plan(self, graph):
+        graph.set_target_waypoint("A")
+        with patch.object(graph.planner, "calculate", wraps=graph.planner.calculate) as calculate:
+            first = graph.get_next_best_waypoint()
+            assert graph.get_next_best_waypoint() == first
+            assert calculate.call_count == 1
+
+    def test_get_next_best_waypoint_replans_after_change(self, graph):
+        graph.set_target_waypoint("A")
+        with patch.object(graph.planner, "calculate", wraps=graph.planner.calculate) as calculate:
+            graph.go_to_next_best_waypoint()
+            graph.get_next_best_waypoint()
+            assert calculate.call_count == 2
+            version = graph.version
+            graph.update_waypoint_status(WaypointStatus.FREE)
+            assert graph.version == version + 1
+            graph.get_next_best_waypoint()
+            assert calculate.call_count == 3
+            graph.set_target_waypoint("B")
+            graph.get_next_best_waypoint()
+            assert calculate.call_count == 4
+
+    def test_unchanged_status_keeps_version(self, graph):
+        version = graph.version
+        graph.update_waypoint_status(WaypointStatus.FREE)
+        graph.current_waypoint.get_angles()[0].get_edge().set_status(EdgeStatus.UNKNOWN)
+        assert graph.version == version
+
+    def test_switch_to_alternative_route_after_block(self, graph):
+        graph.set_target_waypoint("A")
+        graph.go_to_next_best_waypoint()
+        next_waypoint = graph.get_next_best_waypoint()
+        # the car drives to the next waypoint while the alternatives are calculated
+        graph.wait_for_alternative_routes()
+        next_waypoint.set_status(WaypointStatus.BLOCKED)
+        with patch.object(graph.planner, "calculate", wraps=graph.planner.calculate) as calculate:
+            alternative_waypoint = graph.get_next_best_waypoint()
+            assert calculate.call_count == 0
+        assert alternative_waypoint != next_waypoint
+        assert graph.get_shortest_path_to_target()[-1].get_id() == "A"
+        assert next_waypoint not in graph.get_shortest_path_to_target()
+
+    def test_new_search_while_calculating_alternative_routes(self, graph):
+        calculate = graph.alternative_route_planner.calculate
+        released = threading.Event()
+
+        def slow_calculate(route):
+            released.wait()
+            return calculate(route)
+
+        graph.alternative_route_planner.calculate = slow_calculate
+        try:
+            graph.set_target_waypoint("A")
+            graph.go_to_next_best_waypoint()
+            next_waypoint = graph.get_next_best_waypoint()
+            next_waypoint.set_status(WaypointStatus.BLOCKED)
+            # the handler does not wait for the alternatives
+            with patch.object(graph.planner, "calculate", wraps=graph.planner.calculate) as planner_calculate:
+                alternative_waypoint = graph.get_next_best_waypoint()
+                assert planner_calculate.call_count == 1
+            assert alternative_waypoint != next_waypoint
+        finally:
+            released.set()
+            graph.wait_for_alternative_routes()
+
+    def test_graphs_share_the_template(self, graph):
+        other_graph = Graph()
+        assert other_graph.template is graph.template
+        assert other_graph.waypoints[1] is not graph.waypoints[1]
+        assert [a.get_value() for a in other_graph.waypoints[1].get_angles()] == [
+            a.get_value() for a in graph.waypoints[1].get_angles()
+        ]
+
+    def test_reset(self, graph):
+        graph.set_target_waypoint("A")
+        first_waypoint_id = graph.go_to_next_best_waypoint()
+        next_waypoint = graph.get_next_best_waypoint()
+        next_waypoint.observe_block(True, 0.9)
+        graph.update_previous_edge_status(EdgeStatus.FREE)
+        version = graph.version
+        graph.reset()
+        assert graph.version > version
+        assert graph.current_waypoint.get_id() == "X"
+        assert graph.current_waypoint.get_status() == WaypointStatus.FREE
+        assert graph.target_waypoint is None and graph.get_shortest_path_to_target() == []
+        assert next_waypoint.get_status() == WaypointStatus.UNKNOWN and next_waypoint.get_block_probability() is None
+        assert all(a.get_edge().get_status() == EdgeStatus.UNKNOWN for w in graph.waypoints for a in w.get_angles())
+        graph.set_target_waypoint("A")
+        assert graph.go_to_next_best_waypoint() == first_waypoint_id
+
+    def test_get_confirmed_angle(self, graph):
+        graph.set_target_waypoint("A")
+        graph.go_to_next_best_waypoint()
+        graph.update_waypoint_status(WaypointStatus.FREE)
+        # the car arrived from X, which is free, but the edge back to X is not confirmed yet
+        back_value = graph.current_waypoint.get_value_from_angle_to_waypoint("X")
+        assert graph.get_confirmed_angle(back_value) is None
+        graph.current_waypoint.get_edge_to_waypoint("X").set_status(EdgeStatus.FREE)
+        assert graph.get_confirmed_angle(back_value).get_waypoint().get_id() == "X"
+
+    def test_missing_line_seen_again(self, graph):
+        graph.set_target_waypoint("A")
+        graph.go_to_next_best_waypoint()
+        graph.update_waypoint_status(WaypointStatus.FREE)
+        # the line from S to G was not seen during the first scan
+        graph.current_waypoint.get_edge_to_waypoint("G").set_status(EdgeStatus.UNKNOWN)
+        graph.update_missing_angles()
+        assert graph.current_waypoint.get_edge_to_waypoint("G").get_status() == EdgeStatus.MISSING
+        value = graph.current_waypoint.get_value_from_angle_to_waypoint("G")
+        graph._get_waypoint_by_id("G").set_status(WaypointStatus.FREE)
+        assert graph.get_confirmed_angle(value) is None
+        graph.update_waypoint_from_angle(value, WaypointStatus.POTENTIALLY_FREE, EdgeStatus.POTENTIALLY_FREE, 0.9, 0.9)
+        assert graph.current_waypoint.get_edge_to_waypoint("G").get_status() == EdgeStatus.POTENTIALLY_FREE
+        assert graph.current_waypoint.get_edge_to_waypoint("G").is_traversable()
+
+    def test_update_configuration(self, graph):
+        waypoints_configuration = json.loads(json.dumps(Configurator().get_waypoints()))
+        graph._get_waypoint_by_id("G").set_status(WaypointStatus.BLOCKED)
+        edge = graph._get_waypoint_by_id("S").get_edge_to_waypoint("G")
+        edge.set_status(EdgeStatus.FREE)
+        waypoints_configuration["S"]["edges"]["G"]["angle"] = 35.0
+        del waypoints_configuration["C"]
+        for waypoint_data in waypoints_configuration.values():
+            waypoint_data["edges"].pop("C", None)
+        edge_data = {"angle": 60.0, "obstacle_coords": {"x": 0, "y": 0}, "bounding_box_corners": {"from": "B", "to": "D"}}
+        waypoints_configuration["B"]["edges"]["D"] = edge_data
+        waypoints_configuration["D"] = {"x": 1500, "y": 900, "edges": {"B": dict(edge_data, angle=240.0)}}
+        version = graph.version
+        graph.update_configuration(waypoints_configuration)
+        assert graph.version > version
+        assert [w.get_id() for w in graph.waypoints] == list(waypoints_configuration)
+        assert [w.get_index() for w in graph.waypoints] == list(range(9))
+        assert graph._get_waypoint_by_id("G").get_status() == WaypointStatus.BLOCKED
+        assert graph._get_waypoint_by_id("S").get_edge_to_waypoint("G") is edge
+        assert edge.get_status() == EdgeStatus.FREE
+        assert graph._get_waypoint_by_id("S").get_value_from_angle_to_waypoint("G") == 35.0
+        assert all(a.get_waypoint().get_id() != "C" for w in graph.waypoints for a in w.get_angles())
+        with pytest.raises(ValueError):
+            graph.set_target_waypoint("C")
+        graph.set_target_waypoint("D")
+        path = []
+        while not graph.has_reached_target_waypoint():
+            path.append(graph.go_to_next_best_waypoint())
+        assert path[-2:] == ["B", "D"]
+
+    def test_update_configuration_with_diff(self, graph):
+        waypoints_configuration = json.loads(json.dumps(Configurator().get_waypoints()))
+        waypoints_configuration["S"]["edges"]["G"]["angle"] = 35.0
+        diff = ConfigurationDiff.from_waypoints(graph.waypoints_configuration, waypoints_configuration)
+        with patch.object(Waypoint, "set_angles", autospec=True, side_effect=Waypoint.set_angles) as set_angles:
+            graph.update_configuration(diff=diff)
+        # only the waypoint whose edge changed is touched
+        assert [call.args[0].get_id() for call in set_angles.call_args_list] == ["S"]
+        assert graph._get_waypoint_by_id("S").get_value_from_angle_to_waypoint("G") == 35.0
+        assert graph.waypoints_configuration is waypoints_configuration
+        # a diff which does not start from the configuration of the graph is calculated again
+        changed_configuration = json.loads(json.dumps(waypoints_configuration))
+        changed_configuration["G"]["edges"]["S"]["angle"] = 215.0
+        graph.update_configuration(diff=ConfigurationDiff.from_waypoints(Configurator().get_waypoints(), changed_configuration))
+        assert graph._get_waypoint_by_id("S").get_value_from_angle_to_waypoint("G") == 35.0
+        assert graph._get_waypoint_by_id("G").get_value_from_angle_to_waypoint("S") == 215.0
+
+    def test_update_configuration_keeps_used_waypoints(self, graph):
+        waypoints_configuration = json.loads(json.dumps(Configurator().get_waypoints()))
+        graph.set_target_waypoint("A")
+        del waypoints_configuration["A"]
+        for waypoint_data in waypoints_configuration.values():
+            waypoint_data["edges"].pop("A", None)
+        with pytest.raises(ValueError):
+            graph.update_configuration(waypoints_configuration)
+        assert graph._get_waypoint_by_id("A") is graph.target_waypoint
+        assert len(graph.waypoints) == 9
+
+    def test_paths_do_not_depend_on_the_configuration_order(self):
+        waypoints_configuration = Configurator().get_waypoints()
+        # the order of src/Configuration/waypoints_config.json
+        reordered_configuration = {i: waypoints_configuration[i] for i in ["F", "G", "H", "I", "A", "B", "C", "S", "X"]}
+        paths = []
+        for configuration in [waypoints_configuration, reordered_configuration]:
+            graph = Graph(configuration)
+            assert [w.get_id() for w in graph.waypoints] == list(configuration)
+            graph.set_target_waypoint("S")
+            graph.go_to_next_best_waypoint()
+            graph_paths = {}
+            for target_waypoint_id in "HGFIACB":
+                graph.set_target_waypoint(target_waypoint_id)
+                graph.get_next_best_waypoint()
+                graph_paths[target_waypoint_id] = [w.get_id() for w in graph.get_shortest_path_to_target()]
+            paths.append(graph_paths)
+        assert paths[0] == paths[1]
+        # S-F-C and S-G-C have the same weight, F is visited first by its id
+        assert paths[0]["C"] == ["F", "C"]
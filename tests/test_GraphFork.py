@@ -0,0 +1,99 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from Navigation.Graph import Graph
+from Navigation.WaypointStatus import WaypointStatus
+from Navigation.EdgeStatus import EdgeStatus
+from Simulation.MapGenerator import MapGenerator
+from Validation.Validator import Validator
+
+
+@pytest.fixture(autouse=True)
+def generated_waypoint_ids():
+    with Validator.generated_waypoint_ids():
+        yield
+
+
+@pytest.fixture
+def graph():
+    graph = Graph(MapGenerator(100, seed=1).generate().waypoints_configuration)
+    graph.set_target_waypoint(graph.waypoints[-1].get_id())
+    return graph
+
+
+def plan_on_graph(graph):
+    graph.planner.calculate(graph.current_waypoint)
+    return (
+        graph.planner.get_path_to(graph.target_waypoint),
+        graph.planner.get_violations_to(graph.target_waypoint),
+        graph.planner.get_weight_to(graph.target_waypoint),
+    )
+
+
+def test_fork_plans_like_the_graph(graph):
+    assert graph.fork().plan() == plan_on_graph(graph)
+
+
+def test_fork_does_not_change_the_graph(graph):
+    path, _, _ = plan_on_graph(graph)
+    fork = graph.fork()
+    fork.set_edge_status(path[0].get_id(), path[1].get_id(), EdgeStatus.MISSING)
+    fork.set_waypoint_status(path[-2].get_id(), WaypointStatus.POTENTIALLY_BLOCKED)
+    assert fork.get_entry_count() == 2
+    assert fork.get_edge_status(path[0].get_id(), path[1].get_id()) == EdgeStatus.MISSING
+    assert path[0].get_edge_to_waypoint(path[1].get_id()).get_status() == EdgeStatus.UNKNOWN
+    assert path[-2].get_status() == WaypointStatus.UNKNOWN
+    assert not fork.is_outdated()
+    assert fork.plan()[0][1] is not path[1]
+    assert plan_on_graph(graph)[0] == path
+
+
+def test_forks_of_a_fork_are_independent(graph):
+    path, _, _ = plan_on_graph(graph)
+    fork = graph.fork()
+    fork.set_waypoint_status(path[0].get_id(), WaypointStatus.BLOCKED)
+    child = fork.fork()
+    assert fork.get_entry_count() == 0 and child.get_entry_count() == 0
+    child.set_waypoint_status(path[0].get_id(), WaypointStatus.FREE)
+    fork.set_waypoint_status(path[1].get_id(), WaypointStatus.BLOCKED)
+    assert child.get_waypoint_status(path[0].get_id()) == WaypointStatus.FREE
+    assert child.get_waypoint_status(path[1].get_id()) == WaypointStatus.UNKNOWN
+    assert fork.get_waypoint_status(path[0].get_id()) == WaypointStatus.BLOCKED
+    assert fork.get_waypoint_status(path[1].get_id()) == WaypointStatus.BLOCKED
+
+
+def test_fork_sees_later_changes_of_the_graph(graph):
+    path, _, _ = plan_on_graph(graph)
+    fork = graph.fork()
+    path[1].set_status(WaypointStatus.BLOCKED)
+    assert fork.is_outdated()
+    assert fork.get_waypoint_status(path[1].get_id()) == WaypointStatus.BLOCKED
+    assert fork.plan() == plan_on_graph(graph)
+
+
+def test_unreachable_target(graph):
+    fork = graph.fork()
+    for angle in graph.current_waypoint.get_angles():
+        fork.set_edge_status(graph.current_waypoint.get_id(), angle.get_waypoint().get_id(), EdgeStatus.MISSING)
+    assert fork.plan() is None
+
+
+def test_unknown_ids(graph):
+    fork = graph.fork()
+    with pytest.raises(ValueError):
+        fork.set_waypoint_status("Z", WaypointStatus.BLOCKED)
+    with pytest.raises(ValueError):
+        fork.set_edge_status("X", graph.waypoints[-1].get_id(), EdgeStatus.MISSING)
+
+
+def test_concurrent_planning(graph):
+    rng = random.Random(2)
+    forks = []
+    for _ in range(16):
+        fork = graph.fork()
+        for waypoint in rng.sample(graph.waypoints[1:-1], 10):
+            fork.set_waypoint_status(waypoint.get_id(), WaypointStatus.POTENTIALLY_BLOCKED)
+        forks.append(fork)
+    sequential_plans = [f.plan() for f in forks]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(lambda f: f.plan(), forks)) == sequential_plans
@@ -0,0 +1,40 @@
+from Navigation.Graph import Graph
+from Navigation.GraphTemplate import GraphTemplate
+from Simulation.MapGenerator import MapGenerator
+
+
+def test_template_of_configuration():
+    waypoints_configuration = MapGenerator(20, seed=1).generate_waypoints_configuration()
+    template = GraphTemplate.get(waypoints_configuration)
+    assert template.get_waypoint_count() == 20
+    assert template.waypoint_ids[:2] == ("X", "S")
+    s_index = template.waypoint_ids.index("S")
+    assert (s_index, 0.0) in template.angles[0]
+
+
+def test_template_is_built_once_per_configuration():
+    waypoints_configuration = MapGenerator(20, seed=1).generate_waypoints_configuration()
+    template = GraphTemplate.get(waypoints_configuration)
+    assert GraphTemplate.get(waypoints_configuration) is template
+    assert Graph(waypoints_configuration).template is template
+    equal_configuration = MapGenerator(20, seed=1).generate_waypoints_configuration()
+    assert GraphTemplate.get(equal_configuration) is not template
+
+
+def test_cache_size():
+    configurations = [MapGenerator(5, seed=i).generate_waypoints_configuration() for i in range(GraphTemplate.CACHE_SIZE + 1)]
+    templates = [GraphTemplate.get(c) for c in configurations]
+    assert len(GraphTemplate._templates) <= GraphTemplate.CACHE_SIZE
+    assert GraphTemplate.get(configurations[-1]) is templates[-1]
+    assert GraphTemplate.get(configurations[0]) is not templates[0]
+
+
+def test_graph_from_template():
+    waypoints_configuration = MapGenerator(20, seed=2).generate_waypoints_configuration()
+    graph = Graph(template=GraphTemplate(waypoints_configuration))
+    for waypoint in graph.waypoints:
+        configured_angles = waypoints_configuration[waypoint.get_id()]["edges"]
+        assert {a.get_waypoint().get_id(): a.get_value() for a in waypoint.get_angles()} == {
+            i: e["angle"] for i, e in configured_angles.items()
+        }
+        assert all(waypoint in a.get_waypoint().incoming_waypoints for a in waypoint.get_angles())
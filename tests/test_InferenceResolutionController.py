@@ -0,0 +1,63 @@
+import pytest
+from ObjectDetection.InferenceResolutionController import InferenceResolutionController
+
+
+@pytest.fixture
+def controller():
+    controller = InferenceResolutionController(smoothing=1.0, headroom=0.5, stable_count=2)
+    controller.add_call_site("detect", latency_budget=0.1, resolution=640, max_resolution=800)
+    return controller
+
+
+def test_without_budget_resolution_is_kept():
+    controller = InferenceResolutionController()
+    controller.add_call_site("start_up")
+    controller.record("start_up", 640, 10.0)
+    assert controller.get_resolution("start_up") == 640
+    assert controller.get_report()["start_up"]["latency"] == 10.0
+
+
+def test_step_down_under_load(controller):
+    controller.record("detect", 640, 0.2)
+    assert controller.get_resolution("detect") == 512
+    controller.record("detect", 512, 0.15)
+    assert controller.get_resolution("detect") == 416
+    assert controller.get_report()["detect"]["changes"] == 2
+
+
+def test_step_up_with_headroom(controller):
+    controller.record("detect", 640, 0.2)
+    assert controller.get_resolution("detect") == 512
+    controller.record("detect", 512, 0.03)
+    assert controller.get_resolution("detect") == 512
+    controller.record("detect", 512, 0.03)
+    assert controller.get_resolution("detect") == 640
+    # the maximum resolution of the call site is not exceeded
+    for _ in range(5):
+        controller.record("detect", 640, 0.01)
+    assert controller.get_resolution("detect") == 800
+
+
+def test_no_step_up_if_next_resolution_exceeds_budget(controller):
+    for _ in range(5):
+        controller.record("detect", 640, 0.05)
+    # 0.05 * (800 / 640)^2 = 0.078 fits, so the step is taken once
+    assert controller.get_resolution("detect") == 800
+    controller = InferenceResolutionController(smoothing=1.0, headroom=0.7, stable_count=1)
+    controller.add_call_site("detect", latency_budget=0.1)
+    controller.record("detect", 640, 0.069)
+    assert controller.get_resolution("detect") == 640
+
+
+def test_calls_at_other_resolution_are_ignored(controller):
+    controller.record("detect", 320, 5.0)
+    assert controller.get_resolution("detect") == 640
+    assert controller.get_report()["detect"]["latency"] is None
+
+
+def test_invalid_call_site():
+    controller = InferenceResolutionController()
+    with pytest.raises(ValueError):
+        controller.add_call_site("detect", resolution=600)
+    with pytest.raises(ValueError):
+        controller.add_call_site("detect", latency_budget=0)
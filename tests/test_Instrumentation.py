@@ -0,0 +1,57 @@
+import pytest
+from Instrumentation.Instrumentation import Instrumentation
+
+
+class TestInstrumentation:
+
+    @pytest.fixture(autouse=True)
+    def reset_instrumentation(self):
+        Instrumentation.reset()
+        yield
+        Instrumentation.disable()
+        Instrumentation.reset()
+
+    def test_timed_disabled(self):
+        @Instrumentation.timed("test.disabled")
+        def function(value):
+            return value * 2
+
+        assert function(2) == 4
+        assert Instrumentation.get_summary("test.disabled") is None
+
+    def test_timed_enabled(self):
+        @Instrumentation.timed()
+        def function(value):
+            return value * 2
+
+        Instrumentation.enable()
+        assert function(2) == 4
+        assert function(3) == 6
+        summary = Instrumentation.get_summary(function.__qualname__)
+        assert summary["count"] == 2
+
+    def test_timed_records_on_exception(self):
+        @Instrumentation.timed("test.exception")
+        def function():
+            raise ValueError()
+
+        Instrumentation.enable()
+        with pytest.raises(ValueError):
+            function()
+        assert Instrumentation.get_summary("test.exception")["count"] == 1
+
+    def test_start_stop(self):
+        assert Instrumentation.start() is None
+        assert Instrumentation.stop("test.split", None) is None
+        Instrumentation.enable()
+        start = Instrumentation.start()
+        start = Instrumentation.stop("test.first", start)
+        Instrumentation.stop("test.second", start)
+        assert set(Instrumentation.get_summaries()) == {"test.first", "test.second"}
+
+    def test_dump(self):
+        Instrumentation.enable()
+        Instrumentation.record("test.dump", 0.002)
+        dump = Instrumentation.dump()
+        assert "test.dump" in dump
+        assert "2.000" in dump
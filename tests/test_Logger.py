@@ -0,0 +1,65 @@
+import io
+import logging
+import queue
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from Logger.Logger import Logger, _NonBlockingQueueHandler
+
+
+class TestLogger:
+
+    @pytest.fixture
+    def stream(self):
+        stream = io.StringIO()
+        Logger.start(level=logging.DEBUG, stream=stream)
+        yield stream
+        Logger.stop()
+        # the level is kept when the logger is started again
+        Logger.set_level(logging.INFO)
+
+    def test_structured_message(self, stream):
+        Logger("Test").info("target reached", waypoint="A")
+        Logger.stop()
+        assert stream.getvalue() == "[pi    ] target reached waypoint=A\n"
+
+    def test_lazy_arguments(self, stream):
+        Logger("Test").debug("path %s to %s", ("S", "G"), "G", length=2)
+        Logger.stop()
+        assert stream.getvalue() == "[pi    ] path ('S', 'G') to G length=2\n"
+
+    def test_level_filters_messages(self, stream):
+        Logger.set_level(logging.WARNING)
+        logger = Logger("Test")
+        assert logger.is_enabled_for(logging.INFO) is False
+        logger.info("hidden")
+        logger.warning("shown")
+        Logger.stop()
+        assert stream.getvalue() == "[pi    ] shown\n"
+
+    def test_full_queue_drops_messages(self):
+        log_queue = queue.Queue(1)
+        handler = _NonBlockingQueueHandler(log_queue)
+        dropped_message_count = Logger.dropped_message_count
+        record = logging.LogRecord("pi.Test", logging.INFO, __file__, 0, "message", None, None)
+        handler.emit(record)
+        handler.emit(record)
+        assert log_queue.qsize() == 1
+        assert Logger.dropped_message_count == dropped_message_count + 1
+
+    def test_started_on_first_message(self):
+        Logger.stop()
+        Logger.set_level(logging.INFO)
+        logger = Logger("Test")
+        logger.debug("filtered")
+        assert Logger._listener is None
+        logger.info("shown")
+        assert Logger._listener is not None
+        Logger.stop()
+
+    def test_import_does_not_start_a_thread(self):
+        src_path = Path(__file__).resolve().parent.parent / "src"
+        code = "import threading, Navigation.NavigationController; print(threading.active_count())"
+        result = subprocess.run([sys.executable, "-c", code], cwd=src_path, capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "1"
@@ -0,0 +1,48 @@
+import pytest
+from Simulation.MapGenerator import MapGenerator
+from Navigation.Graph import Graph
+from Validation.Validator import Validator
+
+
+def test_generate_waypoints_configuration():
+    waypoints = MapGenerator(10).generate_waypoints_configuration()
+    assert len(waypoints) == 10
+    assert list(waypoints)[:2] == ["X", "S"]
+    assert waypoints["X"]["edges"]["S"]["angle"] == 0.0
+    assert waypoints["S"]["edges"]["X"]["angle"] == 180.0
+
+
+def test_generated_edges_are_symmetric():
+    waypoints = MapGenerator(50).generate_waypoints_configuration()
+    for waypoint_id, waypoint_data in waypoints.items():
+        for outgoing_waypoint_id, edge_data in waypoint_data["edges"].items():
+            back_angle = waypoints[outgoing_waypoint_id]["edges"][waypoint_id]["angle"]
+            assert (edge_data["angle"] + 180.0) % 360 == back_angle
+
+
+def test_generated_map_is_valid_for_graph():
+    simulated_map = MapGenerator(50, 0.2, 0.2, 0.2, seed=1).generate()
+    graph = Graph(simulated_map.waypoints_configuration)
+    assert len(graph.waypoints) == 50
+    with Validator.generated_waypoint_ids():
+        for waypoint_id in simulated_map.get_waypoint_ids():
+            Validator.validate_waypoint_id_format(waypoint_id)
+
+
+def test_generate_is_reproducible():
+    map_a = MapGenerator(50, 0.2, 0.2, 0.2, seed=3).generate()
+    map_b = MapGenerator(50, 0.2, 0.2, 0.2, seed=3).generate()
+    assert map_a.cone_waypoint_ids == map_b.cone_waypoint_ids
+    assert map_a.obstructed_edges == map_b.obstructed_edges
+    assert map_a.missing_edges == map_b.missing_edges
+
+
+def test_start_is_never_hidden():
+    simulated_map = MapGenerator(20, 1.0, 0.0, 1.0).generate()
+    assert not simulated_map.has_cone("S")
+    assert not simulated_map.is_missing("X", "S")
+
+
+def test_too_small_map():
+    with pytest.raises(ValueError):
+        MapGenerator(1)
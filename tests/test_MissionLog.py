@@ -0,0 +1,63 @@
+import pytest
+from Recording.MissionLog import MissionLog
+from Recording.RecordType import RecordType
+
+
+def test_append_and_read(tmp_path):
+    log = MissionLog(tmp_path / "mission.log")
+    log.append(RecordType.EVENT, {"name": "angle", "arguments": [90.0]}, timestamp=1.5)
+    log.append(RecordType.COMMAND, {"message": "follow_line"}, timestamp=2.0)
+    log.close()
+    assert list(MissionLog.read(tmp_path / "mission.log")) == [
+        (1.5, RecordType.EVENT, {"name": "angle", "arguments": [90.0]}),
+        (2.0, RecordType.COMMAND, {"message": "follow_line"}),
+    ]
+
+
+def test_reopened_log_is_appended(tmp_path):
+    for message in ["ping", "follow_line"]:
+        log = MissionLog(tmp_path / "mission.log")
+        log.append(RecordType.COMMAND, {"message": message})
+        log.close()
+    assert [data["message"] for _, _, data in MissionLog.read(tmp_path / "mission.log")] == ["ping", "follow_line"]
+
+
+def test_incomplete_record_is_skipped(tmp_path):
+    log = MissionLog(tmp_path / "mission.log")
+    log.append(RecordType.COMMAND, {"message": "ping"})
+    log.append(RecordType.COMMAND, {"message": "follow_line"})
+    log.close()
+    content = (tmp_path / "mission.log").read_bytes()
+    (tmp_path / "mission.log").write_bytes(content[:-3])
+    assert len(list(MissionLog.read(tmp_path / "mission.log"))) == 1
+
+
+def test_incomplete_record_is_cut_off_when_reopened(tmp_path):
+    log = MissionLog(tmp_path / "mission.log")
+    log.append(RecordType.COMMAND, {"message": "ping"})
+    log.append(RecordType.COMMAND, {"message": "follow_line"})
+    log.close()
+    content = (tmp_path / "mission.log").read_bytes()
+    # torn in the payload of the last record
+    (tmp_path / "mission.log").write_bytes(content[:-3])
+    log = MissionLog(tmp_path / "mission.log")
+    log.append(RecordType.COMMAND, {"message": "target_reached"})
+    log.close()
+    assert [data["message"] for _, _, data in MissionLog.read(tmp_path / "mission.log")] == ["ping", "target_reached"]
+    # torn in the header of the last record
+    content = (tmp_path / "mission.log").read_bytes()
+    (tmp_path / "mission.log").write_bytes(content + MissionLog.RECORD_HEADER.pack(10, 1.0, RecordType.COMMAND)[:5])
+    log = MissionLog(tmp_path / "mission.log")
+    log.append(RecordType.COMMAND, {"message": "ping"})
+    log.close()
+    assert [data["message"] for _, _, data in MissionLog.read(tmp_path / "mission.log")] == [
+        "ping", "target_reached", "ping"
+    ]
+
+
+def test_invalid_log(tmp_path):
+    (tmp_path / "mission.log").write_bytes(b"no log")
+    with pytest.raises(ValueError):
+        MissionLog(tmp_path / "mission.log")
+    with pytest.raises(ValueError):
+        list(MissionLog.read(tmp_path / "mission.log"))
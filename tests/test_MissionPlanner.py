@@ -0,0 +1,50 @@
+import sys
+import pytest
+from pathlib import Path
+from Navigation.Graph import Graph
+from Navigation.MissionPlanner import MissionPlanner
+from Configuration.Configurator import Configurator
+
+
+class TestMissionPlanner:
+
+    @pytest.fixture(scope="class", autouse=True)
+    def setup_configurator(self):
+        mock_config_path = Path(__file__).resolve().parent / "mock_config.json"
+        Configurator.initialize(str(mock_config_path))
+
+    @pytest.fixture
+    def graph(self):
+        return Graph()
+
+    def order(self, graph, target_waypoint_ids):
+        target_waypoints = [graph._get_waypoint_by_id(i) for i in target_waypoint_ids]
+        ordered = MissionPlanner(graph.waypoints).order_targets(graph.current_waypoint, target_waypoints)
+        return [w.get_id() for w in ordered]
+
+    def test_order_single_target(self, graph):
+        assert self.order(graph, ["A"]) == ["A"]
+
+    def test_order_exact(self, graph):
+        # X-S-H-A-B is cheaper than X-S-G-C-B-A-H
+        assert self.order(graph, ["B", "H"]) == ["H", "B"]
+
+    def test_order_heuristic(self, graph, monkeypatch):
+        monkeypatch.setattr(MissionPlanner, "EXACT_ORDER_LIMIT", 0)
+        assert self.order(graph, ["B", "H"]) == ["H", "B"]
+
+    def test_distances_stop_once_all_targets_are_reached(self, graph):
+        mission_planner = MissionPlanner(graph.waypoints)
+        target_waypoints = [graph._get_waypoint_by_id(i) for i in ["S", "H"]]
+        mission_planner.planner.calculate_to_targets(graph.current_waypoint, target_waypoints)
+        costs = list(mission_planner.planner.costs)
+        mission_planner.planner.calculate(graph.current_waypoint)
+        assert [costs[w.index] for w in target_waypoints] == [mission_planner.planner.get_cost_to(w) for w in target_waypoints]
+        # the waypoints behind the targets are not searched
+        assert costs[graph._get_waypoint_by_id("B").index] == sys.maxsize
+
+    def test_order_visits_all_targets(self, graph, monkeypatch):
+        target_waypoint_ids = ["C", "A", "F", "B", "H"]
+        assert sorted(self.order(graph, target_waypoint_ids)) == sorted(target_waypoint_ids)
+        monkeypatch.setattr(MissionPlanner, "EXACT_ORDER_LIMIT", 0)
+        assert sorted(self.order(graph, target_waypoint_ids)) == sorted(target_waypoint_ids)
@@ -0,0 +1,127 @@
+import json
+from pathlib import Path
+from unittest.mock import Mock
+import numpy as np
+import pytest
+from Configuration.Configurator import Configurator
+from Navigation.Graph import Graph
+from Navigation.NavigationController import NavigationController
+from Navigation.WaypointStatus import WaypointStatus
+from ObjectDetection.ObjectDetector import ObjectDetector
+from ObjectDetection.FrameStore import FrameStore
+from ObjectDetection.FrameStoreCamera import FrameStoreCamera
+from Recording.MissionLog import MissionLog
+from Recording.MissionRecorder import MissionRecorder
+from Recording.MissionReplayer import MissionReplayer
+from Recording.RecordType import RecordType
+from Simulation.MapGenerator import MapGenerator
+from Simulation.NavigationSimulator import NavigationSimulator
+
+
+@pytest.fixture
+def recorded_mission(tmp_path):
+    # a line the detection wrongly saw is not marked missing by a point scan, see Graph.update_missing_angles, the
+    # mission on this map does not plan over one
+    simulated_map = MapGenerator(100, 0.1, 0.1, 0.1, seed=5).generate()
+    simulator = NavigationSimulator(simulated_map, is_on_ideal_path=False, detection_accuracy=0.8, seed=5)
+    recorder = MissionRecorder(tmp_path / "mission.log")
+    recorder.attach(simulator.controller)
+    target_waypoint_id = next(w for w in reversed(simulated_map.get_waypoint_ids()) if not simulated_map.has_cone(w))
+    result = simulator.run_mission([target_waypoint_id])
+    recorder.close()
+    return tmp_path / "mission.log", result
+
+
+def test_record_mission(recorded_mission):
+    log_path, result = recorded_mission
+    records = list(MissionLog.read(log_path))
+    commands = [data["message"] for _, record_type, data in records if record_type == RecordType.COMMAND]
+    assert commands == result.emitted_commands
+    event_names = [data["name"] for _, record_type, data in records if record_type == RecordType.EVENT]
+    assert event_names[0] == "set_mission"
+    assert len(event_names) == result.event_count
+    assert sum(record_type == RecordType.START_UP for _, record_type, _ in records) == 1
+    assert any(record_type == RecordType.DETECTION for _, record_type, _ in records)
+
+
+def test_replay_without_divergence(recorded_mission):
+    log_path, result = recorded_mission
+    report = MissionReplayer(log_path).replay()
+    assert not report.has_diverged(), report.summary()
+    assert report.emitted_commands == result.emitted_commands
+    assert report.event_count == result.event_count
+    assert len(report.replayed_latencies["angle"]) == len(result.event_latencies["angle"])
+
+
+def test_replay_reports_divergence(recorded_mission, tmp_path):
+    log_path, _ = recorded_mission
+    # every recorded detection on an angle saw a cone, so the replayed navigation differs
+    changed_log = MissionLog(tmp_path / "changed.log")
+    for timestamp, record_type, data in MissionLog.read(log_path):
+        if record_type == RecordType.DETECTION:
+            data["waypoint_status"] = WaypointStatus.POTENTIALLY_BLOCKED.name
+        changed_log.append(record_type, data, timestamp)
+    changed_log.close()
+    replayer = MissionReplayer(tmp_path / "changed.log")
+    report = replayer.replay()
+    assert report.has_diverged()
+    assert report.divergences[0]["kind"] == "commands"
+    assert "divergences" in report.summary()
+
+
+def test_record_frames(tmp_path):
+    frames = [("a", np.zeros((2, 3, 3), dtype=np.uint8)), ("b", np.ones((2, 3, 3), dtype=np.uint8))]
+    camera = FrameStoreCamera(FrameStore.create(tmp_path / "frames", frames))
+
+    class Detector:
+        top_camera = camera
+        bottom_camera = camera
+
+        def detect(self):
+            pass
+
+        def start_up_process_detect(self):
+            pass
+
+    class CommandList(list):
+        def emit(self, message):
+            self.append(message)
+
+    recorder = MissionRecorder(tmp_path / "mission.log", tmp_path / "recorded_frames")
+    recorder.attach(NavigationController(CommandList(), Detector()))
+    camera.get_image_array()
+    camera.get_image_array()
+    recorder.close()
+    replayer = MissionReplayer(tmp_path / "mission.log")
+    names = replayer.get_frame_names("top_camera")
+    assert names == ["top_camera_000000", "top_camera_000001"]
+    recorded_frames = FrameStore(tmp_path / "recorded_frames")
+    assert np.array_equal(recorded_frames.get_frame(names[1]), frames[1][1])
+
+
+def test_record_configuration_changed(tmp_path):
+    Configurator.initialize(str(Path(__file__).resolve().parent / "mock_config.json"))
+    configuration = Configurator().configuration
+    changed_configuration = json.loads(json.dumps(configuration))
+    changed_configuration["waypoints"]["S"]["edges"]["G"]["angle"] = 35.0
+
+    class CommandList(list):
+        def emit(self, message):
+            self.append(message)
+
+    controller = NavigationController(CommandList(), Mock(spec=ObjectDetector))
+    controller.graph = Graph()
+    recorder = MissionRecorder(tmp_path / "mission.log")
+    recorder.attach(controller)
+    try:
+        controller.on_configuration_changed(changed_configuration)
+        recorder.close()
+        assert controller.graph._get_waypoint_by_id("S").get_value_from_angle_to_waypoint("G") == 35.0
+        events = [data for _, record_type, data in MissionLog.read(tmp_path / "mission.log") if record_type == RecordType.EVENT]
+        assert events == [{"name": "configuration_changed", "arguments": [changed_configuration]}]
+        Configurator.set_configuration(configuration)
+        report = MissionReplayer(tmp_path / "mission.log").replay()
+        assert not report.has_diverged(), report.summary()
+        assert Configurator().configuration == changed_configuration
+    finally:
+        Configurator.set_configuration(configuration)
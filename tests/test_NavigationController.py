@@ -8,6 +8,9 @@ from Navigation.EdgeStatus import EdgeStatus
 from Validation.Validator import Validator
 from Navigation.Graph import Graph
 from Configuration.Configurator import Configurator
+from Instrumentation.Instrumentation import Instrumentation
+from WorldModel.WorldModelClient import WorldModelClient
+from WorldModel.WorldModelSync import WorldModelSync
 from pathlib import Path
 import json
 
@@ -20,7 +23,9 @@ class TestNavigationController:
 
     @pytest.fixture
     def object_detector(self):
-        return Mock(spec=ObjectDetector)
+        object_detector = Mock(spec=ObjectDetector)
+        object_detector.get_confidences.return_value = (None, None)
+        return object_detector
 
     @pytest.fixture(scope="class", autouse=True)
     def setup_configurator(self):
@@ -34,14 +39,24 @@ class TestNavigationController:
         return controller
 
     def test_start(self, controller):
-        controller._start("A")
-        assert controller.graph.target_waypoint.id == "A"
+        with patch("Navigation.NavigationController.time.sleep") as mock_sleep:
+            controller.start()
+        controller.object_detector.start_warm_up.assert_called_once()
         controller.emitter.emit.assert_called_once_with("ping")
+        mock_sleep.assert_called_once()
+
+    def test_start_with_communication_available(self, controller):
+        controller.on_pong()
+        controller.start()
+        controller.emitter.emit.assert_not_called()
 
     def test_on_pong(self, controller):
-        with patch.object(controller, "_NavigationController__go_to_next_waypoint_by_ideal_path") as mock_next:
-            controller.on_pong()
-            mock_next.assert_called_once()
+        controller.on_pong()
+        assert controller.communication_available
+
+    def test_on_stop(self, controller):
+        with pytest.raises(SystemExit):
+            controller.on_stop()
 
     def test_on_waypoint(self, controller):
         controller.graph.set_target_waypoint("A")
@@ -53,6 +68,40 @@ class TestNavigationController:
             controller.graph.previous_waypoint.angles[0].edge.status == EdgeStatus.FREE
         )
 
+    def test_on_waypoint_with_unreachable_world_model(self, controller, tmp_path):
+        client = WorldModelClient(str(tmp_path / "world_model.sock"))
+        controller.world_model_sync = WorldModelSync(controller.graph, client)
+        controller.graph.set_target_waypoint("A")
+        controller.graph.go_to_next_best_waypoint()
+        controller.on_waypoint()
+        # the car keeps navigating on its own graph
+        assert controller.graph.current_waypoint.status == WaypointStatus.FREE
+        assert controller.emitter.emit.call_args[0][0].startswith("target_line_angle:")
+
+    def test_on_configuration_changed(self, controller):
+        configuration = Configurator().configuration
+        changed_configuration = json.loads(json.dumps(configuration))
+        changed_configuration["waypoints"]["S"]["edges"]["G"]["angle"] = 35.0
+        try:
+            controller.on_configuration_changed(changed_configuration)
+            # the configuration is published together with the change of the graph
+            assert Configurator().configuration is changed_configuration
+            assert controller.graph._get_waypoint_by_id("S").get_value_from_angle_to_waypoint("G") == 35.0
+            controller.object_detector.reload_configuration.assert_called_once()
+        finally:
+            Configurator.set_configuration(configuration)
+
+    def test_on_configuration_changed_keeps_used_waypoints(self, controller):
+        configuration = Configurator().configuration
+        changed_configuration = json.loads(json.dumps(configuration))
+        del changed_configuration["waypoints"]["A"]
+        for waypoint_data in changed_configuration["waypoints"].values():
+            waypoint_data["edges"].pop("A", None)
+        controller.graph.set_target_waypoint("A")
+        with pytest.raises(ValueError):
+            controller.on_configuration_changed(changed_configuration)
+        assert Configurator().configuration is configuration
+
     def test_on_angle(self, controller):
         controller.graph.set_target_waypoint("A")
         controller.graph.go_to_next_best_waypoint()
@@ -72,3 +121,22 @@ class TestNavigationController:
             assert (
                 controller.graph.current_waypoint.angles[0].edge.status
                 == EdgeStatus.POTENTIALLY_OBSTRUCTED
+            )
+
+    def test_on_set_mission_on_current_waypoint(self, controller):
+        controller.graph.set_target_waypoint("A")
+        controller.graph.go_to_next_best_waypoint()
+        controller.on_set_mission([controller.graph.current_waypoint.get_id()])
+        controller.emitter.emit.assert_called_once_with("target_reached")
+
+    def test_set_target_is_timed_once(self, controller):
+        Instrumentation.reset()
+        Instrumentation.enable()
+        try:
+            controller.on_set_target("A")
+            summaries = Instrumentation.get_summaries()
+        finally:
+            Instrumentation.disable()
+            Instrumentation.reset()
+        assert summaries["NavigationController.on_set_mission"]["count"] == 1
+        assert "NavigationController.on_set_target" not in summaries
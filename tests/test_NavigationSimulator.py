@@ -0,0 +1,66 @@
+import pytest
+from Simulation.MapGenerator import MapGenerator
+from Simulation.SimulatedMap import SimulatedMap
+from Simulation.NavigationSimulator import NavigationSimulator
+
+
+class TestNavigationSimulator:
+
+    @pytest.fixture
+    def waypoints_configuration(self):
+        # 3x3 grid, S is W0 in the lower left corner and W8 in the upper right corner
+        return MapGenerator(10).generate_waypoints_configuration()
+
+    def test_run_mission_free_map(self, waypoints_configuration):
+        result = NavigationSimulator(SimulatedMap(waypoints_configuration)).run_mission(["W8"])
+        assert result.is_target_reached
+        assert result.final_waypoint_id == "W8"
+        assert result.emitted_commands[-1] == "target_reached"
+        assert result.planning_count > 0
+        assert len(result.event_latencies["waypoint"]) == 5
+
+    def test_run_mission_with_cone(self, waypoints_configuration):
+        simulated_map = SimulatedMap(waypoints_configuration, cone_waypoint_ids=["W1", "W4"])
+        simulator = NavigationSimulator(simulated_map)
+        # the cameras do not see the cones, so the car has to turn around in front of them
+        simulator.object_detector.simulated_map = SimulatedMap(waypoints_configuration)
+        result = simulator.run_mission(["W2"])
+        assert result.is_target_reached
+        assert len(result.event_latencies["cone_detected"]) >= 1
+
+    def test_run_mission_with_missing_line_and_obstacle(self, waypoints_configuration):
+        simulated_map = SimulatedMap(
+            waypoints_configuration,
+            obstructed_edges=[frozenset(["S", "W3"])],
+            missing_edges=[frozenset(["S", "W1"])],
+        )
+        result = NavigationSimulator(simulated_map).run_mission(["W8"])
+        assert result.is_target_reached
+
+    def test_run_mission_with_point_scanning(self, waypoints_configuration):
+        simulated_map = SimulatedMap(waypoints_configuration, missing_edges=[frozenset(["W4", "W5"])])
+        result = NavigationSimulator(simulated_map, is_on_ideal_path=False).run_mission(["W8"])
+        assert result.is_target_reached
+        assert "scan_point" in result.emitted_commands
+
+    def test_run_mission_without_path(self, waypoints_configuration):
+        simulated_map = SimulatedMap(waypoints_configuration, cone_waypoint_ids=["W1", "W3"])
+        result = NavigationSimulator(simulated_map).run_mission(["W8"])
+        assert result.is_target_reached is False
+        assert result.error is not None
+
+    def test_run_mission_multiple_targets(self, waypoints_configuration):
+        result = NavigationSimulator(SimulatedMap(waypoints_configuration)).run_mission(["W8", "W2"])
+        assert result.is_target_reached
+        assert result.final_waypoint_id in ["W8", "W2"]
+
+    def test_point_scanning_skips_confirmed_directions(self, waypoints_configuration):
+        result = NavigationSimulator(SimulatedMap(waypoints_configuration), is_on_ideal_path=False).run_mission(["W8"])
+        assert result.is_target_reached
+        scan_report = result.scan_report
+        assert scan_report["scan_count"] == result.emitted_commands.count("scan_point")
+        # the line back to the waypoint the car came from was driven, so it is confirmed
+        assert scan_report["skipped_detection_count"] >= scan_report["scan_count"]
+        assert scan_report["detection_count"] + scan_report["skipped_detection_count"] == scan_report["angle_count"]
+        assert scan_report["angle_count"] == len(result.event_latencies["angle"])
+        assert scan_report["total_scan_time"] >= scan_report["last_scan_time"] > 0
@@ -0,0 +1,97 @@
+import pytest
+from Navigation.PathPlanner import PathPlanner
+from Navigation.Waypoint import Waypoint
+from Navigation.WaypointStatus import WaypointStatus
+from Navigation.EdgeStatus import EdgeStatus
+from GraphHelper import connect
+
+
+class TestPathPlanner:
+
+    @pytest.fixture
+    def waypoints(self):
+        # A - B - D and A - C - D, the edges via C are free
+        a = Waypoint("A", 0)
+        b = Waypoint("B", 1)
+        c = Waypoint("C", 2)
+        d = Waypoint("D", 3)
+        connect(a, b, 0.0)
+        connect(b, d, 90.0)
+        connect(a, c, 90.0, EdgeStatus.FREE)
+        connect(c, d, 0.0, EdgeStatus.FREE)
+        return [a, b, c, d]
+
+    @pytest.fixture
+    def planner(self, waypoints):
+        return PathPlanner(waypoints)
+
+    def test_calculate_shortest_path(self, planner, waypoints):
+        planner.calculate(waypoints[0])
+        path = planner.get_path_to(waypoints[3])
+        assert [w.get_id() for w in path] == ["C", "D"]
+        assert planner.get_weight_to(waypoints[3]) == 2 * (EdgeStatus.FREE.value + 10)
+
+    def test_calculate_stops_at_target(self, planner, waypoints):
+        planner.calculate(waypoints[0], waypoints[2])
+        assert [w.get_id() for w in planner.get_path_to(waypoints[2])] == ["C"]
+        assert planner.get_weight_to(waypoints[2]) == EdgeStatus.FREE.value + 10
+
+    def test_blocked_waypoint_is_avoided(self, planner, waypoints):
+        waypoints[2].set_status(WaypointStatus.BLOCKED)
+        planner.calculate(waypoints[0])
+        assert [w.get_id() for w in planner.get_path_to(waypoints[3])] == ["B", "D"]
+
+    def test_missing_edge_is_avoided(self, planner, waypoints):
+        waypoints[0].get_edge_to_waypoint("C").set_status(EdgeStatus.MISSING)
+        planner.calculate(waypoints[0])
+        assert [w.get_id() for w in planner.get_path_to(waypoints[3])] == ["B", "D"]
+
+    def test_uncertain_block_is_avoided(self, planner, waypoints):
+        waypoints[2].set_status(WaypointStatus.POTENTIALLY_BLOCKED)
+        planner.calculate(waypoints[0])
+        assert [w.get_id() for w in planner.get_path_to(waypoints[3])] == ["B", "D"]
+        assert planner.get_violations_to(waypoints[3]) == 0
+
+    def test_path_with_fewest_violations(self, planner, waypoints):
+        # the path via C is cheaper but passes two uncertain blocks
+        waypoints[0].get_edge_to_waypoint("C").set_status(EdgeStatus.POTENTIALLY_MISSING)
+        waypoints[2].set_status(WaypointStatus.POTENTIALLY_BLOCKED)
+        waypoints[1].set_status(WaypointStatus.POTENTIALLY_BLOCKED)
+        planner.calculate(waypoints[0])
+        assert [w.get_id() for w in planner.get_path_to(waypoints[3])] == ["B", "D"]
+        assert planner.get_violations_to(waypoints[3]) == 1
+        assert planner.get_weight_to(waypoints[3]) == 2 * (EdgeStatus.UNKNOWN.value + 10)
+
+    def test_unreachable_target(self, planner, waypoints):
+        waypoints[1].set_status(WaypointStatus.BLOCKED)
+        waypoints[2].set_status(WaypointStatus.BLOCKED)
+        planner.calculate(waypoints[0])
+        assert planner.get_path_to(waypoints[3]) is None
+
+    def test_scratch_state_is_not_stored_on_waypoints(self, planner, waypoints):
+        planner.calculate(waypoints[0])
+        assert len(planner.costs) == len(waypoints)
+        assert not hasattr(waypoints[0], "__dict__")
+
+    def test_probably_blocked_waypoint_is_avoided(self, planner, waypoints):
+        # C was seen free, but with a high chance of a cone, so the equally long path via B is cheaper
+        waypoints[0].get_edge_to_waypoint("B").set_status(EdgeStatus.FREE)
+        waypoints[1].get_edge_to_waypoint("D").set_status(EdgeStatus.FREE)
+        waypoints[2].observe_block(False, 0.55)
+        planner.calculate(waypoints[0])
+        assert [w.get_id() for w in planner.get_path_to(waypoints[3])] == ["B", "D"]
+
+    def test_search_with_graph_view_and_cost_function(self, waypoints):
+        # the view leaves out the edge to C, every step costs 1 and a violation on the way to B
+        def get_steps(index):
+            return [(a.outgoing_waypoint.index, a) for a in waypoints[index].angles if a.outgoing_waypoint.get_id() != "C"]
+
+        def get_step_cost(angle):
+            return 1, int(angle.outgoing_waypoint.get_id() == "B")
+
+        planner = PathPlanner(waypoints, get_steps, get_step_cost)
+        planner.calculate(waypoints[0])
+        assert [w.get_id() for w in planner.get_path_to(waypoints[3])] == ["B", "D"]
+        assert planner.get_violations_to(waypoints[3]) == 1
+        assert planner.get_weight_to(waypoints[3]) == 2
+        assert planner.get_path_to(waypoints[2]) is None
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from CameraStub import CameraStub
+from ObjectDetectorStub import ObjectDetectorStub, CRASH_VALUE
+from Exceptions.DetectionWorkerError import DetectionWorkerError
+from Navigation.EdgeStatus import EdgeStatus
+from Navigation.WaypointStatus import WaypointStatus
+from ObjectDetection.Camera import Camera
+from ObjectDetection.ProcessObjectDetector import ProcessObjectDetector
+
+
+class FrameSequenceCamera(Camera):
+
+    def __init__(self, values):
+        self.values = list(values)
+
+    def enable(self):
+        pass
+
+    def disable(self):
+        pass
+
+    def get_width(self):
+        return 8
+
+    def get_height(self):
+        return 4
+
+    def get_image_array(self):
+        return np.full((4, 8, 3), self.values.pop(0), dtype=np.uint8)
+
+
+@pytest.fixture
+def create_detector():
+    detectors = []
+
+    def create(values, **kwargs):
+        camera = FrameSequenceCamera(values)
+        detector = ProcessObjectDetector(ObjectDetectorStub, camera, camera, **kwargs)
+        detectors.append(detector)
+        return detector
+
+    yield create
+    for detector in detectors:
+        detector.close()
+
+
+def test_detect(create_detector):
+    detector = create_detector([3, 0])
+    assert detector.detect() == (WaypointStatus.POTENTIALLY_BLOCKED, EdgeStatus.POTENTIALLY_OBSTRUCTED)
+    assert detector.get_confidences() == (1.0, 1.0)
+    assert detector.detect() == (WaypointStatus.POTENTIALLY_FREE, EdgeStatus.POTENTIALLY_FREE)
+    assert detector.restart_count == 0
+
+
+def test_detect_frames(create_detector):
+    # the detector of the worker reads both frames of the ring slots
+    detector = create_detector([3, 2], frame_count=2)
+    assert detector.detect() == (WaypointStatus.POTENTIALLY_BLOCKED, EdgeStatus.POTENTIALLY_OBSTRUCTED)
+    assert detector.get_confidences() == (1.0, 0.5)
+
+
+def test_start_up_process_detect(create_detector):
+    graph = create_detector([1]).start_up_process_detect()
+    assert graph._get_waypoint_by_id("A").get_status() == WaypointStatus.POTENTIALLY_BLOCKED
+    assert graph._get_waypoint_by_id("A").get_block_probability() == pytest.approx(0.9)
+
+
+def test_restart_after_crash(create_detector):
+    # the crashing frame is sent twice, once to the first and once to the restarted worker
+    detector = create_detector([CRASH_VALUE, 2])
+    with pytest.raises(DetectionWorkerError):
+        detector.detect()
+    assert detector.restart_count == 2
+    assert detector.detect() == (WaypointStatus.POTENTIALLY_BLOCKED, EdgeStatus.POTENTIALLY_FREE)
+
+
+def test_error_in_detector(tmp_path):
+    camera = CameraStub(tmp_path / "1.JPG")
+    detector = ProcessObjectDetector(ObjectDetectorStub, camera, camera)
+    try:
+        with pytest.raises(DetectionWorkerError, match="Unexpected frame"):
+            detector.detect()
+        assert detector.restart_count == 0
+    finally:
+        detector.close()
+
+
+def test_invalid_slot_count():
+    with pytest.raises(ValueError):
+        ProcessObjectDetector(ObjectDetectorStub, None, None, frame_count=3, slot_count=2)
+
+
+def test_reload_configuration(create_detector):
+    detector = create_detector([2])
+    detector.reload_configuration()
+    assert detector.detect() == (WaypointStatus.POTENTIALLY_BLOCKED, EdgeStatus.POTENTIALLY_FREE)
+    assert detector.restart_count == 0
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from ObjectDetection.TiledInference import TiledInference
+
+
+class FakeBox:
+    def __init__(self, x_min, y_min, x_max, y_max, confidence):
+        self.xyxy = np.array([[x_min, y_min, x_max, y_max]])
+        self.cls = np.array([0])
+        self.conf = np.array([confidence])
+
+
+class FakeResult:
+    def __init__(self, boxes):
+        self.boxes = boxes
+
+
+class FakeModel:
+    """
+    Detects the bounding box of the non zero pixels of every image as a cone.
+    """
+    names = {0: "cone"}
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, images, imgsz, verbose):
+        self.batch_sizes.append(len(images))
+        results = []
+        for image in images:
+            ys, xs = np.nonzero(image)
+            boxes = [] if len(xs) == 0 else [FakeBox(xs.min(), ys.min(), xs.max() + 1, ys.max() + 1, 0.9)]
+            results.append(FakeResult(boxes))
+        return results
+
+
+def cone(x_min, y_min, x_max, y_max, confidence=0.9, label="cone"):
+    return {
+        "label": label,
+        "confidence": confidence,
+        "bounding_box": {
+            "x_min": x_min, "x_max": x_max, "y_min": y_min, "y_max": y_max,
+            "width": x_max - x_min, "height": y_max - y_min,
+        },
+    }
+
+
+def test_tiles_cover_frame():
+    tiled_inference = TiledInference(FakeModel, tile_size=640, overlap=0.2)
+    tiles = tiled_inference.get_tiles(4032, 3024)
+    covered = np.zeros((3024, 4032), dtype=bool)
+    for x, y, width, height in tiles:
+        assert width == 640 and height == 640
+        covered[y:y + height, x:x + width] = True
+    assert covered.all()
+    assert max(x + width for x, _, width, _ in tiles) == 4032
+
+
+def test_tiles_of_small_frame():
+    assert TiledInference(FakeModel, tile_size=640).get_tiles(320, 200) == [(0, 0, 320, 200)]
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        TiledInference(FakeModel, overlap=1.0)
+    with pytest.raises(ValueError):
+        TiledInference(FakeModel, batch_size=0)
+
+
+def test_predict_object_on_tile_border():
+    models = []
+
+    def model_factory():
+        models.append(FakeModel())
+        return models[-1]
+
+    frame = np.zeros((1000, 1500), dtype=np.uint8)
+    frame[500:540, 620:660] = 255
+    tiled_inference = TiledInference(model_factory, tile_size=640, overlap=0.2, batch_size=3)
+    objects = tiled_inference.predict(frame)
+    tiled_inference.shutdown()
+    assert len(objects) == 1
+    assert objects[0]["bounding_box"]["x_min"] == 620
+    assert objects[0]["bounding_box"]["y_max"] == 540
+    assert all(size <= 3 for model in models for size in model.batch_sizes)
+
+
+def test_non_max_suppression():
+    objects = [
+        cone(0, 0, 100, 100, 0.8),
+        cone(10, 10, 110, 110, 0.9),
+        cone(10, 10, 110, 110, 0.7, label="obstacle"),
+        cone(300, 300, 400, 400),
+    ]
+    kept = TiledInference.non_max_suppression(objects)
+    assert [(o["label"], o["confidence"]) for o in kept] == [("cone", 0.9), ("cone", 0.9), ("obstacle", 0.7)]
+
+
+def test_non_max_suppression_of_cut_object():
+    objects = [cone(0, 0, 100, 100, 0.9), cone(60, 0, 100, 100, 0.6)]
+    assert len(TiledInference.non_max_suppression(objects)) == 1
@@ -0,0 +1,36 @@
+from Instrumentation.TimingHistogram import TimingHistogram
+
+
+def test_empty_histogram():
+    histogram = TimingHistogram()
+    assert histogram.get_percentile(50) == 0.0
+    assert histogram.get_mean() == 0.0
+    assert histogram.get_summary()["min"] == 0.0
+
+
+def test_record():
+    histogram = TimingHistogram()
+    for duration in [0.001, 0.002, 0.003]:
+        histogram.record(duration)
+    assert histogram.count == 3
+    assert abs(histogram.get_mean() - 0.002) < 1e-12
+    assert histogram.minimum == 0.001
+    assert histogram.maximum == 0.003
+
+
+def test_percentiles_are_within_bucket_error():
+    histogram = TimingHistogram()
+    for microseconds in range(1, 1001):
+        histogram.record(microseconds / 1e6)
+    assert 500e-6 <= histogram.get_percentile(50) <= 500e-6 * 1.25
+    assert 990e-6 <= histogram.get_percentile(99) <= 1000e-6
+    assert histogram.get_percentile(100) == histogram.maximum
+
+
+def test_sub_microsecond_and_huge_durations():
+    histogram = TimingHistogram()
+    histogram.record(1e-9)
+    histogram.record(1e6)
+    assert histogram.buckets[0] == 1
+    assert histogram.buckets[-1] == 1
+    assert len(histogram.buckets) == TimingHistogram.BUCKET_COUNT
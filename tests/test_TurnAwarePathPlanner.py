@@ -0,0 +1,90 @@
+import random
+import pytest
+from Navigation.Graph import Graph
+from Navigation.PathPlanner import PathPlanner
+from Navigation.TurnAwarePathPlanner import TurnAwarePathPlanner
+from Navigation.TurnCostModel import TurnCostModel
+from Navigation.Waypoint import Waypoint
+from Navigation.WaypointStatus import WaypointStatus
+from Navigation.EdgeStatus import EdgeStatus
+from Simulation.MapGenerator import MapGenerator
+from GraphHelper import connect
+
+
+class TestTurnAwarePathPlanner:
+
+    @pytest.fixture
+    def waypoints(self):
+        # A - B - D straight on and A - C - D with two right angles, the edges via C are cheaper
+        a = Waypoint("A", 0)
+        b = Waypoint("B", 1)
+        c = Waypoint("C", 2)
+        d = Waypoint("D", 3)
+        connect(a, b, 0.0, EdgeStatus.POTENTIALLY_FREE)
+        connect(b, d, 0.0, EdgeStatus.POTENTIALLY_FREE)
+        connect(a, c, 90.0, EdgeStatus.FREE)
+        connect(c, d, 0.0, EdgeStatus.FREE)
+        # the car looks along the line to B
+        a.incoming_angle = 180.0
+        return [a, b, c, d]
+
+    @pytest.fixture
+    def turn_cost_model(self):
+        return TurnCostModel(cost_per_degree=0.2, turn_cost=5.0)
+
+    def test_prefers_fewer_turns(self, waypoints, turn_cost_model):
+        planner = TurnAwarePathPlanner(waypoints, turn_cost_model)
+        planner.calculate(waypoints[0])
+        assert [w.get_id() for w in planner.get_path_to(waypoints[3])] == ["B", "D"]
+        # two potentially free lines straight on
+        assert planner.get_weight_to(waypoints[3]) == 2 * 120
+        edge_planner = PathPlanner(waypoints)
+        edge_planner.calculate(waypoints[0])
+        assert [w.get_id() for w in edge_planner.get_path_to(waypoints[3])] == ["C", "D"]
+
+    def test_turn_costs_are_added(self, waypoints, turn_cost_model):
+        planner = TurnAwarePathPlanner(waypoints, turn_cost_model)
+        planner.calculate(waypoints[0])
+        # turning right at A and left at C
+        assert planner.get_weight_to(waypoints[2]) == 110 + turn_cost_model.get_cost(0.0, 90.0)
+        assert planner.get_violations_to(waypoints[3]) == 0
+
+    def test_heading_of_start_waypoint(self, waypoints, turn_cost_model):
+        # the car looks along the line to C, going via B needs two turns now
+        waypoints[0].incoming_angle = 270.0
+        planner = TurnAwarePathPlanner(waypoints, turn_cost_model)
+        planner.calculate(waypoints[0])
+        assert [w.get_id() for w in planner.get_path_to(waypoints[3])] == ["C", "D"]
+
+    def test_blocked_waypoint(self, waypoints, turn_cost_model):
+        waypoints[1].set_status(WaypointStatus.BLOCKED)
+        planner = TurnAwarePathPlanner(waypoints, turn_cost_model)
+        planner.calculate(waypoints[0])
+        assert [w.get_id() for w in planner.get_path_to(waypoints[3])] == ["C", "D"]
+        waypoints[2].set_status(WaypointStatus.BLOCKED)
+        planner.calculate(waypoints[0])
+        assert planner.get_path_to(waypoints[3]) is None
+
+    def test_without_turn_costs_like_path_planner(self):
+        graph = Graph(MapGenerator(200, 0.2, 0.2, 0.2, seed=4).generate().waypoints_configuration)
+        rng = random.Random(4)
+        for waypoint in rng.sample(graph.waypoints[1:], 40):
+            waypoint.observe_block(rng.random() < 0.5, 0.8)
+        planner = TurnAwarePathPlanner(graph.waypoints, TurnCostModel(0.0, 0.0))
+        planner.calculate(graph.current_waypoint)
+        graph.planner.calculate(graph.current_waypoint)
+        for waypoint in graph.waypoints:
+            assert planner.get_cost_to(waypoint) == graph.planner.get_cost_to(waypoint)
+
+    def test_graph_uses_turn_cost_model(self):
+        graph = Graph(MapGenerator(200, seed=5).generate().waypoints_configuration)
+        graph.set_target_waypoint(graph.waypoints[-1].get_id())
+        graph.get_next_best_waypoint()
+        edge_weight = graph.planner.get_weight_to(graph.target_waypoint)
+        graph.set_turn_cost_model(TurnCostModel())
+        assert isinstance(graph.planner, TurnAwarePathPlanner)
+        graph.get_next_best_waypoint()
+        assert graph.get_shortest_path_to_target()[-1] is graph.target_waypoint
+        assert graph.planner.get_weight_to(graph.target_waypoint) >= edge_weight
+        graph.set_turn_cost_model(None)
+        assert isinstance(graph.planner, PathPlanner)
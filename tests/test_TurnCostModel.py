@@ -0,0 +1,22 @@
+import pytest
+from Navigation.TurnCostModel import TurnCostModel
+
+
+def test_get_turn_angle():
+    assert TurnCostModel.get_turn_angle(0.0, 90.0) == 90.0
+    assert TurnCostModel.get_turn_angle(0.0, 270.0) == 90.0
+    assert TurnCostModel.get_turn_angle(350.0, 10.0) == 20.0
+    assert TurnCostModel.get_turn_angle(90.0, 270.0) == 180.0
+
+
+def test_get_cost():
+    model = TurnCostModel(cost_per_degree=0.2, turn_cost=5.0, straight_tolerance=10.0)
+    assert model.get_cost(0.0, 5.0) == 0
+    assert model.get_cost(0.0, 355.0) == 0
+    assert model.get_cost(0.0, 90.0) == 23
+    assert model.get_cost(0.0, 180.0) == 41
+
+
+def test_negative_costs():
+    with pytest.raises(ValueError):
+        TurnCostModel(cost_per_degree=-1.0)
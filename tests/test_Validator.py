@@ -134,3 +134,22 @@ def test_validate_configuration_valid():
     }
     Validator.validate_configuration(config)
 
+
+def test_validate_waypoint_id_format_valid():
+    Validator.validate_waypoint_id_format("A")
+
+
+def test_validate_waypoint_id_format_invalid():
+    for waypoint_id in [1, "", "1", "a", "W12"]:
+        with pytest.raises(ValueError):
+            Validator.validate_waypoint_id_format(waypoint_id)
+
+
+def test_validate_generated_waypoint_id_format():
+    with Validator.generated_waypoint_ids():
+        Validator.validate_waypoint_id_format("W12")
+        for waypoint_id in ["1A", "W1a", "W-1"]:
+            with pytest.raises(ValueError):
+                Validator.validate_waypoint_id_format(waypoint_id)
+    with pytest.raises(ValueError):
+        Validator.validate_waypoint_id_format("W12")
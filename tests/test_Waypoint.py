@@ -1,5 +1,6 @@
+import random
 import pytest
-from Navigation.Waypoint import Waypoint
+from Navigation.Waypoint import Waypoint, BLOCKED_WAYPOINT_COST
 from Navigation.WaypointStatus import WaypointStatus
 from Navigation.EdgeStatus import EdgeStatus
 from Navigation.Angle import Angle
@@ -55,9 +56,95 @@ class TestWaypoint:
         assert updated_angle.get_waypoint().get_status() == WaypointStatus.BLOCKED
         assert updated_angle.get_edge().get_status() == EdgeStatus.OBSTRUCTED
 
+    def test_update_angle_fuses_observations(self, waypoint):
+        waypoint.update_angle(60.0, WaypointStatus.POTENTIALLY_BLOCKED, EdgeStatus.POTENTIALLY_FREE, 0.6, 0.9)
+        updated_angle = waypoint.update_angle(60.0, WaypointStatus.POTENTIALLY_FREE, EdgeStatus.POTENTIALLY_FREE, 0.9, 0.9)
+
+        assert updated_angle.get_waypoint().get_status() == WaypointStatus.POTENTIALLY_FREE
+        assert updated_angle.get_waypoint().get_block_probability() == pytest.approx(0.6 * 0.1 / (0.6 * 0.1 + 0.4 * 0.9))
+        assert updated_angle.get_edge().get_obstruction_probability() == pytest.approx(0.01 / 0.82)
+
     def test_get_value_from_angle_to_waypoint(self, waypoint):
         assert waypoint.get_value_from_angle_to_waypoint("B") == 60.0
 
     def test_get_value_from_angle_to_waypoint_with_diff_incoming(self, waypoint):
         waypoint.set_incoming_angle_by_id("D")
-        assert waypoint.get_value_from_angle_to_waypoint("B") == 300.0
\ No newline at end of file
+        assert waypoint.get_value_from_angle_to_waypoint("B") == 300.0
+
+    def test_get_possible_angles(self, waypoint):
+        assert [a.get_waypoint().get_id() for a in waypoint.get_possible_angles()] == ["B", "C", "D"]
+
+    def test_get_possible_angles_is_cached(self, waypoint):
+        assert waypoint.get_possible_angles() is waypoint.get_possible_angles()
+
+    def test_get_possible_angles_after_waypoint_blocked(self, waypoint):
+        waypoint.get_possible_angles()
+        waypoint.angles[0].get_waypoint().set_status(WaypointStatus.BLOCKED)
+        assert [a.get_waypoint().get_id() for a in waypoint.get_possible_angles()] == ["C", "D"]
+        waypoint.angles[0].get_waypoint().set_status(WaypointStatus.FREE)
+        assert [a.get_waypoint().get_id() for a in waypoint.get_possible_angles()] == ["B", "C", "D"]
+
+    def test_get_possible_angles_after_edge_missing(self, waypoint):
+        waypoint.get_possible_angles()
+        waypoint.set_angle_to_waypoint_as_missing("D")
+        assert [a.get_waypoint().get_id() for a in waypoint.get_possible_angles()] == ["B", "C"]
+
+    def test_traversable_flag(self, waypoint):
+        assert waypoint.is_traversable() is True
+        waypoint.set_status(WaypointStatus.BLOCKED)
+        assert waypoint.is_traversable() is False
+        waypoint.status = WaypointStatus.FREE
+        assert waypoint.is_traversable() is True
+
+    def test_observe_block_expected_cost(self, waypoint):
+        waypoint.observe_block(False, 0.9)
+        assert waypoint.get_status() == WaypointStatus.POTENTIALLY_FREE
+        assert waypoint.expected_block_cost == round(0.1 * BLOCKED_WAYPOINT_COST)
+        waypoint.set_status(WaypointStatus.FREE)
+        assert waypoint.expected_block_cost == 0
+        waypoint.observe_block(True, 0.9)
+        assert waypoint.get_status() == WaypointStatus.FREE
+
+    def test_uncertain_block_is_traversable_with_violation(self, waypoint):
+        waypoint.set_status(WaypointStatus.POTENTIALLY_BLOCKED)
+        assert waypoint.is_traversable() is True
+        assert waypoint.get_violation() == 1
+        waypoint.set_status(WaypointStatus.BLOCKED)
+        assert waypoint.is_traversable() is False
+        assert waypoint.get_violation() == 0
+
+    def test_get_angles_from_values(self, waypoint):
+        # arrived from C, so the line to C is behind the car
+        angles = waypoint.get_angles_from_values([60.0, 175.0, 295.0, 1.0])
+        assert [a.get_waypoint().get_id() for a in angles] == ["B", "C", "D", "B"]
+
+    def test_get_angles_from_values_wraps_around(self, waypoint):
+        waypoint.set_incoming_angle_by_id("B")
+        # the heading is 240, so a value of 70 is 310 and closest to the line to D
+        assert waypoint.get_angles_from_values([70.0])[0].get_waypoint().get_id() == "D"
+        assert waypoint.get_angles_from_values([125.0])[0].get_waypoint().get_id() == "B"
+
+    def test_get_angles_from_values_equal_distance(self, waypoint):
+        # 120 is as close to B as to C, the first angle is used
+        assert waypoint.get_angles_from_values([120.0])[0].get_waypoint().get_id() == "B"
+
+    def test_get_angles_from_values_like_closest_angle(self):
+        rng = random.Random(1)
+        waypoint = Waypoint("A")
+        neighbours = [Waypoint(chr(ord("B") + i)) for i in range(24)]
+        waypoint.set_angles([Angle(n, float(rng.randrange(0, 360, 5)), Edge()) for n in neighbours])
+        for _ in range(200):
+            waypoint.set_incoming_angle_by_id(rng.choice(neighbours).get_id())
+            value = float(rng.randrange(0, 360, 5))
+            heading_angle = (waypoint.incoming_angle - 180.0 + value) % 360
+            differences = [min((a.get_value() - heading_angle) % 360, (heading_angle - a.get_value()) % 360)
+                           for a in waypoint.get_angles()]
+            expected = waypoint.get_angles()[differences.index(min(differences))]
+            assert waypoint.get_angles_from_values([value])[0] is expected
+
+    def test_relative_values_are_updated_with_angles(self, waypoint):
+        assert waypoint.get_value_from_angle_to_waypoint("B") == 60.0
+        e = Waypoint("E")
+        waypoint.set_angles(waypoint.get_angles() + [Angle(e, 90.0, Edge())])
+        assert waypoint.get_value_from_angle_to_waypoint("E") == 90.0
+        assert waypoint.get_angles_from_values([85.0])[0].get_waypoint() is e
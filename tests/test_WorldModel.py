@@ -0,0 +1,119 @@
+import threading
+import pytest
+from Navigation.Belief import Belief
+from WorldModel.WorldModel import WorldModel
+
+
+def test_set_status():
+    world_model = WorldModel()
+    world_model.update([{"id": "A", "status": "BLOCKED"}, {"id": "A_to_B", "status": "MISSING"}])
+    changes = world_model.get_changes()["changes"]
+    assert changes == {"A": {"status": "BLOCKED", "belief": None}, "A_to_B": {"status": "MISSING", "belief": None}}
+
+
+def test_evidence_is_added_up():
+    world_model = WorldModel()
+    world_model.update([{"id": "A", "evidence": [1.0, 1]}])
+    world_model.update([{"id": "A", "evidence": [0.5, 2]}, {"id": "A_to_B", "evidence": [-2.0, 1]}])
+    changes = world_model.get_changes()["changes"]
+    assert changes["A"] == {"status": "POTENTIALLY_BLOCKED", "belief": [1.5, 3]}
+    assert changes["A_to_B"] == {"status": "POTENTIALLY_FREE", "belief": [-2.0, 1]}
+
+
+def test_evidence_is_clamped():
+    world_model = WorldModel()
+    world_model.update([{"id": "A", "evidence": [100.0, 1]}])
+    assert world_model.get_changes()["changes"]["A"]["belief"] == [Belief.MAX_LOG_ODDS, 1]
+
+
+def test_confirmed_status_is_kept():
+    world_model = WorldModel()
+    world_model.update([{"id": "A", "status": "FREE"}, {"id": "A_to_B", "status": "FREE"}])
+    world_model.update([
+        {"id": "A", "status": "POTENTIALLY_BLOCKED"},
+        {"id": "A", "evidence": [3.0, 1]},
+        {"id": "A_to_B", "status": "POTENTIALLY_OBSTRUCTED"},
+    ])
+    changes = world_model.get_changes()["changes"]
+    assert changes["A"]["status"] == "FREE"
+    assert changes["A_to_B"]["status"] == "FREE"
+    # a confirmed status replaces another confirmed status
+    world_model.update([{"id": "A", "status": "BLOCKED"}])
+    assert world_model.get_changes()["changes"]["A"]["status"] == "BLOCKED"
+
+
+def test_confirmed_obstruction_is_kept():
+    world_model = WorldModel()
+    world_model.update([{"id": "A_to_B", "status": "OBSTRUCTED"}])
+    # another car did not see the line or only saw it free
+    world_model.update([
+        {"id": "A_to_B", "status": "MISSING"},
+        {"id": "A_to_B", "status": "POTENTIALLY_FREE"},
+        {"id": "A_to_B", "evidence": [-2.0, 1]},
+    ])
+    assert world_model.get_changes()["changes"]["A_to_B"] == {"status": "OBSTRUCTED", "belief": None}
+
+
+def test_update_is_applied_once_per_sequence():
+    world_model = WorldModel()
+    world_model.update([{"id": "A", "evidence": [1.0, 1]}], "car", 1)
+    # resent after a timeout of the request which did arrive
+    world_model.update([{"id": "A", "evidence": [1.0, 1]}], "car", 1)
+    assert world_model.get_changes()["changes"]["A"]["belief"] == [1.0, 1]
+    world_model.update([{"id": "A", "evidence": [1.0, 1]}], "other car", 1)
+    world_model.update([{"id": "A", "evidence": [1.0, 1]}], "car", 2)
+    assert world_model.get_changes()["changes"]["A"]["belief"] == [3.0, 3]
+
+
+def test_missing_line_seen_again():
+    world_model = WorldModel()
+    world_model.update([{"id": "A_to_B", "status": "MISSING"}])
+    # another controller saw the line during a later scan
+    world_model.update([{"id": "A_to_B", "evidence": [-2.0, 1]}])
+    assert world_model.get_changes()["changes"]["A_to_B"]["status"] == "POTENTIALLY_FREE"
+
+
+def test_changes_since_versions():
+    world_model = WorldModel(stripe_count=4)
+    world_model.update([{"id": "A", "status": "FREE"}, {"id": "B", "status": "FREE"}])
+    versions = world_model.get_changes()["versions"]
+    assert world_model.get_changes(versions)["changes"] == {}
+    world_model.update([{"id": "B", "status": "BLOCKED"}])
+    # updates which change nothing are not reported
+    world_model.update([{"id": "A", "status": "FREE"}])
+    changes = world_model.get_changes(versions)
+    assert changes["changes"] == {"B": {"status": "BLOCKED", "belief": None}}
+    assert sum(changes["versions"]) == sum(versions) + 1
+
+
+def test_changes_after_log_compaction():
+    world_model = WorldModel(stripe_count=1)
+    world_model.update([{"id": "A", "status": "FREE"}, {"id": "B", "status": "FREE"}])
+    versions = world_model.get_changes()["versions"]
+    for _ in range(100):
+        world_model.update([{"id": "C", "evidence": [0.1, 1]}])
+    assert len(world_model.change_ids[0]) < 100
+    assert set(world_model.get_changes(versions)["changes"]) == {"C"}
+    assert set(world_model.get_changes()["changes"]) == {"A", "B", "C"}
+
+
+def test_invalid_versions():
+    with pytest.raises(ValueError):
+        WorldModel(stripe_count=4).get_changes([0])
+
+
+def test_concurrent_updates():
+    world_model = WorldModel()
+
+    def observe(index):
+        for _ in range(200):
+            world_model.update([{"id": f"W{index % 5}", "evidence": [0.01, 1]}])
+
+    threads = [threading.Thread(target=observe, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    changes = world_model.get_changes()["changes"]
+    assert sum(state["belief"][1] for state in changes.values()) == 20 * 200
+    assert changes["W0"]["belief"][0] == pytest.approx(4 * 200 * 0.01)
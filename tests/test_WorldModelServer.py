@@ -0,0 +1,68 @@
+import threading
+import pytest
+from WorldModel.WorldModelClient import WorldModelClient
+from WorldModel.WorldModelServer import WorldModelServer
+
+
+@pytest.fixture(params=["tcp", "unix"])
+def server(request, tmp_path):
+    address = ("127.0.0.1", 0) if request.param == "tcp" else str(tmp_path / "world_model.sock")
+    server = WorldModelServer(address)
+    server.serve_in_background()
+    yield server
+    server.shutdown()
+
+
+def test_update_and_get_changes(server):
+    client = WorldModelClient(server.get_address())
+    other_client = WorldModelClient(server.get_address())
+    try:
+        client.update([{"id": "A", "status": "BLOCKED"}])
+        changes = other_client.get_changes()
+        assert changes["changes"] == {"A": {"status": "BLOCKED", "belief": None}}
+        client.update([{"id": "A_to_B", "evidence": [1.0, 1]}])
+        assert list(other_client.get_changes(changes["versions"])["changes"]) == ["A_to_B"]
+        assert other_client.get_stripe_count() == server.world_model.get_stripe_count()
+    finally:
+        client.close()
+        other_client.close()
+
+
+def test_update_is_applied_once_per_sequence(server):
+    client = WorldModelClient(server.get_address())
+    try:
+        client.update([{"id": "A", "evidence": [1.0, 1]}], "car", 1)
+        client.update([{"id": "A", "evidence": [1.0, 1]}], "car", 1)
+        assert client.get_changes()["changes"]["A"]["belief"] == [1.0, 1]
+    finally:
+        client.close()
+
+
+def test_error_is_raised(server):
+    client = WorldModelClient(server.get_address())
+    try:
+        with pytest.raises(ValueError):
+            client.get_changes([0])
+        # the connection can still be used after an error
+        assert client.get_changes()["changes"] == {}
+    finally:
+        client.close()
+
+
+def test_concurrent_clients(server):
+    def observe(index):
+        client = WorldModelClient(server.get_address())
+        try:
+            for _ in range(20):
+                client.update([{"id": f"W{index}", "evidence": [0.1, 1]}])
+        finally:
+            client.close()
+
+    threads = [threading.Thread(target=observe, args=(i,)) for i in range(30)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    changes = server.world_model.get_changes()["changes"]
+    assert len(changes) == 30
+    assert all(state["belief"][1] == 20 for state in changes.values())
@@ -0,0 +1,130 @@
+import pytest
+from unittest.mock import Mock
+from Navigation.EdgeStatus import EdgeStatus
+from Navigation.Graph import Graph
+from Navigation.WaypointStatus import WaypointStatus
+from Simulation.MapGenerator import MapGenerator
+from Simulation.NavigationSimulator import NavigationSimulator
+from WorldModel.WorldModel import WorldModel
+from WorldModel.WorldModelSync import WorldModelSync
+from Validation.Validator import Validator
+
+
+@pytest.fixture(autouse=True)
+def generated_waypoint_ids():
+    with Validator.generated_waypoint_ids():
+        yield
+
+
+@pytest.fixture
+def waypoints_configuration():
+    return MapGenerator(10).generate_waypoints_configuration()
+
+
+def test_statuses_are_shared(waypoints_configuration):
+    world_model = WorldModel()
+    graph = Graph(waypoints_configuration)
+    other_graph = Graph(waypoints_configuration)
+    sync = WorldModelSync(graph, world_model)
+    other_sync = WorldModelSync(other_graph, world_model)
+    graph._get_waypoint_by_id("W4").set_status(WaypointStatus.BLOCKED)
+    graph._get_waypoint_by_id("W1").get_edge_to_waypoint("W2").set_status(EdgeStatus.MISSING)
+    sync.synchronize()
+    other_sync.synchronize()
+    assert other_graph._get_waypoint_by_id("W4").get_status() == WaypointStatus.BLOCKED
+    assert other_graph._get_waypoint_by_id("W1").get_edge_to_waypoint("W2").get_status() == EdgeStatus.MISSING
+
+
+def test_evidence_is_counted_once(waypoints_configuration):
+    world_model = WorldModel()
+    graph = Graph(waypoints_configuration)
+    other_graph = Graph(waypoints_configuration)
+    sync = WorldModelSync(graph, world_model)
+    other_sync = WorldModelSync(other_graph, world_model)
+    graph._get_waypoint_by_id("W4").observe_block(True, 0.8)
+    sync.synchronize()
+    other_sync.synchronize()
+    other_graph._get_waypoint_by_id("W4").observe_block(True, 0.8)
+    other_sync.synchronize()
+    sync.synchronize()
+    # both graphs have the two observations, none of them counted twice
+    for g in [graph, other_graph]:
+        belief = g._get_waypoint_by_id("W4").block_belief
+        assert belief.get_observation_count() == 2
+        assert belief.get_probability() == pytest.approx(0.64 / 0.68)
+    sync.synchronize()
+    other_sync.synchronize()
+    assert graph._get_waypoint_by_id("W4").block_belief.get_observation_count() == 2
+
+
+def test_failed_synchronization_is_repeated(waypoints_configuration):
+    world_model = WorldModel()
+    graph = Graph(waypoints_configuration)
+    sync = WorldModelSync(graph, world_model)
+    graph._get_waypoint_by_id("W4").observe_block(True, 0.8)
+    get_changes = world_model.get_changes
+    world_model.get_changes = Mock(side_effect=ConnectionError("World model server closed the connection"))
+    with pytest.raises(ConnectionError):
+        sync.synchronize()
+    world_model.get_changes = get_changes
+    sync.synchronize()
+    # the evidence was sent before getting the changes failed, it is not sent again
+    assert world_model.get_changes()["changes"]["W4"]["belief"][1] == 1
+    assert graph._get_waypoint_by_id("W4").block_belief.get_observation_count() == 1
+
+
+def test_update_which_arrived_before_a_timeout_is_counted_once(waypoints_configuration):
+    world_model = WorldModel()
+    graph = Graph(waypoints_configuration)
+    sync = WorldModelSync(graph, world_model)
+    waypoint = graph._get_waypoint_by_id("W4")
+    waypoint.observe_block(True, 0.8)
+    update = world_model.update
+
+    def update_and_time_out(*arguments):
+        update(*arguments)
+        raise TimeoutError("timed out")
+
+    world_model.update = Mock(side_effect=update_and_time_out)
+    with pytest.raises(TimeoutError):
+        sync.synchronize()
+    world_model.update = update
+    waypoint.observe_block(True, 0.8)
+    sync.synchronize()
+    assert world_model.get_changes()["changes"]["W4"]["belief"][1] == 2
+    assert waypoint.block_belief.get_observation_count() == 2
+
+
+def test_second_car_uses_what_the_first_car_learned():
+    # without missing lines, the controller only marks a missing line next to the target, see Graph.update_missing_line
+    simulated_map = MapGenerator(100, 0.15, 0.1, 0.0, seed=2).generate()
+    target_waypoint_id = next(w for w in reversed(simulated_map.get_waypoint_ids()) if not simulated_map.has_cone(w))
+    world_model = WorldModel()
+    first = NavigationSimulator(simulated_map, detection_accuracy=0.8, seed=1, world_model=world_model)
+    assert first.run_mission([target_waypoint_id]).is_target_reached
+    shared = NavigationSimulator(simulated_map, detection_accuracy=0.8, seed=101, world_model=world_model)
+    alone = NavigationSimulator(simulated_map, detection_accuracy=0.8, seed=101)
+    shared_result = shared.run_mission([target_waypoint_id])
+    alone_result = alone.run_mission([target_waypoint_id])
+    assert shared_result.is_target_reached
+    assert shared_result.event_count < alone_result.event_count
+
+
+def test_update_elements(waypoints_configuration):
+    world_model = WorldModel()
+    graph = Graph(waypoints_configuration)
+    sync = WorldModelSync(graph, world_model)
+    graph._get_waypoint_by_id("W4").set_status(WaypointStatus.BLOCKED)
+    sync.synchronize()
+    changed_configuration = MapGenerator(10).generate_waypoints_configuration()
+    edge_data = changed_configuration["W1"]["edges"]["W2"]
+    changed_configuration["W2"]["edges"]["W4"] = dict(edge_data, angle=180.0)
+    changed_configuration["W4"]["edges"]["W2"] = edge_data
+    graph.update_configuration(changed_configuration)
+    sync.update_elements()
+    graph._get_waypoint_by_id("W2").get_edge_to_waypoint("W4").set_status(EdgeStatus.MISSING)
+    sync.synchronize()
+    other_graph = Graph(changed_configuration)
+    WorldModelSync(other_graph, world_model).synchronize()
+    assert other_graph._get_waypoint_by_id("W4").get_status() == WaypointStatus.BLOCKED
+    assert other_graph._get_waypoint_by_id("W2").get_edge_to_waypoint("W4").get_status() == EdgeStatus.MISSING
@@ -1,3 +1,5 @@
+import threading
+import time
 import pytest
 from pathlib import Path
 from ObjectDetection.YOLODetector import YOLODetector
@@ -5,6 +7,8 @@ from Navigation.WaypointStatus import WaypointStatus
 from Navigation.EdgeStatus import EdgeStatus
 from Navigation.Graph import Graph
 from CameraStub import CameraStub
+from ObjectDetection.FrameStore import FrameStore
+from ObjectDetection.FrameStoreCamera import FrameStoreCamera
 from Configuration.Configurator import Configurator
 
 IMAGES_PATH = Path(__file__).resolve().parent / "images"
@@ -114,3 +118,84 @@ class TestYOLODetector:
         assert graph._get_waypoint_by_id("G").get_angle_to_waypoint("C").get_edge().get_status() == EdgeStatus.POTENTIALLY_MISSING
 
         
+
+    def test_detect_multiple_frames(self):
+        camera = CameraStub(IMAGES_PATH / "1.JPG")
+        yolo_detector = YOLODetector(camera, camera, frame_count=3)
+        waypoint_status, edge_status = yolo_detector.detect()
+        assert waypoint_status == WaypointStatus.POTENTIALLY_BLOCKED
+        assert edge_status == EdgeStatus.POTENTIALLY_OBSTRUCTED
+        cone_confidence, obstacle_confidence = yolo_detector.get_confidences()
+        assert 0.0 < cone_confidence <= 1.0
+        assert 0.0 < obstacle_confidence <= 1.0
+
+    def test_detect_from_frame_store(self, tmp_path):
+        frame_store = FrameStore.create_from_images(tmp_path / "frames", [IMAGES_PATH / "1.JPG", IMAGES_PATH / "2.JPG"])
+        camera = FrameStoreCamera(frame_store)
+        yolo_detector = YOLODetector(camera, camera)
+        assert yolo_detector.detect() == (WaypointStatus.POTENTIALLY_BLOCKED, EdgeStatus.POTENTIALLY_OBSTRUCTED)
+        assert yolo_detector.detect() == (WaypointStatus.POTENTIALLY_FREE, EdgeStatus.POTENTIALLY_OBSTRUCTED)
+
+    def test_models_are_loaded_on_first_use(self):
+        camera = CameraStub(IMAGES_PATH / "1.JPG")
+        yolo_detector = YOLODetector(camera, camera)
+        assert yolo_detector.object_model is None
+        assert yolo_detector.get_start_up_timings() == {}
+        yolo_detector.detect()
+        assert set(yolo_detector.get_start_up_timings()) == {"import", "model_load", "first_inference"}
+
+    def test_warm_up(self):
+        camera = CameraStub(IMAGES_PATH / "1.JPG")
+        yolo_detector = YOLODetector(camera, camera)
+        yolo_detector.start_warm_up()
+        yolo_detector.warm_up_thread.join()
+        assert set(yolo_detector.get_start_up_timings()) == {"import", "model_load", "warm_up"}
+        yolo_detector.detect()
+        assert "first_inference" in yolo_detector.get_start_up_timings()
+
+    def test_start_up_latency_without_tiles(self):
+        camera = CameraStub(IMAGES_PATH / "1.JPG")
+        yolo_detector = YOLODetector(camera, camera, tile_size=640)
+        yolo_detector.warm_up()
+        tiled_predict = yolo_detector.tiled_inference.predict
+
+        def slow_tiled_predict(frame):
+            time.sleep(1.0)
+            return tiled_predict(frame)
+
+        yolo_detector.tiled_inference.predict = slow_tiled_predict
+        yolo_detector.start_up_process_detect()
+        # the tiles are not predicted at the resolution of the call site
+        assert yolo_detector.get_resolution_report()["start_up"]["latency"] < 1.0
+
+    def test_detect_does_not_predict_during_the_warm_up(self):
+        camera = CameraStub(IMAGES_PATH / "1.JPG")
+        yolo_detector = YOLODetector(camera, camera)
+        yolo_detector.warm_up()
+        # the next warm up runs the dummy inference again
+        del yolo_detector.start_up_timings["warm_up"]
+        lock = threading.Lock()
+        running = []
+        overlaps = []
+
+        def track(predict):
+            def tracked_predict(*args, **kwargs):
+                with lock:
+                    overlaps.append(len(running))
+                    running.append(True)
+                try:
+                    # widens the window in which a second prediction could start
+                    time.sleep(0.1)
+                    return predict(*args, **kwargs)
+                finally:
+                    with lock:
+                        running.pop()
+            return tracked_predict
+
+        yolo_detector.object_model.predict = track(yolo_detector.object_model.predict)
+        yolo_detector.line_model.predict = track(yolo_detector.line_model.predict)
+        yolo_detector.start_warm_up()
+        yolo_detector.detect()
+        yolo_detector.warm_up_thread.join()
+        assert len(overlaps) == 3
+        assert overlaps == [0, 0, 0]